@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Benchmarks the network generator offline at growing cluster sizes.
+#
+# python benchmarks/bench_generator.py
+# python benchmarks/bench_generator.py --nodes 10,100 --threshold 0.5
+# python benchmarks/bench_generator.py --update_baseline
+#
+# Validator keys are stubbed and nothing touches docker or the network, the
+# feature file comes from benchmarks/fixtures. Every node count runs in its
+# own process so the peak RSS is not shared between runs.
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+bench_dir = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.dirname(bench_dir))
+
+BASELINE_PATH: str = f"{bench_dir}/baseline.json"
+FEATURES_PATH: str = f"{bench_dir}/fixtures/features.macro"
+# Metrics compared against the baseline
+METRICS: List[str] = ["total", "max_rss_kb", "files"]
+# Absolute slack for wall time, small clusters finish in a few ms
+TIME_SLACK: float = 0.05
+
+
+class FakeValidatorClient:
+    def __init__(self, name: str):
+        self.name = name
+
+    def create_keys(self):
+        pass
+
+    def set_domain(self, domain: str):
+        pass
+
+    def create_token(self):
+        pass
+
+    def get_keys(self) -> Dict[str, str]:
+        return {"public_key": f"nHB{self.name.upper():0>49}"}
+
+    def read_token(self) -> str:
+        return f"eyJ2YWxpZGF0aW9uX3NlY3JldF9rZXkiOiI{self.name}"
+
+    def read_manifest(self) -> str:
+        return f"JAAAAAFxIe{self.name}"
+
+
+def timed(timings: Dict[str, float], key: str, func):
+    def wrapper(*args, **kwargs):
+        start: float = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[key] = timings.get(key, 0) + time.perf_counter() - start
+
+    return wrapper
+
+
+def count_files(path: str) -> int:
+    return sum(len(files) for _, _, files in os.walk(path))
+
+
+def run_generator(num_nodes: int) -> Dict[str, Any]:
+    import yaml
+    from xrpld_netgen import network
+    from xrpld_netgen.libs.xrpld import get_feature_lines_from_path
+
+    num_peers: int = num_nodes // 5
+    num_validators: int = num_nodes - num_peers
+    timings: Dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir, patch.multiple(
+        network,
+        ValidatorClient=FakeValidatorClient,
+        gen_config=timed(timings, "gen_config", network.gen_config),
+        parse_amendments=timed(timings, "parse_amendments", network.parse_amendments),
+        update_amendments=timed(
+            timings, "update_amendments", network.update_amendments
+        ),
+    ), open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        start: float = time.perf_counter()
+        builder = network.NetworkBuilder(tmp_dir)
+        builder.create_node_folders(
+            True,
+            "bench",
+            "ubuntu:jammy",
+            get_feature_lines_from_path(FEATURES_PATH),
+            num_validators,
+            num_peers,
+            21339,
+            True,
+            max(num_validators - 1, 1),
+            "ED" + "0" * 64,
+            "ED" + "1" * 64,
+            "xahau",
+        )
+        timings["create_node_folders"] = time.perf_counter() - start
+
+        yaml_start: float = time.perf_counter()
+        compose: Dict[str, Any] = {
+            "version": "3.9",
+            "services": builder.services,
+            "networks": {"bench-network": {"driver": "bridge"}},
+        }
+        with open(f"{tmp_dir}/bench-cluster/docker-compose.yml", "w") as f:
+            yaml.dump(compose, f, default_flow_style=False)
+        timings["yaml_dump"] = time.perf_counter() - yaml_start
+        timings["total"] = time.perf_counter() - start
+        files: int = count_files(tmp_dir)
+
+    max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "nodes": num_nodes,
+        **{k: round(v, 4) for k, v in timings.items()},
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        "max_rss_kb": max_rss // 1024 if sys.platform == "darwin" else max_rss,
+        "files": files,
+    }
+
+
+def run_in_process(num_nodes: int) -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, __file__, "--run", str(num_nodes)],
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return json.loads(result.stdout.decode().strip().splitlines()[-1])
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    regressions: List[str] = []
+    for result in results:
+        expected: Dict[str, Any] = baseline.get(str(result["nodes"]))
+        if not expected:
+            continue
+        for metric in METRICS:
+            limit: float = expected[metric] * (1 + threshold)
+            if metric == "total":
+                limit += TIME_SLACK
+            if result[metric] > limit:
+                regressions.append(
+                    f"{result['nodes']} nodes {metric}: {result[metric]} "
+                    f"> {expected[metric]} (+{threshold:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Network generator benchmarks")
+    parser.add_argument(
+        "--nodes",
+        type=str,
+        default="10,100,1000",
+        help="Comma separated node counts",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression against the baseline",
+    )
+    parser.add_argument(
+        "--update_baseline",
+        action="store_true",
+        help="Store the results as the new baseline",
+    )
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_generator(args.run)))
+        return
+
+    results: List[Dict[str, Any]] = []
+    print(
+        f"{'nodes':>6} {'total':>8} {'folders':>8} {'gen_cfg':>8} "
+        f"{'parse':>8} {'update':>8} {'yaml':>8} {'rss_kb':>8} {'files':>6}"
+    )
+    for num_nodes in [int(n) for n in args.nodes.split(",")]:
+        result: Dict[str, Any] = run_in_process(num_nodes)
+        results.append(result)
+        print(
+            f"{result['nodes']:>6} {result['total']:>8.3f} "
+            f"{result['create_node_folders']:>8.3f} {result['gen_config']:>8.3f} "
+            f"{result['parse_amendments']:>8.3f} "
+            f"{result['update_amendments']:>8.3f} {result['yaml_dump']:>8.3f} "
+            f"{result['max_rss_kb']:>8} {result['files']:>6}"
+        )
+
+    if args.update_baseline:
+        baseline: Dict[str, Any] = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, "r") as f:
+                baseline = json.load(f)
+        baseline.update({str(r["nodes"]): r for r in results})
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        print("No baseline, run with --update_baseline to create one")
+        return
+    with open(BASELINE_PATH, "r") as f:
+        regressions: List[str] = compare(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Benchmarks the startup of the cli, which scripts call hundreds of times.
+#
+# python benchmarks/bench_import.py
+# python benchmarks/bench_import.py --runs 50 --update_baseline
+#
+# Every run is a fresh interpreter importing xrpld_netgen.cli, the median is
+# compared against the "import" entry of benchmarks/baseline.json.
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List
+
+bench_dir = os.path.abspath(os.path.dirname(__file__))
+root_dir = os.path.dirname(bench_dir)
+
+BASELINE_PATH: str = f"{bench_dir}/baseline.json"
+# Absolute slack in ms, interpreter startup alone varies by a few ms
+TIME_SLACK_MS: float = 10
+# Modules the cli must not import before a command needs them
+HEAVY_MODULES: List[str] = ["xrpld_publisher", "yaml", "requests", "dotenv", "asyncio"]
+
+IMPORT_SCRIPT: str = (
+    "import sys, time, json; start = time.perf_counter(); "
+    "import xrpld_netgen.cli; "
+    "print(json.dumps({'ms': (time.perf_counter() - start) * 1000, "
+    "'modules': sorted(m for m in %r if m in sys.modules)}))" % HEAVY_MODULES
+)
+
+
+def run_import() -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=root_dir,
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+    return json.loads(result.stdout.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cli import time benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Number of imports")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression against the baseline",
+    )
+    parser.add_argument(
+        "--update_baseline",
+        action="store_true",
+        help="Store the result as the new baseline",
+    )
+    args = parser.parse_args()
+
+    start: float = time.perf_counter()
+    runs: List[Dict[str, Any]] = [run_import() for _ in range(args.runs)]
+    median: float = round(statistics.median(r["ms"] for r in runs), 2)
+    modules: List[str] = runs[0]["modules"]
+    print(
+        f"import xrpld_netgen.cli: median {median}ms over {args.runs} runs "
+        f"({time.perf_counter() - start:.1f}s)"
+    )
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r") as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        baseline["import"] = {"ms": median}
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    failures: List[str] = []
+    if modules:
+        failures.append(f"heavy modules imported at startup: {', '.join(modules)}")
+    expected: Dict[str, Any] = baseline.get("import")
+    if expected and median > expected["ms"] * (1 + args.threshold) + TIME_SLACK_MS:
+        failures.append(f"import time: {median}ms > {expected['ms']}ms")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
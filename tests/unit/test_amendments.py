@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import pytest
+from unittest.mock import Mock, patch
+from xrpld_netgen import amendments
+from xrpld_netgen.utils.misc import get_node_port
+from xrpld_netgen.amendments import (
+    diff_features,
+    set_majority_time,
+    activate_amendments,
+    MAJORITY_GAINED,
+    MAJORITY_LOST,
+    ENABLED,
+)
+
+AMENDMENT = "A" * 64
+
+
+class TestDiffFeatures:
+    """Test detecting vote events between two feature responses"""
+
+    def test_majority_gained(self):
+        before = {AMENDMENT: {"enabled": False}}
+        after = {AMENDMENT: {"enabled": False, "majority": 781234567}}
+        assert diff_features(before, after, [AMENDMENT]) == [
+            (AMENDMENT, MAJORITY_GAINED)
+        ]
+
+    def test_majority_lost(self):
+        before = {AMENDMENT: {"enabled": False, "majority": 781234567}}
+        after = {AMENDMENT: {"enabled": False}}
+        assert diff_features(before, after, [AMENDMENT]) == [
+            (AMENDMENT, MAJORITY_LOST)
+        ]
+
+    def test_enabled_is_not_majority_lost(self):
+        before = {AMENDMENT: {"enabled": False, "majority": 781234567}}
+        after = {AMENDMENT: {"enabled": True}}
+        assert diff_features(before, after, [AMENDMENT]) == [(AMENDMENT, ENABLED)]
+
+    def test_untracked_amendments_are_ignored(self):
+        after = {AMENDMENT: {"enabled": True}}
+        assert diff_features({}, after, ["B" * 64]) == []
+
+
+class TestSetMajorityTime:
+    """Test rewriting the amendment majority time of running nodes"""
+
+    @patch("xrpld_netgen.amendments.run_command")
+    def test_majority_time_replaced(self, mock_run, tmp_path):
+        config = tmp_path / "vnode1" / "config"
+        config.mkdir(parents=True)
+        (config / "xahaud.cfg").write_text(
+            "[amendment_majority_time]\n5 minutes\n\n[voting]\n"
+        )
+        (config / "validators.txt").write_text("[validators]\n")
+
+        set_majority_time(str(tmp_path), ["vnode1"], "2 minutes")
+
+        assert (config / "xahaud.cfg").read_text() == (
+            "[amendment_majority_time]\n2 minutes\n\n[voting]\n"
+        )
+        assert (config / "validators.txt").read_text() == "[validators]\n"
+        mock_run.assert_called_once_with(
+            str(tmp_path),
+            "docker compose up -d --force-recreate vnode1",
+            {"START_MODE": "load"},
+        )
+
+    @patch("xrpld_netgen.amendments.run_command", return_value=False)
+    def test_failed_restart_raises_error(self, mock_run, tmp_path):
+        (tmp_path / "vnode1" / "config").mkdir(parents=True)
+        with pytest.raises(RuntimeError, match="Could not restart vnode1"):
+            set_majority_time(str(tmp_path), ["vnode1"], "2 minutes")
+
+
+class TestActivateAmendments:
+    """Test voting for amendments on a running network"""
+
+    def cluster(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(amendments, "basedir", str(tmp_path))
+        for node in ["vnode1", "vnode2", "pnode1"]:
+            (tmp_path / "net" / node / "config").mkdir(parents=True)
+
+    @patch("xrpld_netgen.amendments.get_features")
+    @patch("xrpld_netgen.amendments.run_command", return_value=True)
+    def test_votes_after_restarted_validators_sync(
+        self, mock_run, mock_features, tmp_path, monkeypatch
+    ):
+        self.cluster(tmp_path, monkeypatch)
+        calls = Mock()
+        calls.wait.return_value = "proposing"
+        mock_features.return_value = {AMENDMENT: {"enabled": True}}
+        with patch("xrpld_netgen.amendments.wait_for_server_state", calls.wait):
+            with patch("xrpld_netgen.amendments.vote_amendment", calls.vote):
+                activate_amendments("net", [AMENDMENT], "2 minutes", 10, 0)
+
+        names = [c[0] for c in calls.mock_calls]
+        assert names == ["wait", "wait", "vote", "vote"]
+        ports = {get_node_port(1, "validator"), get_node_port(2, "validator")}
+        assert {c.args[0] for c in calls.wait.call_args_list} == ports
+
+    @patch("xrpld_netgen.amendments.vote_amendment")
+    @patch("xrpld_netgen.amendments.wait_for_server_state", return_value=None)
+    @patch("xrpld_netgen.amendments.run_command", return_value=True)
+    def test_unsynced_validators_raise_error(
+        self, mock_run, mock_wait, mock_vote, tmp_path, monkeypatch
+    ):
+        self.cluster(tmp_path, monkeypatch)
+        with pytest.raises(RuntimeError, match="vnode1, vnode2 did not sync"):
+            activate_amendments("net", [AMENDMENT], "2 minutes", 10, 0)
+
+        mock_vote.assert_not_called()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import threading
+
+import pytest
+from unittest.mock import patch
+from xrpld_netgen import api, network
+from xrpld_netgen.api import OperationError, run_operation, get_cluster_dir
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(network, "basedir", str(tmp_path))
+    for node in ["vnode1", "vnode2", "pnode1"]:
+        (tmp_path / "test-cluster" / node).mkdir(parents=True)
+    return tmp_path
+
+
+class TestRunOperation:
+    """Test dispatching json params to the registered operations"""
+
+    def test_unknown_operation(self):
+        with pytest.raises(OperationError) as e:
+            run_operation("missing")
+        assert e.value.status == 404
+
+    def test_invalid_params(self):
+        with pytest.raises(OperationError, match="unexpected keyword") as e:
+            run_operation("list", {"nodes": 3})
+        assert e.value.status == 400
+
+    def test_exit_of_cli_helper_is_an_error(self, workspace):
+        with patch.object(api, "stop_network", side_effect=SystemExit(1)):
+            with pytest.raises(OperationError) as e:
+                run_operation("down", {"name": "test-cluster"})
+        assert e.value.status == 500
+
+    def test_list_clusters(self, workspace):
+        (workspace / "snapshots").mkdir()
+        assert run_operation("list") == [
+            {"name": "test-cluster", "nodes": ["vnode1", "vnode2", "pnode1"]}
+        ]
+
+    def test_create_locks_its_cluster(self):
+        assert api.CLUSTER_KEYS["create:network"](
+            {"build_version": "2025.7.9-release+1951"}
+        ) == "2025.7.9-release+1951-cluster"
+        assert api.CLUSTER_KEYS["create:network"](
+            {
+                "protocol": "xrpl",
+                "build_server": "https://github.com/XRPLF/rippled/tree/feat/x",
+                "build_version": "abc",
+            }
+        ) == "feat-x-cluster"
+        assert api.CLUSTER_KEYS["up"]({"name": "test-cluster"}) == "test-cluster"
+
+    def test_create_waits_for_up(self, workspace):
+        lock = api._cluster_lock("2025.7.9-release+1951-cluster")
+        lock.acquire()
+        with patch.object(api, "NetworkBuilder") as mock_builder:
+            mock_builder.return_value.create_network.return_value = "/x/c"
+            thread = threading.Thread(
+                target=run_operation,
+                args=("create:network", {"build_version": "2025.7.9-release+1951"}),
+            )
+            thread.start()
+            thread.join(0.2)
+            assert not mock_builder.called
+            lock.release()
+            thread.join()
+            assert mock_builder.called
+
+    def test_create_ansible_bundles(self, workspace):
+        with patch.object(api, "NetworkBuilder") as mock_builder:
+            result = run_operation(
+                "create:ansible",
+                {
+                    "build_version": "2025.7.9-release+1951",
+                    "vips": ["10.0.0.1", "10.0.0.2"],
+                    "pips": ["10.0.1.1"],
+                    "bundle_binary": True,
+                },
+            )
+        args = mock_builder.return_value.create_ansible.call_args.args
+        assert args[3:5] == (2, 1)
+        assert args[11:13] == (["10.0.0.1", "10.0.0.2"], ["10.0.1.1"])
+        assert args[-2:] == (False, True)
+        assert result["name"] == "2025.7.9-release+1951-cluster"
+
+
+class TestGetClusterDir:
+    """Test resolving cluster names inside the workspace"""
+
+    def test_path_traversal_is_rejected(self, workspace):
+        with pytest.raises(OperationError, match="Invalid cluster name"):
+            get_cluster_dir("../etc")
+
+    def test_missing_cluster(self, workspace):
+        with pytest.raises(OperationError) as e:
+            get_cluster_dir("other-cluster")
+        assert e.value.status == 404
+
+
+class TestStatus:
+    """Test querying the nodes of a cluster"""
+
+    @patch("xrpld_netgen.api.get_server_info")
+    @patch("xrpld_netgen.api.is_container_running")
+    def test_status(self, mock_running, mock_info, workspace):
+        mock_running.side_effect = lambda node: node != "pnode1"
+        mock_info.return_value = {
+            "server_state": "proposing",
+            "validated_ledger": {"seq": 12},
+        }
+        result = run_operation("status", {"name": "test-cluster"})
+        assert result["nodes"]["vnode1"] == {
+            "running": True,
+            "server_state": "proposing",
+            "ledger": 12,
+        }
+        assert result["nodes"]["pnode1"] == {"running": False}
+        # the connections to the nodes are reused between requests
+        assert mock_info.call_args.kwargs["session"] is api._session
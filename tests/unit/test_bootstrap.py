@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+
+import pytest
+from unittest.mock import patch
+from xrpld_netgen import bootstrap
+from xrpld_netgen.bootstrap import (
+    bootstrap_node,
+    clone_tree,
+    find_synced_node,
+    seed_nodes,
+)
+
+
+@pytest.fixture
+def cluster_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(bootstrap, "basedir", str(tmp_path))
+    for node in ["vnode1", "pnode1", "pnode2"]:
+        (tmp_path / "test-cluster" / node / "lib" / "db").mkdir(parents=True)
+    db_dir = tmp_path / "test-cluster" / "pnode1" / "lib" / "db"
+    (db_dir / "ledger.db").write_bytes(b"sqlite" * 10)
+    (db_dir / "wallet.db").write_bytes(b"identity")
+    return tmp_path / "test-cluster"
+
+
+class TestCloneTree:
+    """Test cloning the db directory of a node"""
+
+    def test_clone(self, cluster_dir):
+        src = cluster_dir / "pnode1" / "lib"
+        nudb = src / "db" / "nudb.dat"
+        with open(nudb, "wb") as f:
+            f.write(b"x" * 10)
+            f.seek(4 * 1024 * 1024)
+            f.write(b"y")
+        (src / "db" / "000001.sst").write_bytes(b"table")
+        os.chmod(src / "db" / "ledger.db", 0o600)
+        (cluster_dir / "pnode2" / "lib" / "db" / "stale.db").write_bytes(b"old")
+        dst = cluster_dir / "pnode2" / "lib"
+
+        stats = clone_tree(str(src), str(dst))
+
+        assert sorted(os.listdir(dst / "db")) == ["000001.sst", "ledger.db", "nudb.dat"]
+        assert (dst / "db" / "ledger.db").read_bytes() == b"sqlite" * 10
+        assert os.stat(dst / "db" / "ledger.db").st_mode & 0o777 == 0o600
+        assert (dst / "db" / "nudb.dat").read_bytes() == nudb.read_bytes()
+        # immutable tables are shared, not copied
+        assert os.stat(dst / "db" / "000001.sst").st_ino == os.stat(
+            src / "db" / "000001.sst"
+        ).st_ino
+        assert stats["files"] == 3 and stats["linked"] == 1
+        if stats["copied"]:
+            # the hole of the sparse file is not copied
+            assert stats["copied_bytes"] < 4 * 1024 * 1024 + 60
+
+    def test_target_keeps_its_identity(self, cluster_dir):
+        src = cluster_dir / "pnode1" / "lib"
+        dst = cluster_dir / "pnode2" / "lib"
+        (dst / "db" / "wallet.db").write_bytes(b"own identity")
+        (dst / "db" / "wallet.db-wal").write_bytes(b"wal")
+        (dst / "db" / "stale").mkdir()
+        (dst / "db" / "stale" / "old.db").write_bytes(b"old")
+
+        clone_tree(str(src), str(dst))
+
+        assert sorted(os.listdir(dst / "db")) == [
+            "ledger.db",
+            "wallet.db",
+            "wallet.db-wal",
+        ]
+        assert (dst / "db" / "wallet.db").read_bytes() == b"own identity"
+
+
+class TestBootstrapNode:
+    """Test bootstrapping a node from a synced node"""
+
+    @patch("xrpld_netgen.bootstrap.get_server_info")
+    def test_prefers_synced_peers(self, mock_info, cluster_dir):
+        mock_info.side_effect = [Exception("down"), {"server_state": "full"}]
+        assert find_synced_node(str(cluster_dir), ["pnode1"]) == "vnode1"
+
+        mock_info.side_effect = [{"server_state": "connected"}]
+        with pytest.raises(ValueError, match="No synced node"):
+            find_synced_node(str(cluster_dir), ["pnode1", "vnode1"])
+
+    @patch("xrpld_netgen.bootstrap.wait_synced", return_value=True)
+    @patch("xrpld_netgen.bootstrap.run_command")
+    def test_bootstrap_and_compare(self, mock_run, mock_wait, cluster_dir):
+        timings = bootstrap_node("test-cluster", "pnode2", "pnode1", compare=True)
+
+        assert sorted(timings) == ["bootstrap", "copy", "sync"]
+        db_dir = cluster_dir / "pnode2" / "lib" / "db"
+        assert (db_dir / "ledger.db").read_bytes() == b"sqlite" * 10
+        assert not (db_dir / "wallet.db").exists()
+        commands = [c.args[1:] for c in mock_run.call_args_list]
+        assert commands == [
+            ("docker compose stop pnode2",),
+            ("docker compose up -d pnode2", {"START_MODE": "net"}),
+            ("docker compose stop pnode2",),
+            ("docker compose stop pnode1",),
+            ("docker compose up -d pnode1", {"START_MODE": "load"}),
+            ("docker compose up -d pnode2", {"START_MODE": "load"}),
+        ]
+
+    @patch("xrpld_netgen.bootstrap.run_command")
+    def test_seed_totals(self, mock_run, cluster_dir):
+        assert seed_nodes(str(cluster_dir), "pnode1", [])["files"] == 0
+        assert not mock_run.called
+
+        stats = seed_nodes(str(cluster_dir), "pnode1", ["pnode2", "vnode1"])
+        # ledger.db of both nodes, the wallet is not cloned
+        assert stats["files"] == 2
+        assert stats["bytes"] == 2 * len(b"sqlite" * 10)
+
+    @patch("xrpld_netgen.bootstrap.run_command", return_value=False)
+    def test_source_does_not_stop(self, mock_run, cluster_dir):
+        with pytest.raises(RuntimeError, match="Could not stop pnode1"):
+            seed_nodes(str(cluster_dir), "pnode1", ["pnode2"])
+        assert mock_run.call_count == 1
+        assert not (cluster_dir / "pnode2" / "lib" / "db" / "ledger.db").exists()
+
+    def test_unknown_node(self, cluster_dir):
+        with pytest.raises(ValueError, match="pnode9 is not a node"):
+            bootstrap_node("test-cluster", "pnode9")
+        with pytest.raises(ValueError, match="from itself"):
+            bootstrap_node("test-cluster", "pnode1", "pnode1")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import io
+import os
+import tarfile
+
+from xrpld_netgen.bundle import create_bundles, pack
+
+
+def node_dir(root, node, cfg):
+    (root / node / "config").mkdir(parents=True)
+    (root / node / "config" / "xahaud.cfg").write_text(cfg)
+    (root / node / "config" / "validators.txt").write_text("[validators]\n")
+    (root / node / "genesis.json").write_text("{}")
+    (root / node / "Dockerfile").write_text("FROM ubuntu")
+
+
+class TestPack:
+    """Test reproducible archives"""
+
+    def test_same_files_same_bytes(self, tmp_path):
+        (tmp_path / "a").write_text("data")
+        first = pack({"a": str(tmp_path / "a")})
+        os.utime(tmp_path / "a", (0, 0))
+        assert pack({"a": str(tmp_path / "a")}) == first
+
+        with tarfile.open(fileobj=io.BytesIO(first), mode="r:gz") as tar:
+            member = tar.getmember("a")
+            assert (member.mtime, member.uid, member.mode) == (0, 0, 0o644)
+
+
+class TestCreateBundles:
+    """Test the bundles of the hosts of a remote network"""
+
+    def test_bundles_are_shared(self, tmp_path):
+        node_dir(tmp_path, "vnode1", "validator")
+        node_dir(tmp_path, "pnode1", "peer")
+        node_dir(tmp_path, "pnode2", "peer")
+        (tmp_path / "xrpld.test").write_bytes(b"binary")
+        os.chmod(tmp_path / "xrpld.test", 0o755)
+
+        bundles = create_bundles(
+            str(tmp_path),
+            {"10.0.0.1": "vnode1", "10.0.1.1": "pnode1", "10.0.1.2": "pnode2"},
+            str(tmp_path / "xrpld.test"),
+        )
+
+        assert bundles["10.0.1.1"] == bundles["10.0.1.2"]
+        assert bundles["10.0.0.1"][0] != bundles["10.0.1.1"][0]
+        # one binary bundle for every host
+        assert len({digests[1] for digests in bundles.values()}) == 1
+        bundles_dir = tmp_path / "ansible" / "bundles"
+        assert len(os.listdir(bundles_dir)) == 3
+
+        path = bundles_dir / f"{bundles['10.0.0.1'][0]}.tar.gz"
+        with tarfile.open(path, mode="r:gz") as tar:
+            assert tar.getnames() == [
+                "config/validators.txt",
+                "config/xahaud.cfg",
+                "genesis.json",
+            ]
+        path = bundles_dir / f"{bundles['10.0.0.1'][1]}.tar.gz"
+        with tarfile.open(path, mode="r:gz") as tar:
+            assert tar.getmember("bin/xrpld").mode == 0o755
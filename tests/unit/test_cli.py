@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import json
+import subprocess
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+env = {**os.environ, "PYTHONPATH": root_dir}
+
+
+class TestCliImport:
+    """Test that importing the cli stays cheap and has no side effects"""
+
+    def test_import_defers_heavy_modules(self, tmp_path):
+        script = (
+            "import sys, json, xrpld_netgen.cli; print(json.dumps(sorted(m for m in "
+            "['xrpld_publisher', 'yaml', 'requests', 'dotenv', 'asyncio'] "
+            "if m in sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=tmp_path,
+            env=env,
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        assert json.loads(result.stdout.decode()) == []
+        assert not (tmp_path / "workspace").exists()
+
+    def test_import_network_creates_no_workspace(self, tmp_path):
+        subprocess.run(
+            [sys.executable, "-c", "import xrpld_netgen.network"],
+            cwd=tmp_path,
+            env=env,
+            check=True,
+        )
+        assert not (tmp_path / "workspace").exists()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import threading
+import yaml
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+from xrpld_netgen.utils import cache
+from xrpld_netgen.utils.deploy_kit import (
+    build_ansible_cfg,
+    build_rolling_playbook,
+    build_local_network_start_sh,
+    build_network_start_sh,
+    create_dockerfile,
+    download_binary,
+)
+
+
+class TestBuildLocalNetworkStartSh:
+    """Test the generated start script for local networks"""
+
+    def test_nodes_use_ledger_args(self):
+        content = build_local_network_start_sh("local-xahau", 2, 1)
+        nohup_lines = [line for line in content.splitlines() if "nohup" in line]
+        assert len(nohup_lines) == 3
+        for line in nohup_lines:
+            assert "$LEDGER_ARGS" in line
+            assert "--ledgerfile" not in line
+
+    def test_resume_loads_from_db(self):
+        content = build_local_network_start_sh("local-xahau", 1, 1)
+        assert '"--resume"' in content
+        assert 'LEDGER_ARGS="--load --valid"' in content
+        assert 'LEDGER_ARGS="--ledgerfile config/genesis.json"' in content
+
+
+class TestBuildAnsibleCfg:
+    """Test the generated ansible config of remote deployments"""
+
+    def test_one_fork_per_host(self):
+        content = build_ansible_cfg(50)
+        assert "forks = 50" in content
+        assert "pipelining = True" in content
+        assert "ControlPersist" in content
+        assert "forks = 5\n" in build_ansible_cfg(2)
+
+
+class TestBuildRollingPlaybook:
+    """Test the generated rolling deployment of remote networks"""
+
+    def test_batches_wait_for_sync(self):
+        plays = yaml.safe_load(build_rolling_playbook(3, 1, 300))
+        peers, validators = plays
+        assert (peers["hosts"], peers["serial"]) == ("peers", 3)
+        assert (validators["hosts"], validators["serial"]) == ("validators", 1)
+        assert validators["any_errors_fatal"] is True
+        assert validators["vars"]["health_timeout"] == 300
+        assert validators["tasks"] == [
+            {"import_tasks": "deploy_tasks.yml"},
+            {"import_tasks": "health_tasks.yml"},
+        ]
+        assert "rolling.log" in validators["post_tasks"][0]["lineinfile"]["path"]
+
+
+class TestMixedVersionNetwork:
+    """Test per node binaries of mixed version networks"""
+
+    def test_network_dockerfile_copies_xrpld(self):
+        content = create_dockerfile(
+            "xahau", True, True, "2025.8.1", "ubuntu:jammy", 1, 2, 3, 4, 5
+        )
+        assert "COPY xrpld.2025.8.1 /app/xrpld" in content
+
+    def test_start_sh_copies_node_version(self):
+        content = build_network_start_sh(
+            "2025.7.9", 2, 1, {"vnode1": "2025.7.9", "vnode2": "2025.8.1"}
+        )
+        assert "xrpld.2025.7.9 vnode1/" in content
+        assert "xrpld.2025.8.1 vnode2/" in content
+        assert "xrpld.2025.7.9 pnode1/" in content
+
+
+class TestDownloadBinary:
+    """Test downloading build server binaries through the cache"""
+
+    @patch("xrpld_netgen.utils.deploy_kit.requests.get")
+    def test_binary_downloaded_once(self, mock_get, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+        mock_response = Mock()
+        mock_response.iter_content.return_value = [b"ELF", b"binary"]
+        mock_get.return_value = mock_response
+        url = "https://build.xahau.tech/2025.7.9-release+1951"
+
+        download_binary(url, str(tmp_path / "xrpld.a"))
+        download_binary(url, str(tmp_path / "xrpld.b"))
+
+        mock_get.assert_called_once()
+        assert (tmp_path / "xrpld.b").read_bytes() == b"ELFbinary"
+        assert (tmp_path / "xrpld.b").stat().st_mode & 0o755 == 0o755
+
+    def test_concurrent_fetches_use_their_own_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+        barrier = threading.Barrier(2)
+        tmp_paths = []
+
+        def fetch(tmp_path):
+            tmp_paths.append(tmp_path)
+            with open(tmp_path, "wb") as f:
+                f.write(b"first")
+                barrier.wait(timeout=5)
+                f.write(b"binary")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            paths = list(
+                executor.map(
+                    lambda _: cache.cached_file("binaries", "xrpld", fetch), range(2)
+                )
+            )
+
+        assert len(set(tmp_paths)) == 2
+        assert open(paths[0], "rb").read() == b"firstbinary"
+        assert os.listdir(tmp_path / "cache" / "binaries") == ["xrpld"]
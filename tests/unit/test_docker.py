@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import struct
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+from xrpld_netgen.libs.docker import DockerClient, DockerError
+
+CONTAINERS = {
+    "vnode1": {"State": {"Running": True}, "Config": {"Tty": False}},
+    "vnode2": {"State": {"Running": False}, "Config": {"Tty": False}},
+}
+
+
+class FakeDockerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, body=None, content_type="application/json"):
+        data = json.dumps(body).encode() if content_type.endswith("json") else body
+        data = data or b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def container(self):
+        name = self.path.split("/")[2].split("?")[0]
+        self.server.requests.append((self.command, self.path))
+        return name, CONTAINERS.get(name)
+
+    def do_GET(self):
+        if self.path.startswith("/containers/json"):
+            self.server.requests.append((self.command, self.path))
+            return self.send(200, [{"Names": [f"/{n}"]} for n in CONTAINERS])
+        name, container = self.container()
+        if container is None:
+            return self.send(404, {"message": f"No such container: {name}"})
+        if "/logs" in self.path:
+            frames = b""
+            for stream, line in [(1, b"Publishing ledger 5\n"), (2, b"warning\n")]:
+                frames += struct.pack(">BxxxL", stream, len(line)) + line
+            return self.send(200, frames, "application/vnd.docker.raw-stream")
+        if "/stats" in self.path:
+            return self.send(200, {"memory_stats": {"usage": 1024}})
+        self.send(200, container)
+
+    def do_POST(self):
+        name, container = self.container()
+        if container is None:
+            return self.send(404, {"message": f"No such container: {name}"})
+        self.send(204 if container["State"]["Running"] else 304)
+
+    def do_DELETE(self):
+        name, container = self.container()
+        if container is None:
+            return self.send(404, {"message": f"No such container: {name}"})
+        self.send(204)
+
+
+@pytest.fixture
+def docker(tmp_path):
+    socket_path = str(tmp_path / "docker.sock")
+    server = socketserver.ThreadingUnixStreamServer(socket_path, FakeDockerHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    client = DockerClient(socket_path, timeout=5)
+    yield client, server
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestDockerClient:
+    """Test the docker engine api client against a fake socket server"""
+
+    def test_requests_reuse_one_connection(self, docker):
+        client, server = docker
+        assert len(client.list_containers(all=True)) == 2
+        assert client.is_running("vnode1") is True
+        assert client.is_running("vnode2") is False
+        assert server.connections == 1
+
+    def test_inspect_missing_container_returns_none(self, docker):
+        client, _ = docker
+        assert client.inspect_container("missing") is None
+        assert client.is_running("missing") is False
+
+    def test_stop_already_stopped_container(self, docker):
+        client, server = docker
+        client.stop_container("vnode2", timeout=3)
+        assert ("POST", "/containers/vnode2/stop?t=3") in server.requests
+
+    def test_remove_missing_container_raises_error(self, docker):
+        client, _ = docker
+        with pytest.raises(DockerError) as e:
+            client.remove_container("missing")
+        assert e.value.status == 404
+
+    def test_logs_are_demultiplexed(self, docker):
+        client, _ = docker
+        assert list(client.logs("vnode1", tail="20")) == [
+            ("stdout", b"Publishing ledger 5\n"),
+            ("stderr", b"warning\n"),
+        ]
+
+    def test_stats(self, docker):
+        client, _ = docker
+        assert client.stats("vnode1")["memory_stats"]["usage"] == 1024
+
+    def test_bulk_remove_returns_errors_per_container(self, docker):
+        client, _ = docker
+        results = client.remove_containers(["vnode1", "vnode2", "missing"], force=True)
+        assert results["vnode1"] is None
+        assert results["vnode2"] is None
+        assert isinstance(results["missing"], DockerError)
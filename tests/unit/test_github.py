@@ -7,7 +7,10 @@ from unittest.mock import Mock, patch
 from xrpld_netgen.libs.github import (
     get_commit_hash_from_server_version,
     download_file_at_commit_or_tag,
+    download_file_at_commit,
+    list_server_versions,
 )
+from xrpld_netgen.utils import cache
 
 
 class TestGetCommitHashFromServerVersion:
@@ -133,3 +136,44 @@ class TestDownloadFileAtCommitOrTag:
         mock_get.assert_called_once_with(
             "https://raw.githubusercontent.com/CustomOwner/custom-repo/main/path/to/file.txt"
         )
+
+
+class TestDownloadFileAtCommit:
+    """Test caching files downloaded at a commit hash"""
+
+    @patch("xrpld_netgen.libs.github.requests.get")
+    def test_download_file_at_commit_is_cached(self, mock_get, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b"REGISTER_FEATURE(Hooks, Supported::yes);"
+        mock_get.return_value = mock_response
+
+        first = download_file_at_commit("Xahau", "xahaud", "abc123", "Feature.cpp")
+        second = download_file_at_commit("Xahau", "xahaud", "abc123", "Feature.cpp")
+
+        assert first == second == b"REGISTER_FEATURE(Hooks, Supported::yes);"
+        mock_get.assert_called_once()
+
+
+class TestListServerVersions:
+    """Test listing the versions of a build server"""
+
+    @patch("xrpld_netgen.libs.github.requests.get")
+    def test_list_server_versions_sorted_by_build(self, mock_get):
+        mock_response = Mock()
+        mock_response.text = (
+            '<a href="2025.8.1-release+2000">2025.8.1-release+2000</a>'
+            '<a href="2025.8.1-release+2000.releaseinfo">info</a>'
+            '<a href="2024.11.18-release+987">2024.11.18-release+987</a>'
+            '<a href="2025.7.9-release+1951">2025.7.9-release+1951</a>'
+        )
+        mock_get.return_value = mock_response
+
+        result = list_server_versions("https://build.xahau.tech")
+
+        assert result == [
+            "2024.11.18-release+987",
+            "2025.7.9-release+1951",
+            "2025.8.1-release+2000",
+        ]
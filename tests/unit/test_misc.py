@@ -1,13 +1,24 @@
 #!/usr/bin/env python
 # coding: utf-8
 
+import socket
 import pytest
+from unittest.mock import Mock, patch
+from xrpld_netgen.utils import cache
 from xrpld_netgen.utils.misc import (
     generate_ports,
     get_node_port,
     sha512_half,
     get_node_db_path,
     get_relational_db,
+    parse_node_name,
+    list_cluster_nodes,
+    parse_version_map,
+    assign_node_versions,
+    check_deps,
+    get_prereq_ttl,
+    PREREQ_TTL,
+    remove_stale_containers,
 )
 
 
@@ -143,3 +154,132 @@ class TestGetRelationalDb:
     def test_get_relational_db_rwdb(self):
         result = get_relational_db("rwdb")
         assert result == "backend=rwdb"
+
+
+class TestParseNodeName:
+    """Test parsing node names into index and type"""
+
+    def test_parse_node_name_validator(self):
+        assert parse_node_name("vnode3") == (3, "validator")
+
+    def test_parse_node_name_peer(self):
+        assert parse_node_name("pnode12") == (12, "peer")
+
+    def test_parse_node_name_invalid_raises_error(self):
+        with pytest.raises(ValueError, match="Invalid node name"):
+            parse_node_name("vl")
+
+
+class TestListClusterNodes:
+    """Test listing the node folders of a cluster"""
+
+    def test_list_cluster_nodes_sorted(self, tmp_path):
+        for item in ["pnode1", "vnode10", "vnode2", "vl", "keystore"]:
+            (tmp_path / item).mkdir()
+        (tmp_path / "vnode1").write_text("not a folder")
+        assert list_cluster_nodes(str(tmp_path)) == ["vnode2", "vnode10", "pnode1"]
+
+
+class TestVersionMap:
+    """Test assigning build versions to the nodes of a mixed cluster"""
+
+    def test_parse_version_map(self):
+        result = parse_version_map("2025.7.9-release+1951=60, 2025.8.1-release+2000=40")
+        assert result == {"2025.7.9-release+1951": 60, "2025.8.1-release+2000": 40}
+
+    def test_parse_version_map_invalid_raises_error(self):
+        with pytest.raises(ValueError, match="Invalid version map entry"):
+            parse_version_map("2025.7.9-release+1951")
+
+    def test_parse_version_map_rejects_weights_that_are_not_positive(self):
+        with pytest.raises(ValueError, match="must be positive"):
+            parse_version_map("a=0,b=0")
+        with pytest.raises(ValueError, match="Invalid version map entry"):
+            parse_version_map("a=-10,b=110")
+
+    def test_assign_node_versions_follows_weights(self):
+        result = assign_node_versions(5, 2, {"a": 60, "b": 40})
+        assert result == {
+            "vnode1": "a",
+            "vnode2": "a",
+            "vnode3": "a",
+            "vnode4": "b",
+            "vnode5": "b",
+            "pnode1": "a",
+            "pnode2": "b",
+        }
+
+    def test_assign_node_versions_counts_add_up(self):
+        result = assign_node_versions(7, 0, {"a": 1, "b": 1, "c": 1})
+        assert len(result) == 7
+        assert sorted(result.values()).count("a") == 3
+
+
+class TestCheckDeps:
+    """Test caching the prerequisite check"""
+
+    def test_prereq_ttl_from_environment(self, monkeypatch):
+        monkeypatch.delenv("XRPLD_NETGEN_PREREQ_TTL", raising=False)
+        assert get_prereq_ttl() == PREREQ_TTL
+        monkeypatch.setenv("XRPLD_NETGEN_PREREQ_TTL", "0")
+        assert get_prereq_ttl() == 0
+        monkeypatch.setenv("XRPLD_NETGEN_PREREQ_TTL", "1h")
+        assert get_prereq_ttl() == PREREQ_TTL
+
+    @patch("xrpld_netgen.utils.misc.subprocess.run")
+    def test_passed_check_is_cached(self, mock_run, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+        mock_run.return_value = Mock(returncode=0)
+        script = tmp_path / "prerequisites.sh"
+        script.write_text("exit 0")
+
+        check_deps([str(script)], ttl=60)
+        check_deps([str(script)], ttl=60)
+
+        mock_run.assert_called_once()
+
+    @patch("xrpld_netgen.utils.misc.subprocess.run")
+    def test_changed_fingerprint_checks_again(self, mock_run, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+        mock_run.return_value = Mock(returncode=0)
+        script = tmp_path / "prerequisites.sh"
+        script.write_text("exit 0")
+
+        check_deps([str(script)], ttl=60)
+        monkeypatch.setenv("DOCKER_HOST", "tcp://remote:2375")
+        check_deps([str(script)], ttl=60)
+
+        assert mock_run.call_count == 2
+
+    @patch("xrpld_netgen.utils.misc.subprocess.run")
+    def test_zero_ttl_always_checks(self, mock_run, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+        mock_run.return_value = Mock(returncode=0)
+        script = tmp_path / "prerequisites.sh"
+        script.write_text("exit 0")
+
+        check_deps([str(script)], ttl=0)
+        check_deps([str(script)], ttl=0)
+
+        assert mock_run.call_count == 2
+
+
+class TestRemoveStaleContainers:
+    """Test removing the containers of a previous run"""
+
+    @patch("xrpld_netgen.utils.misc.remove_containers")
+    def test_unreachable_socket_falls_back_to_cli(
+        self, mock_remove, tmp_path, monkeypatch, capsys
+    ):
+        # a socket file nobody listens on, like after the daemon stopped
+        path = str(tmp_path / "docker.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(path)
+        sock.close()
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{path}")
+        monkeypatch.delenv("DOCKER_CONTEXT", raising=False)
+
+        remove_stale_containers(["xahau", "vnode1"])
+
+        mock_remove.assert_called_once_with("docker rm -f xahau vnode1")
+        assert "Docker Ready" not in capsys.readouterr().out
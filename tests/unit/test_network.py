@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import json
+import threading
+import yaml
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from xrpld_netgen.utils.misc import working_directory
+
+from xrpld_netgen.network import (
+    NetworkBuilder,
+    get_ssh_settings,
+    get_upgrade_batches,
+    rolling_upgrade,
+)
+
+FEATURES = [
+    "XRPL_FEATURE(Batch, Supported::yes, VoteBehavior::DefaultNo)",
+    "XRPL_FIX(UniversalNumber, Supported::yes, VoteBehavior::DefaultYes)",
+]
+
+
+def build(builder, name, num_validators):
+    return builder.create_node_folders(
+        True,
+        name,
+        "ubuntu:jammy",
+        FEATURES,
+        num_validators,
+        1,
+        21339,
+        True,
+        num_validators - 1,
+        "ED" + "0" * 64,
+        "",
+        "xahau",
+    )
+
+
+class TestNetworkBuilder:
+    """Test that builders keep the state of their own cluster"""
+
+    def test_builders_do_not_share_services(self, tmp_path):
+        first = NetworkBuilder(str(tmp_path / "a"))
+        second = NetworkBuilder(str(tmp_path / "b"))
+        build(first, "one", 2)
+        build(second, "two", 1)
+        assert sorted(first.services) == ["pnode1", "vnode1", "vnode2"]
+        assert sorted(second.services) == ["pnode1", "vnode1"]
+        assert second.services["vnode1"]["networks"] == ["two-network"]
+
+    def test_concurrent_builds(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        builders = [NetworkBuilder(str(tmp_path / f"ws{i}")) for i in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            manifests = list(executor.map(lambda b: build(b, "net", 2), builders))
+
+        assert os.getcwd() == str(tmp_path)
+        # keys are created in the keystore of every cluster, not the cwd
+        assert not (tmp_path / "keystore").exists()
+        for i, builder in enumerate(builders):
+            cluster_dir = tmp_path / f"ws{i}" / "net-cluster"
+            assert (cluster_dir / "keystore" / "vnode2" / "key.json").exists()
+            assert (cluster_dir / "vnode1" / "config").is_dir()
+            assert len(builder.services) == 3
+        assert len({m for result in manifests for m in result}) == 8
+
+
+class TestBuilderWorkdir:
+    """Test that a builder never captures the directory of another builder"""
+
+    def test_waits_for_working_directory(self, tmp_path):
+        original = os.getcwd()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with working_directory(str(tmp_path)):
+                entered.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        entered.wait(5)
+        builders = []
+        constructor = threading.Thread(
+            target=lambda: builders.append(NetworkBuilder(str(tmp_path)))
+        )
+        constructor.start()
+        constructor.join(0.2)
+        # blocked until the other thread is back in its own directory
+        assert not builders
+        release.set()
+        holder.join()
+        constructor.join()
+        assert builders[0].workdir == original
+
+
+class TestGetSshSettings:
+    """Test that library callers get the ssh settings of the .env"""
+
+    def test_reads_dotenv(self, tmp_path, monkeypatch):
+        for key in ["SSH_PORT", "SSH_USER", "SSH_PATH"]:
+            monkeypatch.delenv(key, raising=False)
+        (tmp_path / ".env").write_text("SSH_PORT=2222\nSSH_USER=deploy\n")
+        monkeypatch.chdir(tmp_path)
+        try:
+            assert get_ssh_settings() == {
+                "port": "2222",
+                "user": "deploy",
+                "key": "~/.ssh/id_rsa",
+            }
+        finally:
+            os.environ.pop("SSH_PORT", None)
+            os.environ.pop("SSH_USER", None)
+
+
+class TestCreateAnsible:
+    """Test that an ansible cluster builds and pushes one image"""
+
+    @patch("xrpld_netgen.network.run_commands")
+    @patch("xrpld_netgen.network.run_command")
+    @patch("xrpld_netgen.network.download_binary")
+    @patch("xrpld_netgen.network.download_file_at_commit")
+    @patch("xrpld_netgen.network.get_commit_hash_from_server_version")
+    def test_single_image(
+        self, mock_hash, mock_feature, mock_binary, mock_run, mock_run_all, tmp_path
+    ):
+        mock_feature.return_value = "\n".join(FEATURES).encode()
+        mock_binary.side_effect = lambda url, path: open(path, "w").close()
+        builder = NetworkBuilder(str(tmp_path))
+        builder.create_ansible(
+            "warning", "", "xahau", 3, 2, 21339, "https://build.xahau.tech",
+            "2025.7.9-release+1951", False, 2, "NuDB",
+            ["10.0.0.1", "10.0.0.2", "10.0.0.3"], ["10.0.1.1", "10.0.1.2"],
+            ["transia", "ghcr.io/transia"], 2,
+        )  # fmt: skip
+
+        commands = [c.args[1] for c in mock_run.call_args_list]
+        builds = [c for c in commands if c.startswith("docker build")]
+        assert builds == [
+            "docker build -f Dockerfile --platform linux/x86_64 "
+            "--tag transia/cluster:2025.7.9.release.1951 "
+            "--tag ghcr.io/transia/cluster:2025.7.9.release.1951 ."
+        ]
+        # the registries are pushed concurrently
+        assert sorted(mock_run_all.call_args.args[1]) == [
+            "docker push ghcr.io/transia/cluster:2025.7.9.release.1951",
+            "docker push transia/cluster:2025.7.9.release.1951",
+        ]
+        assert mock_run_all.call_args.kwargs["limit"] == 2
+        cluster_dir = tmp_path / "2025.7.9-release+1951-cluster"
+        assert not (cluster_dir / "vnode1" / "xrpld.2025.7.9-release+1951").exists()
+        host_vars = cluster_dir / "ansible" / "host_vars"
+        assert len(os.listdir(host_vars)) == 5
+        assert "transia/cluster:2025.7.9.release.1951" in (
+            host_vars / "10.0.1.2.yml"
+        ).read_text()
+        ansible_dir = cluster_dir / "ansible"
+        assert (ansible_dir / "incremental.yml").exists()
+        assert "forks = 5" in (ansible_dir / "ansible.cfg").read_text()
+        # 3 validators with a quorum of 2 deploy one at a time
+        plays = yaml.safe_load((ansible_dir / "rolling.yml").read_text())
+        assert [(p["hosts"], p["serial"]) for p in plays] == [
+            ("peers", 2),
+            ("validators", 1),
+        ]
+        hosts = (ansible_dir / "hosts.txt").read_text()
+        assert "[validators]\n10.0.0.1\n10.0.0.2\n10.0.0.3\n" in hosts
+        assert "[peers]\n10.0.1.1\n10.0.1.2\n" in hosts
+
+    @patch("xrpld_netgen.network.run_commands")
+    @patch("xrpld_netgen.network.run_command")
+    @patch("xrpld_netgen.network.download_binary")
+    @patch("xrpld_netgen.network.download_file_at_commit")
+    @patch("xrpld_netgen.network.get_commit_hash_from_server_version")
+    def test_bundles(
+        self, mock_hash, mock_feature, mock_binary, mock_run, mock_run_all, tmp_path
+    ):
+        mock_feature.return_value = "\n".join(FEATURES).encode()
+        mock_binary.side_effect = lambda url, path: open(path, "w").close()
+        builder = NetworkBuilder(str(tmp_path))
+        builder.create_ansible(
+            "warning", "", "xahau", 1, 1, 21339, "https://build.xahau.tech",
+            "2025.7.9-release+1951", False, 1, "NuDB", ["10.0.0.1"], ["10.0.1.1"],
+            bundle_binary=True,
+        )  # fmt: skip
+
+        ansible_dir = tmp_path / "2025.7.9-release+1951-cluster" / "ansible"
+        host_vars = yaml.safe_load(
+            (ansible_dir / "host_vars" / "10.0.0.1.yml").read_text()
+        )
+        assert len(host_vars["bundles"]) == 2
+        assert "/opt/ripple/bin/xrpld:/app/xrpld:ro" in host_vars["docker_volumes"]
+        for digest in host_vars["bundles"]:
+            assert (ansible_dir / "bundles" / f"{digest}.tar.gz").exists()
+        # every playbook that mounts the binary ships the bundles first
+        for playbook in ["main.yml", "deploy_tasks.yml"]:
+            assert "import_tasks: bundle_tasks.yml" in (
+                ansible_dir / playbook
+            ).read_text()
+        bundle_tasks = yaml.safe_load((ansible_dir / "bundle_tasks.yml").read_text())
+        assert "/opt/ripple/bundles/current" in str(bundle_tasks)
+
+
+class TestRollingUpgrade:
+    """Test upgrading a running network without losing quorum"""
+
+    def cluster(self, tmp_path, quorum):
+        cluster_dir = tmp_path / "net"
+        for node in ["vnode1", "vnode2", "vnode3", "vnode4", "vnode5", "pnode1"]:
+            (cluster_dir / node).mkdir(parents=True)
+        (cluster_dir / "cluster.json").write_text(json.dumps({"quorum": quorum}))
+        return cluster_dir
+
+    def test_batches_keep_quorum(self):
+        nodes = ["vnode1", "vnode2", "vnode3", "pnode1", "pnode2"]
+        assert get_upgrade_batches(nodes, 3, 1) == [
+            ["vnode1"],
+            ["vnode2"],
+            ["vnode3", "pnode1", "pnode2"],
+        ]
+        assert get_upgrade_batches(nodes, 2, 2) == [
+            ["vnode1", "vnode2"],
+            ["vnode3", "pnode1"],
+            ["pnode2"],
+        ]
+
+    @patch("xrpld_netgen.network.install_node_binary")
+    @patch("xrpld_netgen.network.run_command", return_value=True)
+    @patch("xrpld_netgen.network.download_binary")
+    def test_caps_validators(
+        self, mock_download, mock_run, mock_install, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr("xrpld_netgen.network.basedir", str(tmp_path))
+        self.cluster(tmp_path, 3)
+        with patch(
+            "xrpld_netgen.network.wait_for_server_state", return_value="full"
+        ):
+            downtimes = rolling_upgrade("net", "https://build", "2.0.0", None, 4)
+
+        assert len(downtimes) == 6
+        stops = [c.args[1] for c in mock_run.call_args_list if " stop " in c.args[1]]
+        # 5 validators with a quorum of 3, at most 2 down at once
+        assert stops == [
+            "docker compose stop vnode1 vnode2",
+            "docker compose stop vnode3 vnode4",
+            "docker compose stop vnode5 pnode1",
+        ]
+
+    @patch("xrpld_netgen.network.install_node_binary")
+    @patch("xrpld_netgen.network.run_command", return_value=True)
+    @patch("xrpld_netgen.network.download_binary")
+    def test_stops_when_batch_does_not_sync(
+        self, mock_download, mock_run, mock_install, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr("xrpld_netgen.network.basedir", str(tmp_path))
+        self.cluster(tmp_path, 4)
+        with patch(
+            "xrpld_netgen.network.wait_for_server_state", return_value=None
+        ):
+            with pytest.raises(RuntimeError, match="vnode1 did not sync"):
+                rolling_upgrade("net", "https://build", "2.0.0", None, 2, 5)
+
+        stops = [c.args[1] for c in mock_run.call_args_list if " stop " in c.args[1]]
+        assert stops == ["docker compose stop vnode1"]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import time
+import threading
+
+import pytest
+from unittest.mock import patch
+from xrpld_netgen.api import OPERATIONS
+from xrpld_netgen.plan import load_plan, parse_steps, resolve, run_plan
+
+PLAN = """
+steps:
+  - id: create
+    run: create:network
+    with: {build_version: "2025.7.9-release+1951"}
+  - id: up
+    run: up
+    with: {name: "${create.name}"}
+  - id: amendment
+    run: enable:amendment
+    needs: up
+    with: {name: "${create.name}", amendment_name: Hooks, node_id: 1}
+"""
+
+
+class TestLoadPlan:
+    """Test reading the steps of a plan file"""
+
+    def test_steps_need_the_previous_step(self, tmp_path):
+        path = tmp_path / "plan.yaml"
+        path.write_text(PLAN)
+        steps = load_plan(str(path))
+        assert [s["needs"] for s in steps] == [[], ["create"], ["up", "create"]]
+        assert steps[1]["with"] == {"name": "${create.name}"}
+
+    def test_unknown_operation(self):
+        with pytest.raises(ValueError, match="unknown operation"):
+            parse_steps([{"run": "missing"}])
+
+    def test_needs_only_earlier_steps(self):
+        with pytest.raises(ValueError, match="needs unknown step"):
+            parse_steps([{"run": "list", "needs": ["2"]}, {"run": "list"}])
+
+    def test_resolve_references(self):
+        results = {"create": {"name": "net-cluster", "validators": 3}}
+        assert resolve(
+            {"name": "${create.name}", "num": "${create.validators}"}, results
+        ) == {"name": "net-cluster", "num": 3}
+        assert resolve(["logs/${create.name}"], results) == ["logs/net-cluster"]
+
+
+class TestRunPlan:
+    """Test running the steps of a plan in one process"""
+
+    def test_independent_steps_run_concurrently(self):
+        # the three first steps only pass the barrier when they run at once
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait(name):
+            barrier.wait()
+            return {"name": name}
+
+        def echo(name):
+            return {"name": name}
+
+        with patch.dict(OPERATIONS, {"wait": wait, "echo": echo}):
+            steps = parse_steps(
+                [
+                    {"id": "a", "run": "wait", "with": {"name": "a"}},
+                    {"id": "b", "run": "wait", "with": {"name": "b"}, "needs": []},
+                    {"id": "c", "run": "wait", "with": {"name": "c"}, "needs": []},
+                    {"id": "d", "run": "echo", "with": {"name": "${a.name}-d"}},
+                ]
+            )
+            report = run_plan(steps)
+        assert steps[3]["needs"] == ["c", "a"]
+        assert [r["status"] for r in report] == ["ok"] * 4
+        assert all(r["seconds"] >= 0 for r in report)
+
+    def test_failure_skips_remaining_steps(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        def slow():
+            time.sleep(0.05)
+
+        with patch.dict(OPERATIONS, {"fail": fail, "slow": slow}):
+            steps = parse_steps(
+                [
+                    {"id": "fail", "run": "fail"},
+                    {"id": "slow", "run": "slow", "needs": []},
+                    {"id": "after", "run": "slow"},
+                ]
+            )
+            report = run_plan(steps)
+        assert [r["status"] for r in report] == ["failed", "ok", "skipped"]
+        assert report[0]["error"] == "boom"
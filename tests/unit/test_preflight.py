@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import pytest
+import yaml
+from unittest.mock import patch
+from xrpld_netgen import preflight as preflight_module
+from xrpld_netgen.preflight import (
+    check_host,
+    get_requirements,
+    load_inventory,
+    preflight,
+    print_preflight_report,
+)
+
+HOST = "ansible_port=22 ansible_user=ubuntu ansible_ssh_private_key_file=~/.ssh/id"
+GB = 1024**2
+
+
+def probe(cpus=8, memory_gb=32, disk_gb=200, ports="22,80"):
+    return {
+        "cpus": str(cpus),
+        "memory_kb": str(memory_gb * GB),
+        "disk_kb": str(disk_gb * GB),
+        "docker": "27.1.1",
+        "ports": ports,
+    }
+
+
+@pytest.fixture
+def ansible_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(preflight_module, "basedir", str(tmp_path))
+    ansible_dir = tmp_path / "net-cluster" / "ansible"
+    (ansible_dir / "host_vars").mkdir(parents=True)
+    (ansible_dir / "hosts.txt").write_text(
+        "[all]\n"
+        f"10.0.0.1 {HOST} vars_file=host_vars/10.0.0.1.yml \n"
+        f"10.0.1.1 {HOST} vars_file=host_vars/10.0.1.1.yml \n\n"
+        f"[peer]\n10.0.1.1 {HOST} vars_file=host_vars/10.0.1.1.yml \n\n"
+        "[validators]\n10.0.0.1\n\n[peers]\n10.0.1.1\n"
+    )
+    for ip, node in [("10.0.0.1", "vnode1"), ("10.0.1.1", "pnode1")]:
+        config_dir = tmp_path / "net-cluster" / node / "config"
+        config_dir.mkdir(parents=True)
+        (config_dir / "xahaud.cfg").write_text(
+            "[node_size]\nmedium\n\n[ledger_history]\n256\n"
+        )
+        host_vars = {
+            "config_path": str(config_dir),
+            "docker_container_name": node,
+            "docker_container_ports": ["5005:5005", "21337:21337"],
+        }
+        (ansible_dir / "host_vars" / f"{ip}.yml").write_text(yaml.dump(host_vars))
+    return ansible_dir
+
+
+class TestRequirements:
+    """Test the host sizing of a node"""
+
+    def test_from_node_config(self, ansible_dir):
+        requirements = get_requirements(str(ansible_dir / "../vnode1/config"))
+        assert requirements["cpus"] == 4
+        assert requirements["memory_gb"] == 16
+        assert requirements["disk_gb"] == pytest.approx(10.128)
+
+    def test_defaults_of_xrpld(self, tmp_path):
+        (tmp_path / "xahaud.cfg").write_text("[node_size]\nsmall\n")
+        requirements = get_requirements(str(tmp_path))
+        assert requirements["ledger_history"] == "256"
+        assert requirements["disk_gb"] == pytest.approx(10.128)
+        assert get_requirements(str(tmp_path / "missing"))["node_size"] == "medium"
+
+    def test_check_host(self):
+        requirements = {
+            "node_size": "large",
+            "ledger_history": "full",
+            "cpus": 8,
+            "memory_gb": 32,
+            "disk_gb": 110,
+        }
+        report = check_host(probe(cpus=4, disk_gb=50), requirements, [80, 5005])
+        assert len(report["errors"]) == 2
+        assert report["ports_in_use"] == [80]
+        assert check_host(probe(), requirements, [5005])["errors"] == []
+
+
+class TestPreflight:
+    """Test probing the hosts of a remote network"""
+
+    def test_inventory(self, ansible_dir):
+        inventory = load_inventory(str(ansible_dir))
+        assert list(inventory) == ["10.0.0.1", "10.0.1.1"]
+        assert inventory["10.0.0.1"]["ansible_user"] == "ubuntu"
+
+    @patch("xrpld_netgen.preflight.probe_host")
+    def test_reports_every_host(self, mock_probe, ansible_dir):
+        mock_probe.side_effect = lambda host, ssh, timeout: (
+            probe(memory_gb=4) if host == "10.0.0.1" else probe(ports="5005")
+        )
+        reports = preflight("net-cluster")
+
+        assert reports["10.0.0.1"]["node"] == "vnode1"
+        assert "node_size medium needs 16 GB" in reports["10.0.0.1"]["errors"][0]
+        assert reports["10.0.1.1"]["errors"] == []
+        assert reports["10.0.1.1"]["ports_in_use"] == [5005]
+        assert print_preflight_report(reports) is False
+
+    @patch("xrpld_netgen.preflight.probe_host")
+    def test_unreachable_host(self, mock_probe, ansible_dir):
+        mock_probe.side_effect = RuntimeError("Connection refused")
+        reports = preflight("net-cluster")
+        assert reports["10.0.1.1"]["errors"] == ["unreachable: Connection refused"]
+        assert print_preflight_report(reports) is False
+
+    def test_missing_inventory(self, ansible_dir):
+        with pytest.raises(ValueError, match="no ansible inventory"):
+            preflight("other-cluster")
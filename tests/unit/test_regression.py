@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sys
+import pytest
+from unittest.mock import patch
+from xrpld_netgen.regression import (
+    select_versions,
+    bisect_versions,
+    is_regression,
+    run_benchmark,
+    measure_version,
+    run_bisect,
+)
+
+
+class TestSelectVersions:
+    """Test selecting the bisect range from the build server versions"""
+
+    def test_select_versions_inclusive(self):
+        versions = ["a+1", "b+2", "c+3", "d+4"]
+        assert select_versions(versions, "b+2", "d+4") == ["b+2", "c+3", "d+4"]
+
+    def test_select_versions_unknown_raises_error(self):
+        with pytest.raises(ValueError, match="not found"):
+            select_versions(["a+1", "b+2"], "a+1", "x+9")
+
+    def test_select_versions_wrong_order_raises_error(self):
+        with pytest.raises(ValueError, match="must be older"):
+            select_versions(["a+1", "b+2"], "b+2", "a+1")
+
+
+class TestBisectVersions:
+    """Test the binary search for the first bad version"""
+
+    def test_bisect_finds_first_bad(self):
+        versions = [str(i) for i in range(10)]
+        tested = []
+
+        def is_good(version):
+            tested.append(version)
+            return int(version) < 7
+
+        first_bad, results = bisect_versions(versions, is_good)
+        assert first_bad == "7"
+        assert len(tested) <= 4
+        assert set(results) == set(tested)
+
+    def test_bisect_adjacent_versions_tests_nothing(self):
+        first_bad, results = bisect_versions(["1", "2"], lambda v: True)
+        assert first_bad == "2"
+        assert results == {}
+
+
+class TestIsRegression:
+    """Test comparing a metric to the threshold"""
+
+    def test_rate_below_threshold_regresses(self):
+        assert is_regression(350, 400, False)
+        assert not is_regression(450, 400, False)
+
+    def test_duration_above_threshold_regresses(self):
+        assert is_regression(4.5, 4.0, True)
+        assert not is_regression(3.5, 4.0, True)
+
+
+class TestRunBenchmark:
+    """Test running the benchmark command"""
+
+    def test_last_line_is_metric(self, tmp_path):
+        command = f"{sys.executable} -c \"print('warming up'); print(412.5)\""
+        assert run_benchmark(command, str(tmp_path), {}, 10) == 412.5
+
+    def test_failing_benchmark_raises_error(self, tmp_path):
+        command = f"{sys.executable} -c \"raise SystemExit(3)\""
+        with pytest.raises(ValueError, match="Benchmark failed"):
+            run_benchmark(command, str(tmp_path), {}, 10)
+
+
+class TestMeasureVersion:
+    """Test measuring a version on a fresh cluster"""
+
+    @patch("xrpld_netgen.regression.remove_directory")
+    @patch("xrpld_netgen.regression.wait_for_server_state")
+    @patch("xrpld_netgen.regression.run_command")
+    @patch("xrpld_netgen.regression.create_network")
+    def test_cluster_that_does_not_start_fails(
+        self, mock_create, mock_run, mock_wait, mock_remove
+    ):
+        mock_run.side_effect = [False, True]
+        with pytest.raises(ValueError, match="did not start"):
+            measure_version("2.0.0", "bench", "ED", "https://build", 3, 1, 1, 10)
+
+        mock_wait.assert_not_called()
+        assert mock_run.call_args_list[1].args[1] == "bash stop.sh --remove"
+        mock_remove.assert_called_once()
+
+
+class TestRunBisect:
+    """Test bisecting builds"""
+
+    @patch("xrpld_netgen.regression.measure_version")
+    @patch("xrpld_netgen.regression.list_server_versions")
+    def test_failed_version_counts_as_bad(self, mock_versions, mock_measure):
+        mock_versions.return_value = ["1", "2", "3", "4"]
+        results = {"1": 100.0, "3": 100.0, "4": 10.0}
+
+        def measure(version, *args):
+            if version not in results:
+                raise ValueError(f"{version}-cluster did not start")
+            return results[version]
+
+        mock_measure.side_effect = measure
+        assert run_bisect("1", "4", "bench", 50, "ED") == "2"
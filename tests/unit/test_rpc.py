@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import requests
+from unittest.mock import Mock, patch
+from xrpld_netgen.libs.rpc import rpc_request, wait_for_server_state
+
+
+class TestRpcRequest:
+    """Test sending rpc requests to a node"""
+
+    @patch("xrpld_netgen.libs.rpc.requests.post")
+    def test_rpc_request_success(self, mock_post):
+        mock_response = Mock()
+        mock_response.json.return_value = {"result": {"status": "success"}}
+        mock_post.return_value = mock_response
+
+        result = rpc_request(5105, "server_info")
+
+        assert result == {"status": "success"}
+        mock_post.assert_called_once_with(
+            "http://localhost:5105",
+            json={"method": "server_info", "params": [{}]},
+            timeout=5,
+        )
+
+
+class TestWaitForServerState:
+    """Test polling a node until it is synced"""
+
+    @patch("xrpld_netgen.libs.rpc.time.sleep")
+    @patch("xrpld_netgen.libs.rpc.get_server_info")
+    def test_wait_until_state(self, mock_info, mock_sleep):
+        mock_info.side_effect = [
+            requests.ConnectionError(),
+            {"server_state": "syncing"},
+            {"server_state": "proposing"},
+        ]
+
+        state = wait_for_server_state(5105, ["full", "proposing"], 60, 0)
+
+        assert state == "proposing"
+        assert mock_info.call_count == 3
+
+    @patch("xrpld_netgen.libs.rpc.time.sleep")
+    @patch("xrpld_netgen.libs.rpc.get_server_info")
+    def test_wait_timeout(self, mock_info, mock_sleep):
+        mock_info.return_value = {"server_state": "syncing"}
+
+        assert wait_for_server_state(5105, ["full"], 0, 0) is None
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sys
+import time
+import asyncio
+
+import pytest
+from xrpld_netgen.utils import runner
+from xrpld_netgen.utils.misc import run_command, run_commands
+from xrpld_netgen.utils.runner import run, run_async, run_many
+
+
+def python(code: str):
+    return [sys.executable, "-c", code]
+
+
+class TestRun:
+    """Test streaming a command with a timeout"""
+
+    def test_streams_with_prefix(self, capsys, tmp_path):
+        result = run(
+            python("import sys; print('one'); print('two', file=sys.stderr)"),
+            cwd=str(tmp_path),
+            prefix="vnode1",
+        )
+
+        assert result.ok
+        assert capsys.readouterr().out == "[vnode1] one\n[vnode1] two\n"
+        assert result.tail == ["one", "two"]
+
+    def test_keeps_tail(self, capsys, monkeypatch):
+        monkeypatch.setattr(runner, "TAIL_LINES", 2)
+        result = run(python("print('\\n'.join(map(str, range(5))))"), quiet=True)
+
+        assert result.tail == ["3", "4"]
+        assert capsys.readouterr().out == ""
+
+    def test_long_lines_are_split(self, monkeypatch):
+        monkeypatch.setattr(runner, "LINE_LIMIT", 1000)
+        result = run(
+            python("print('a' * 2500); print('end')"), quiet=True, timeout=10
+        )
+
+        assert result.ok
+        assert [len(line) for line in result.tail] == [1000, 1000, 500, 3]
+
+    def test_failure(self):
+        result = run(python("raise SystemExit(3)"), quiet=True)
+        assert result.returncode == 3 and not result.ok and not result.timed_out
+
+    def test_timeout_terminates(self):
+        start = time.perf_counter()
+        result = run(python("import time; time.sleep(30)"), timeout=0.5)
+
+        assert result.timed_out and not result.ok
+        assert time.perf_counter() - start < 10
+
+    def test_cancel_terminates(self):
+        async def cancel():
+            task = asyncio.ensure_future(
+                run_async(python("import time; time.sleep(30)"))
+            )
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        start = time.perf_counter()
+        asyncio.run(cancel())
+        assert time.perf_counter() - start < 10
+
+    def test_from_running_loop(self):
+        async def call():
+            return run(python("print('ok')"), quiet=True)
+
+        assert asyncio.run(call()).tail == ["ok"]
+
+
+class TestRunMany:
+    """Test running independent commands concurrently"""
+
+    def test_limit(self):
+        sleep = {"command": python("import time; time.sleep(0.5)"), "quiet": True}
+        start = time.perf_counter()
+        results = run_many([sleep] * 4, limit=2)
+
+        assert all(r.ok for r in results)
+        # two rounds of two
+        assert 1 <= time.perf_counter() - start < 1.9
+
+    def test_run_commands(self, capsys, tmp_path):
+        assert run_commands(str(tmp_path), ["echo a", "echo b"])
+        out = capsys.readouterr().out
+        assert "[a] a\n" in out and "[b] b\n" in out
+        assert not run_commands(str(tmp_path), ["echo a", "false"])
+
+
+class TestRunCommand:
+    """Test run_command never raises"""
+
+    def test_messages(self, capsys, tmp_path):
+        assert run_command(str(tmp_path), "echo hello")
+        assert not run_command(str(tmp_path), "sleep 5", timeout=0.2)
+        assert not run_command(str(tmp_path), "missing-command-xyz")
+        out = capsys.readouterr().out
+        assert "hello\nCommand 'echo hello' executed successfully." in out
+        assert "The command 'sleep 5' timed out" in out
+        assert "'missing-command-xyz' does not exist" in out
+
+    def test_long_line_does_not_raise(self, capsys, tmp_path, monkeypatch):
+        monkeypatch.setattr(runner, "LINE_LIMIT", 1000)
+        command = f"{sys.executable} -c \"print('x' * 5000)\""
+        assert run_command(str(tmp_path), command)
+        assert not run_command(str(tmp_path), "echo 'unbalanced")
+        out = capsys.readouterr().out
+        assert "x" * 1000 + "\n" in out
+        assert "No closing quotation" in out
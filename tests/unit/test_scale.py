@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+
+import pytest
+import yaml
+from unittest.mock import call, patch
+from xrpld_netgen import scale
+from xrpld_netgen.network import BUILD_TIMEOUT, NetworkBuilder
+from xrpld_netgen.scale import add_nodes, remove_nodes
+from xrpld_netgen.unl import ValidatorListManager
+from xrpld_netgen.utils.misc import COMMAND_TIMEOUT
+
+FEATURES = [
+    "XRPL_FEATURE(Batch, Supported::yes, VoteBehavior::DefaultNo)",
+]
+
+
+@pytest.fixture
+def cluster_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(scale, "basedir", str(tmp_path))
+    (tmp_path / "net-cluster").mkdir()
+    builder = NetworkBuilder(str(tmp_path))
+    unl = ValidatorListManager(str(tmp_path / "net-cluster"))
+    manifests = builder.create_node_folders(
+        True, "net", "ubuntu:jammy", FEATURES, 2, 1, 21339, True, 1,
+        unl.public_key, "", "xahau",
+    )  # fmt: skip
+    unl.set_validators(manifests)
+    unl.publish()
+    cluster_dir = tmp_path / "net-cluster"
+    (cluster_dir / "xrpld.net").write_text("binary")
+    (cluster_dir / "pnode1" / "lib" / "db").mkdir(parents=True)
+    (cluster_dir / "pnode1" / "lib" / "db" / "ledger.db").write_text("ledgers")
+    (cluster_dir / "pnode1" / "lib" / "db" / "wallet.db").write_text("identity")
+    with open(cluster_dir / "docker-compose.yml", "w") as f:
+        yaml.dump({"services": builder.services}, f)
+    return cluster_dir
+
+
+def read_spec(cluster_dir):
+    return json.loads((cluster_dir / "cluster.json").read_text())
+
+
+class TestAddNodes:
+    """Test adding nodes to a running cluster"""
+
+    @patch("xrpld_netgen.scale.run_command")
+    def test_add_validator_and_peer(self, mock_run, cluster_dir):
+        assert add_nodes("net-cluster", 1, 1) == ["vnode3", "pnode2"]
+
+        spec = read_spec(cluster_dir)
+        assert (spec["num_validators"], spec["num_peers"]) == (3, 2)
+        with open(cluster_dir / "docker-compose.yml") as f:
+            services = yaml.safe_load(f)["services"]
+        assert sorted(services) == ["pnode1", "pnode2", "vnode1", "vnode2", "vnode3"]
+        assert (cluster_dir / "vnode3" / "xrpld.net").exists()
+        # the existing nodes know the new validator on their next start
+        assert "vnode3 " in (cluster_dir / "vnode1/config/xahaud.cfg").read_text()
+        assert len(ValidatorListManager(str(cluster_dir)).validators) == 3
+        mock_run.assert_called_once_with(
+            str(cluster_dir),
+            "docker compose up -d --build vnode3 pnode2",
+            {"START_MODE": "net"},
+            timeout=BUILD_TIMEOUT,
+        )
+
+    @patch("xrpld_netgen.scale.run_command", return_value=False)
+    def test_start_failure(self, mock_run, cluster_dir):
+        with pytest.raises(RuntimeError, match="vnode3 to net-cluster but"):
+            add_nodes("net-cluster", 1, 0)
+        # the cluster keeps the node, up --nodes starts it again
+        assert read_spec(cluster_dir)["num_validators"] == 3
+
+    @patch("xrpld_netgen.scale.run_command")
+    def test_seed_from_node(self, mock_run, cluster_dir):
+        with patch("xrpld_netgen.bootstrap.run_command", mock_run):
+            add_nodes("net-cluster", 0, 1, "pnode1")
+
+        db_dir = cluster_dir / "pnode2" / "lib" / "db"
+        assert (db_dir / "ledger.db").read_text() == "ledgers"
+        assert not (db_dir / "wallet.db").exists()
+        assert len(ValidatorListManager(str(cluster_dir)).validators) == 2
+        assert mock_run.call_args_list == [
+            call(
+                str(cluster_dir),
+                "docker compose stop pnode1",
+                timeout=COMMAND_TIMEOUT,
+            ),
+            call(
+                str(cluster_dir), "docker compose up -d pnode1", {"START_MODE": "load"}
+            ),
+            call(
+                str(cluster_dir),
+                "docker compose up -d --build pnode2",
+                {"START_MODE": "load"},
+                timeout=BUILD_TIMEOUT,
+            ),
+        ]
+
+
+class TestRemoveNodes:
+    """Test removing nodes from a running cluster"""
+
+    @patch("xrpld_netgen.scale.run_command")
+    def test_remove_validator(self, mock_run, cluster_dir):
+        assert remove_nodes("net-cluster", 1, 0) == ["vnode2"]
+
+        assert read_spec(cluster_dir)["num_validators"] == 1
+        assert not (cluster_dir / "vnode2").exists()
+        assert "vnode2" not in (cluster_dir / "pnode1/config/xahaud.cfg").read_text()
+        assert len(ValidatorListManager(str(cluster_dir)).validators) == 1
+        mock_run.assert_called_once_with(
+            str(cluster_dir), "docker compose rm -sf vnode2"
+        )
+
+    def test_quorum_is_kept(self, cluster_dir):
+        with pytest.raises(ValueError, match="does not have that many"):
+            remove_nodes("net-cluster", 2, 0)
+        with pytest.raises(ValueError, match="does not have that many"):
+            remove_nodes("net-cluster", 0, 2)
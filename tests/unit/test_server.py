@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import threading
+import http.client
+from http.server import ThreadingHTTPServer
+
+import pytest
+from unittest.mock import patch
+from xrpld_netgen import network
+from xrpld_netgen.api import OperationError
+from xrpld_netgen.server import NetgenRequestHandler, match_route
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(network, "basedir", str(tmp_path))
+    (tmp_path / "test-cluster" / "vnode1").mkdir(parents=True)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NetgenRequestHandler)
+    server.daemon_threads = True
+    monkeypatch.setattr(NetgenRequestHandler, "log_message", lambda *args: None)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+
+    def request(method, path, body=None):
+        data = json.dumps(body) if body is not None else None
+        connection.request(method, path, data)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    yield request
+    connection.close()
+    server.shutdown()
+    server.server_close()
+
+
+class TestMatchRoute:
+    """Test mapping http requests to operations"""
+
+    def test_path_params(self):
+        assert match_route("POST", "/clusters/2025.7.9-release%2B1951-cluster/up") == (
+            "up",
+            {"name": "2025.7.9-release+1951-cluster"},
+        )
+
+    def test_generic_operation_route(self):
+        assert match_route("POST", "/operations/upgrade:rolling") == (
+            "upgrade:rolling",
+            {},
+        )
+
+    def test_unknown_route(self):
+        with pytest.raises(OperationError, match="No route"):
+            match_route("PUT", "/clusters")
+
+
+class TestServer:
+    """Test the http api against a served handler"""
+
+    def test_requests_on_one_connection(self, client):
+        assert client("GET", "/health") == (200, {"status": "ok"})
+        assert client("GET", "/clusters") == (
+            200,
+            {"result": [{"name": "test-cluster", "nodes": ["vnode1"]}]},
+        )
+        status, body = client("GET", "/clusters/other-cluster")
+        assert status == 404
+        assert "not found" in body["error"]
+
+    @patch("xrpld_netgen.api.NetworkBuilder")
+    def test_create_network(self, mock_builder, client, tmp_path):
+        mock_builder.return_value.create_network.return_value = (
+            f"{tmp_path}/2025.7.9-release+1951-cluster"
+        )
+        status, body = client(
+            "POST",
+            "/clusters",
+            {"build_version": "2025.7.9-release+1951", "num_validators": 5},
+        )
+        assert status == 200
+        assert body["result"]["name"] == "2025.7.9-release+1951-cluster"
+        args = mock_builder.return_value.create_network.call_args.args
+        assert args[3] == 5
+        assert args[9] == 4
+
+    def test_invalid_body(self, client):
+        status, body = client("POST", "/clusters", [1, 2])
+        assert status == 400
+        assert body == {"error": "The body must be a JSON object"}
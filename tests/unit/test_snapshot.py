@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+
+import pytest
+from unittest.mock import patch
+from xrpld_netgen import snapshot
+from xrpld_netgen.snapshot import (
+    _snapshot_tree,
+    _restore_tree,
+    create_snapshot,
+    restore_snapshot,
+)
+
+
+def _stats():
+    return {"stored": 0, "reused": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+
+class TestSnapshotTree:
+    """Test capturing and restoring node db folders through the chunk store"""
+
+    def test_round_trip(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot, "CHUNK_SIZE", 16)
+        src = tmp_path / "lib"
+        (src / "db" / "nudb").mkdir(parents=True)
+        (src / "db" / "ledger.db").write_bytes(b"sqlite" * 10)
+        (src / "db" / "nudb" / "nudb.dat").write_bytes(b"x" * 20 + b"\0" * 32 + b"y")
+        objects = str(tmp_path / "objects")
+
+        entries = _snapshot_tree(objects, str(src), _stats())
+        dst = tmp_path / "restored"
+        _restore_tree(objects, str(dst), entries)
+
+        assert (dst / "db" / "ledger.db").read_bytes() == b"sqlite" * 10
+        assert (dst / "db" / "nudb" / "nudb.dat").read_bytes() == (
+            b"x" * 20 + b"\0" * 32 + b"y"
+        )
+
+    def test_zero_chunks_are_not_stored(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot, "CHUNK_SIZE", 16)
+        src = tmp_path / "lib"
+        src.mkdir()
+        (src / "sparse.dat").write_bytes(b"\0" * 48)
+        stats = _stats()
+
+        entries = _snapshot_tree(str(tmp_path / "objects"), str(src), stats)
+
+        assert entries[1]["chunks"] == [None, None, None]
+        assert stats["stored"] == 0
+
+    def test_identical_chunks_are_deduplicated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot, "CHUNK_SIZE", 16)
+        for node in ["vnode1", "vnode2"]:
+            (tmp_path / node).mkdir()
+            (tmp_path / node / "ledger.db").write_bytes(b"a" * 16 + b"b" * 16)
+        objects = str(tmp_path / "objects")
+        stats = _stats()
+
+        _snapshot_tree(objects, str(tmp_path / "vnode1"), stats)
+        _snapshot_tree(objects, str(tmp_path / "vnode2"), stats)
+
+        assert stats["stored"] == 2
+        assert stats["reused"] == 2
+        assert sum(len(files) for _, _, files in os.walk(objects)) == 2
+
+
+class TestStopFailure:
+    """Test that no db is read or replaced when the nodes do not stop"""
+
+    @patch("xrpld_netgen.snapshot.get_validated_ledger", return_value={})
+    @patch("xrpld_netgen.snapshot.run_command", return_value=False)
+    def test_create(self, mock_run, mock_ledger, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot, "basedir", str(tmp_path))
+        (tmp_path / "net" / "vnode1" / "lib").mkdir(parents=True)
+        (tmp_path / "net" / "vnode1" / "lib" / "ledger.db").write_bytes(b"db")
+
+        with pytest.raises(RuntimeError, match="Could not stop vnode1"):
+            create_snapshot("net", "snap", ["vnode1"])
+
+        assert mock_run.call_count == 1
+        assert mock_run.call_args.kwargs["timeout"] == snapshot.COMMAND_TIMEOUT
+        assert not os.listdir(tmp_path / "snapshots" / "objects")
+
+    @patch("xrpld_netgen.snapshot.run_command", return_value=False)
+    def test_restore(self, mock_run, tmp_path, monkeypatch):
+        monkeypatch.setattr(snapshot, "basedir", str(tmp_path))
+        (tmp_path / "net" / "vnode1" / "lib").mkdir(parents=True)
+        (tmp_path / "net" / "vnode1" / "lib" / "ledger.db").write_bytes(b"live")
+        (tmp_path / "snapshots").mkdir()
+        (tmp_path / "snapshots" / "snap.json").write_text(
+            '{"nodes": {"vnode1": {"lib": []}}}'
+        )
+
+        with pytest.raises(RuntimeError, match="Could not stop"):
+            restore_snapshot("net", "snap")
+
+        assert (tmp_path / "net" / "vnode1" / "lib" / "ledger.db").read_bytes() == (
+            b"live"
+        )
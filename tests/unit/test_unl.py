@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+import base64
+
+import pytest
+from unittest.mock import Mock, patch
+from xrpld_netgen import unl
+from xrpld_netgen.network import load_validator_keys
+from xrpld_netgen.unl import (
+    ValidatorListManager,
+    activate_unl,
+    list_unl_versions,
+    publish_unl,
+    swap_unl,
+)
+
+
+def signing_client(sequence):
+    def sign_unl(path):
+        blob = base64.b64encode(json.dumps({"sequence": sequence}).encode())
+        with open(path, "w") as f:
+            json.dump({"blob": blob.decode(), "version": 1}, f)
+
+    return Mock(sign_unl=Mock(side_effect=sign_unl))
+
+
+@pytest.fixture
+def cluster_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(unl, "basedir", str(tmp_path))
+    for node in ["vnode1", "pnode1"]:
+        (tmp_path / "test-cluster" / node).mkdir(parents=True)
+    return tmp_path / "test-cluster"
+
+
+class TestPublishUnl:
+    """Test storing signed lists as versions of a cluster"""
+
+    def test_publish_versions(self, cluster_dir):
+        assert publish_unl(str(cluster_dir), signing_client(1)) == 1
+        assert publish_unl(str(cluster_dir), signing_client(2), False) == 2
+        assert list_unl_versions(str(cluster_dir)) == [1, 2]
+        assert (cluster_dir / "vl_server.py").exists()
+
+        served = json.loads((cluster_dir / "vl" / "vl.json").read_text())
+        assert served["refresh_interval"] == unl.REFRESH_INTERVAL
+        assert unl.get_unl_sequence(served) == 1
+
+    def test_activate_missing_version(self, cluster_dir):
+        with pytest.raises(ValueError, match="UNL version 3 not found"):
+            activate_unl(str(cluster_dir), 3)
+
+
+class TestValidatorListManager:
+    """Test incremental changes to the UNL of a cluster"""
+
+    def test_changes_are_signed_once(self, cluster_dir):
+        manifests, _, _ = load_validator_keys(str(cluster_dir), 3)
+        validators = [unl.get_manifest_public_key(m) for m in manifests]
+        manager = ValidatorListManager(str(cluster_dir))
+        manager.set_validators(manifests[:2])
+        assert manager.publish() == 1
+
+        with patch.object(
+            unl, "publish_unl", side_effect=unl.publish_unl
+        ) as mock_publish:
+            assert manager.add(manifests) == [validators[2]]
+            assert manager.remove([validators[0].lower()]) == [validators[0]]
+            assert manager.publish() == 2
+            # nothing changed, nothing to sign
+            assert manager.publish() == 2
+        assert mock_publish.call_count == 1
+        assert manager.validators == validators[1:]
+
+    def test_reload_keeps_keys(self, cluster_dir):
+        manifests, _, _ = load_validator_keys(str(cluster_dir), 2)
+        validators = [unl.get_manifest_public_key(m) for m in manifests]
+        first = ValidatorListManager(str(cluster_dir))
+        first.set_validators(manifests)
+        first.publish()
+
+        with patch.object(unl, "load_publisher_client") as mock_load:
+            manager = ValidatorListManager(str(cluster_dir))
+            assert manager.public_key == first.public_key
+            assert manager.validators == validators
+            manager.set_validators(manifests)
+            assert manager.publish() == 1
+            manager.set_validators(manifests[:1])
+            assert manager.publish() == 2
+            assert manager.validators == validators[:1]
+        mock_load.assert_not_called()
+        served = json.loads((cluster_dir / "vl" / "vl.json").read_text())
+        assert unl.get_unl_sequence(served) == 2
+
+
+class TestSwapUnl:
+    """Test swapping the served list of a running cluster"""
+
+    @patch("xrpld_netgen.unl.get_node_unl_sequence")
+    def test_swap_waits_for_nodes(self, mock_sequence, cluster_dir):
+        publish_unl(str(cluster_dir), signing_client(1))
+        publish_unl(str(cluster_dir), signing_client(2), False)
+        # the current sequences, then the polls
+        mock_sequence.side_effect = [1, Exception("down"), 1, 2, 2]
+
+        timings = swap_unl("test-cluster", 2, interval=0)
+        served = json.loads((cluster_dir / "vl" / "vl.json").read_text())
+        assert unl.get_unl_sequence(served) == 2
+        assert sorted(timings) == ["pnode1", "vnode1"]
+        assert all(t is not None for t in timings.values())
+        assert mock_sequence.call_count == 5
+
+    @patch("xrpld_netgen.unl.get_node_unl_sequence")
+    def test_swap_to_lower_version_fails_fast(self, mock_sequence, cluster_dir):
+        publish_unl(str(cluster_dir), signing_client(1), False)
+        publish_unl(str(cluster_dir), signing_client(2))
+        mock_sequence.side_effect = [2, 2]
+
+        with pytest.raises(ValueError, match="not above the sequence"):
+            swap_unl("test-cluster", 1, interval=0)
+        served = json.loads((cluster_dir / "vl" / "vl.json").read_text())
+        assert unl.get_unl_sequence(served) == 2
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import json
+import asyncio
+import threading
+import http.client
+
+import pytest
+from xrpld_netgen.libs.vl_server import VLServer
+
+
+@pytest.fixture
+def vl_server(tmp_path):
+    (tmp_path / "vl.json").write_text(json.dumps({"blob": "one"}))
+    (tmp_path / "versions").mkdir()
+    (tmp_path / "versions" / "vl.1.json").write_text("{}")
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(VLServer(str(tmp_path)).start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield tmp_path, server.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(server.close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+def get(connection, path):
+    connection.request("GET", path)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+class TestVLServer:
+    """Test serving validator lists from a directory"""
+
+    def test_swap_without_restart(self, vl_server):
+        root, port = vl_server
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        assert get(connection, "/vl.json") == (200, b'{"blob": "one"}')
+
+        (root / ".vl.json").write_text(json.dumps({"blob": "two"}))
+        os.replace(root / ".vl.json", root / "vl.json")
+        # same keep-alive connection, the replaced file is served
+        assert get(connection, "/vl.json") == (200, b'{"blob": "two"}')
+        connection.close()
+
+    def test_versions(self, vl_server):
+        _, port = vl_server
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        assert get(connection, "/versions/") == (200, b'["vl.1.json"]')
+        assert get(connection, "/versions/vl.1.json") == (200, b"{}")
+        connection.close()
+
+    def test_missing_and_outside_files(self, vl_server):
+        root, port = vl_server
+        (root.parent / "secret.json").write_text("{}")
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        assert get(connection, "/missing.json")[0] == 404
+        assert get(connection, "/../secret.json")[0] == 404
+        connection.request("POST", "/vl.json")
+        assert connection.getresponse().status == 405
+        connection.close()
@@ -9,6 +9,10 @@ from xrpld_netgen.libs.xrpld import (
     parse_amendments,
     convert_to_list_of_hashes,
     update_amendments,
+    get_amendment_hash,
+    parse_amendment_table,
+    select_amendments,
+    diff_amendment_tables,
 )
 
 
@@ -158,3 +162,132 @@ class TestConvertToListOfHashes:
         assert "ABCD1234" in result
         assert "EFGH5678" in result
         assert "IJKL9012" in result
+
+
+MACRO_LINES = [
+    "XRPL_FEATURE(PermissionedDEX,            Supported::yes, VoteBehavior::DefaultNo)",
+    "XRPL_FIX    (EnforceNFTokenTrustlineV2,  Supported::yes, VoteBehavior::DefaultYes)",
+    "XRPL_FEATURE(Batch,                      Supported::no,  VoteBehavior::DefaultNo)",
+    "XRPL_FIX    (NFTokenDirV1,               Supported::yes, VoteBehavior::Obsolete)",
+    "XRPL_RETIRE(fix1201)",
+    "XRPL_RETIRE_FEATURE(MultiSign)",
+    "XRPL_RETIRE_FIX(1368)",
+]
+
+
+class TestGetAmendmentHash:
+    """Test resolving amendment names to ids"""
+
+    def test_hash_passes_through(self):
+        assert get_amendment_hash("a" * 64) == "A" * 64
+
+    def test_name_is_hashed(self):
+        result = get_amendment_hash("Hooks")
+        assert len(result) == 64
+        assert result == result.upper()
+        assert result == hashlib.sha512(b"Hooks").hexdigest().upper()[:64]
+
+
+class TestParseAmendmentTable:
+    """Test parsing the full amendment table of a feature file"""
+
+    def test_macro_flags(self):
+        table = parse_amendment_table(MACRO_LINES)
+        assert table["PermissionedDEX"] == {
+            "hash": get_amendment_hash("PermissionedDEX"),
+            "supported": True,
+            "default_vote": False,
+            "obsolete": False,
+            "retired": False,
+        }
+        assert table["fixEnforceNFTokenTrustlineV2"]["default_vote"] is True
+        assert table["Batch"]["supported"] is False
+        assert table["fixNFTokenDirV1"]["obsolete"] is True
+
+    def test_retired_amendments(self):
+        table = parse_amendment_table(MACRO_LINES)
+        for name in ["fix1201", "MultiSign", "fix1368"]:
+            assert table[name]["retired"] is True
+
+    def test_feature_cpp(self):
+        lines = [
+            "REGISTER_FEATURE(Hooks, Supported::yes, VoteBehavior::DefaultNo);",
+            "REGISTER_FIX    (fix1513, Supported::yes, VoteBehavior::DefaultYes);",
+            'uint256 const retiredMultiSign = retireFeature("MultiSign");',
+        ]
+        table = parse_amendment_table(lines)
+        assert list(table) == ["Hooks", "fix1513", "MultiSign"]
+        assert table["fix1513"]["default_vote"] is True
+        assert table["MultiSign"]["retired"] is True
+
+    def test_hash_matches_parse_amendments(self):
+        table = parse_amendment_table(MACRO_LINES)
+        assert parse_amendments(MACRO_LINES)["PermissionedDEX"] == (
+            table["PermissionedDEX"]["hash"]
+        )
+
+
+class TestSelectAmendments:
+    """Test selecting genesis amendments with expressions"""
+
+    def setup_method(self):
+        self.table = parse_amendment_table(MACRO_LINES)
+
+    def test_all_skips_unsupported_and_retired(self):
+        result = select_amendments(self.table, "all")
+        assert list(result) == [
+            "PermissionedDEX",
+            "fixEnforceNFTokenTrustlineV2",
+            "fixNFTokenDirV1",
+        ]
+
+    def test_globs_and_removal(self):
+        result = select_amendments(self.table, "fix*,-fixNFToken*")
+        assert list(result) == ["fixEnforceNFTokenTrustlineV2"]
+
+    def test_leading_removal_starts_from_all(self):
+        result = select_amendments(self.table, "-fix*")
+        assert result == {"PermissionedDEX": get_amendment_hash("PermissionedDEX")}
+
+    def test_asof_and_since_versions(self):
+        old_table = parse_amendment_table(MACRO_LINES[1:4])
+        result = select_amendments(self.table, "asof:2.3.0", lambda v: old_table)
+        assert list(result) == ["fixEnforceNFTokenTrustlineV2", "fixNFTokenDirV1"]
+        result = select_amendments(self.table, "since:2.3.0", lambda v: old_table)
+        assert list(result) == ["PermissionedDEX"]
+
+    def test_unknown_amendment_raises_error(self):
+        with pytest.raises(ValueError, match="Unknown amendment"):
+            select_amendments(self.table, "NotAnAmendment")
+
+
+class TestDiffAmendmentTables:
+    """Test diffing the amendment tables of two versions"""
+
+    def test_diff_amendment_tables(self):
+        old = parse_amendment_table(
+            [
+                "XRPL_FEATURE(Clawback, Supported::yes, VoteBehavior::DefaultNo)",
+                "XRPL_FEATURE(MultiSign, Supported::yes, VoteBehavior::DefaultYes)",
+                "XRPL_FEATURE(Batch, Supported::yes, VoteBehavior::DefaultNo)",
+            ]
+        )
+        new = parse_amendment_table(
+            [
+                "XRPL_FEATURE(Clawback, Supported::yes, VoteBehavior::DefaultYes)",
+                "XRPL_RETIRE_FEATURE(MultiSign)",
+                "XRPL_FIX(TokenEscrowV1, Supported::yes, VoteBehavior::DefaultNo)",
+            ]
+        )
+
+        assert diff_amendment_tables(old, new) == {
+            "added": ["fixTokenEscrowV1"],
+            "removed": ["Batch"],
+            "retired": ["MultiSign"],
+            "default_vote": [{"name": "Clawback", "old": False, "new": True}],
+        }
+
+    def test_identical_tables_have_no_changes(self):
+        table = parse_amendment_table(MACRO_LINES)
+        diff = diff_amendment_tables(table, table)
+        assert not any(diff.values())
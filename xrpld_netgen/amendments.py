@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from xrpld_netgen.network import SYNCED_STATES
+from xrpld_netgen.libs.rpc import rpc_request, wait_for_server_state
+from xrpld_netgen.libs.xrpld import get_amendment_hash
+from xrpld_netgen.utils.misc import (
+    bcolors,
+    run_command,
+    get_node_port,
+    parse_node_name,
+    list_cluster_nodes,
+)
+
+# Create network files in workspace relative to where the command is run
+basedir = os.path.abspath(os.path.join(os.getcwd(), "workspace"))
+
+MAJORITY_GAINED: str = "gained majority"
+MAJORITY_LOST: str = "lost majority"
+ENABLED: str = "enabled"
+
+
+def get_features(node: str) -> Dict[str, Dict[str, Any]]:
+    index, node_type = parse_node_name(node)
+    return rpc_request(get_node_port(index, node_type), "feature")["features"]
+
+
+def vote_amendment(node: str, amendment_hash: str) -> None:
+    index, node_type = parse_node_name(node)
+    rpc_request(
+        get_node_port(index, node_type),
+        "feature",
+        {"feature": amendment_hash, "vetoed": False},
+    )
+
+
+def diff_features(
+    previous: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    amendments: List[str],
+) -> List[Tuple[str, str]]:
+    """
+    Compares two `feature` responses of a node and returns the vote events
+    of the tracked amendments as (amendment hash, event) tuples.
+    """
+    events: List[Tuple[str, str]] = []
+    for amendment in amendments:
+        before: Dict[str, Any] = previous.get(amendment, {})
+        after: Dict[str, Any] = current.get(amendment, {})
+        if after.get("enabled") and not before.get("enabled"):
+            events.append((amendment, ENABLED))
+        elif "majority" in after and "majority" not in before:
+            events.append((amendment, MAJORITY_GAINED))
+        elif "majority" in before and "majority" not in after:
+            # the majority is dropped from the response once enabled
+            if not after.get("enabled"):
+                events.append((amendment, MAJORITY_LOST))
+    return events
+
+
+def set_majority_time(cluster_dir: str, nodes: List[str], majority_time: str) -> None:
+    """
+    Rewrites the [amendment_majority_time] of the nodes and restarts them
+    from their db, so a running cluster keeps its ledger. Raises a
+    RuntimeError when the nodes could not be restarted.
+    """
+    for node in nodes:
+        config_dir: str = f"{cluster_dir}/{node}/config"
+        for filename in os.listdir(config_dir):
+            if not filename.endswith(".cfg"):
+                continue
+            with open(f"{config_dir}/{filename}", "r") as f:
+                cfg: str = f.read()
+            section: str = f"[amendment_majority_time]\n{majority_time}\n"
+            if "[amendment_majority_time]" in cfg:
+                cfg = re.sub(r"\[amendment_majority_time\]\n[^\n\[]*\n", section, cfg)
+            else:
+                cfg += f"\n{section}"
+            with open(f"{config_dir}/{filename}", "w") as f:
+                f.write(cfg)
+    if not run_command(
+        cluster_dir,
+        f"docker compose up -d --force-recreate {' '.join(nodes)}",
+        {"START_MODE": "load"},
+    ):
+        raise RuntimeError(f"Could not restart {', '.join(nodes)}")
+
+
+def wait_for_validators(validators: List[str], timeout: float) -> None:
+    # restarted validators only accept votes once their rpc is up again
+    def wait(node: str) -> str:
+        index, node_type = parse_node_name(node)
+        return wait_for_server_state(
+            get_node_port(index, node_type), SYNCED_STATES, timeout
+        )
+
+    with ThreadPoolExecutor(max_workers=len(validators)) as executor:
+        states: List[str] = list(executor.map(wait, validators))
+    failed: List[str] = [v for v, state in zip(validators, states) if not state]
+    if failed:
+        raise RuntimeError(f"{', '.join(failed)} did not sync within {timeout}s")
+
+
+def activate_amendments(
+    name: str,
+    amendments: List[str],
+    majority_time: str = None,
+    timeout: float = 3600,
+    interval: float = 2,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Votes for the amendments on every validator at once and follows the vote
+    on all nodes until every amendment is enabled everywhere. With a majority
+    time the nodes are restarted first and the vote waits for the validators
+    to sync, a RuntimeError is raised when they do not.
+
+    :return: The seconds until each amendment first gained majority and
+        was enabled on all nodes
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    nodes: List[str] = list_cluster_nodes(cluster_dir)
+    validators: List[str] = [n for n in nodes if n.startswith("vnode")]
+    hashes: Dict[str, str] = {get_amendment_hash(a): a for a in amendments}
+    if not validators:
+        raise ValueError(f"No validators found in {name}")
+
+    if majority_time:
+        print(f"{bcolors.BLUE}Setting amendment majority time: {majority_time}")
+        set_majority_time(cluster_dir, nodes, majority_time)
+        wait_for_validators(validators, timeout)
+
+    with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+        list(
+            executor.map(
+                lambda v: [vote_amendment(v, h) for h in hashes], validators
+            )
+        )
+        start: float = time.time()
+        print(
+            f"✅ {bcolors.CYAN}Voted for {', '.join(amendments)} "
+            f"on {len(validators)} validators"
+        )
+
+        timings: Dict[str, Dict[str, float]] = {a: {} for a in amendments}
+        states: Dict[str, Dict[str, Dict[str, Any]]] = {n: {} for n in nodes}
+        enabled: Dict[str, set] = {n: set() for n in nodes}
+
+        def poll(node: str) -> Dict[str, Dict[str, Any]]:
+            try:
+                return get_features(node)
+            except Exception:
+                # keep the last state of nodes that are restarting
+                return states[node]
+
+        while time.time() - start < timeout:
+            for node, features in zip(nodes, executor.map(poll, nodes)):
+                elapsed: float = time.time() - start
+                for amendment, event in diff_features(
+                    states[node], features, list(hashes)
+                ):
+                    label: str = hashes[amendment]
+                    color: str = (
+                        bcolors.RED if event == MAJORITY_LOST else bcolors.GREEN
+                    )
+                    print(
+                        f"[{elapsed:7.1f}s] {node} {bcolors.PURPLE}{label}"
+                        f"{bcolors.END} {color}{event}{bcolors.END}"
+                    )
+                    if event == MAJORITY_GAINED:
+                        timings[label].setdefault("majority", elapsed)
+                    if event == ENABLED:
+                        enabled[node].add(amendment)
+                states[node] = features
+            for amendment, label in hashes.items():
+                if "enabled" not in timings[label] and all(
+                    amendment in enabled[n] for n in nodes
+                ):
+                    timings[label]["enabled"] = time.time() - start
+            if all("enabled" in t for t in timings.values()):
+                break
+            time.sleep(interval)
+
+    for label, timing in timings.items():
+        majority: str = f"{timing['majority']:.1f}s" if "majority" in timing else "-"
+        activated: str = f"{timing['enabled']:.1f}s" if "enabled" in timing else "-"
+        print(
+            f"    - {label}: majority after {majority}, "
+            f"enabled on all nodes after {activated}"
+        )
+    return timings
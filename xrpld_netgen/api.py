@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import requests
+
+from xrpld_netgen import network
+from xrpld_netgen.network import (
+    NetworkBuilder,
+    get_network_name,
+    stop_network,
+    remove_network,
+    update_node_binary,
+    enable_node_amendment,
+    rolling_upgrade,
+)
+from xrpld_netgen.features import get_amendment_table, diff_versions
+from xrpld_netgen.amendments import activate_amendments
+from xrpld_netgen.snapshot import create_snapshot, restore_snapshot
+from xrpld_netgen.unl import list_unl_versions, swap_unl
+from xrpld_netgen.scale import add_nodes, remove_nodes
+from xrpld_netgen.bootstrap import bootstrap_node
+from xrpld_netgen.preflight import preflight
+from xrpld_netgen.libs.rpc import get_server_info
+from xrpld_netgen.utils.misc import (
+    get_node_port,
+    is_container_running,
+    list_cluster_nodes,
+    parse_node_name,
+    parse_version_map,
+    run_command,
+    run_start,
+)
+
+DEFAULT_BUILD_SERVER: str = "https://build.xahau.tech"
+IMPORT_VL_KEY: str = (
+    "ED87E0EA91AAFFA130B78B75D2CC3E53202AA1BD8AB3D5E7BAC530C8440E328501"
+)
+NETWORK_IDS: Dict[str, int] = {"xahau": 21339, "xrpl": 21337}
+
+# Operation name (same as the cli command) -> function taking json params
+OPERATIONS: Dict[str, Callable[..., Any]] = {}
+# Operation name -> function returning the cluster the params work on
+CLUSTER_KEYS: Dict[str, Callable[[Dict[str, Any]], str]] = {}
+
+# Keep-alive connections to the node rpc ports between requests
+_session: requests.Session = requests.Session()
+_locks: Dict[str, threading.Lock] = {}
+_locks_lock = threading.Lock()
+
+
+class OperationError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _cluster_name(params: Dict[str, Any]) -> str:
+    return params.get("name")
+
+
+def operation(name: str, cluster: Callable[[Dict[str, Any]], str] = None):
+    """
+    Registers an operation. Operations work on the cluster in their `name`
+    param unless `cluster` derives it from the params.
+    """
+
+    def register(func: Callable[..., Any]) -> Callable[..., Any]:
+        OPERATIONS[name] = func
+        CLUSTER_KEYS[name] = cluster or _cluster_name
+        return func
+
+    return register
+
+
+def _cluster_lock(name: str) -> threading.Lock:
+    with _locks_lock:
+        return _locks.setdefault(name, threading.Lock())
+
+
+def get_cluster_dir(name: str) -> str:
+    if not name or "/" in name or name.startswith("."):
+        raise OperationError(f"Invalid cluster name: {name}")
+    cluster_dir: str = f"{network.basedir}/{name}"
+    if not os.path.isdir(cluster_dir):
+        raise OperationError(f"Cluster not found: {name}", 404)
+    return cluster_dir
+
+
+def run_operation(name: str, params: Dict[str, Any] = None) -> Any:
+    """
+    Runs a registered operation with json params. Operations on the same
+    cluster run one at a time, operations on different clusters in parallel.
+    """
+    func: Callable[..., Any] = OPERATIONS.get(name)
+    if func is None:
+        raise OperationError(f"Unknown operation: {name}", 404)
+    params = params or {}
+    try:
+        inspect.signature(func).bind(**params)
+    except TypeError as e:
+        raise OperationError(f"{name}: {e}")
+
+    cluster: str = CLUSTER_KEYS.get(name, _cluster_name)(params)
+    lock = _cluster_lock(cluster) if cluster else threading.Lock()
+    with lock:
+        try:
+            return func(**params)
+        except SystemExit:
+            # the start and stop helpers of the cli exit on failure
+            raise OperationError(f"{name} failed", 500)
+
+
+def get_created_cluster(params: Dict[str, Any]) -> str:
+    # the directory create:network writes, before it exists
+    network_name: str = get_network_name(
+        params.get("protocol", "xahau"),
+        params.get("build_server", DEFAULT_BUILD_SERVER),
+        params["build_version"],
+    )
+    return f"{network_name}-cluster"
+
+
+@operation("create:network", get_created_cluster)
+def op_create_network(
+    build_version: str,
+    protocol: str = "xahau",
+    num_validators: int = 3,
+    num_peers: int = 1,
+    network_id: int = None,
+    build_server: str = DEFAULT_BUILD_SERVER,
+    genesis: bool = False,
+    quorum: int = None,
+    nodedb_type: str = "NuDB",
+    log_level: str = "warning",
+    version_map: str = None,
+    amendment_majority_time: str = None,
+    amendments: str = None,
+) -> Dict[str, str]:
+    cluster_dir: str = NetworkBuilder().create_network(
+        log_level,
+        IMPORT_VL_KEY,
+        protocol,
+        num_validators,
+        num_peers,
+        network_id or NETWORK_IDS[protocol],
+        build_server,
+        build_version,
+        genesis,
+        quorum or num_validators - 1,
+        nodedb_type,
+        parse_version_map(version_map) if version_map else None,
+        amendment_majority_time,
+        amendments,
+    )
+    return {"name": os.path.basename(cluster_dir), "cluster_dir": cluster_dir}
+
+
+@operation("create:ansible", get_created_cluster)
+def op_create_ansible(
+    build_version: str,
+    vips: List[str],
+    pips: List[str],
+    protocol: str = "xahau",
+    network_id: int = None,
+    build_server: str = DEFAULT_BUILD_SERVER,
+    quorum: int = None,
+    nodedb_type: str = "NuDB",
+    log_level: str = "warning",
+    registries: List[str] = None,
+    batch_size: int = 1,
+    health_timeout: int = 600,
+    bundle: bool = False,
+    bundle_binary: bool = False,
+) -> Dict[str, str]:
+    NetworkBuilder().create_ansible(
+        log_level,
+        IMPORT_VL_KEY,
+        protocol,
+        len(vips),
+        len(pips),
+        network_id or NETWORK_IDS[protocol],
+        build_server,
+        build_version,
+        False,
+        quorum or len(vips) - 1,
+        nodedb_type,
+        vips,
+        pips,
+        registries,
+        batch_size,
+        health_timeout,
+        bundle,
+        bundle_binary,
+    )
+    name: str = get_created_cluster(
+        {
+            "protocol": protocol,
+            "build_server": build_server,
+            "build_version": build_version,
+        }
+    )
+    return {"name": name, "cluster_dir": f"{network.basedir}/{name}"}
+
+
+@operation("up")
+def op_up(name: str, resume: bool = False, nodes: List[str] = None) -> None:
+    cluster_dir: str = get_cluster_dir(name)
+    if nodes:
+        run_command(
+            cluster_dir,
+            f"docker compose up -d --force-recreate {' '.join(nodes)}",
+            {"START_MODE": "load"},
+        )
+        return
+    run_start(
+        [f"{cluster_dir}/start.sh"],
+        None,
+        None,
+        "network",
+        {"START_MODE": "warm"} if resume else None,
+        cluster_dir,
+    )
+
+
+@operation("down")
+def op_down(name: str) -> None:
+    get_cluster_dir(name)
+    stop_network(name)
+
+
+@operation("remove")
+def op_remove(name: str) -> None:
+    get_cluster_dir(name)
+    remove_network(name)
+
+
+@operation("list")
+def op_list() -> List[Dict[str, Any]]:
+    if not os.path.isdir(network.basedir):
+        return []
+    return [
+        {"name": name, "nodes": list_cluster_nodes(f"{network.basedir}/{name}")}
+        for name in sorted(os.listdir(network.basedir))
+        if name.endswith("-cluster")
+    ]
+
+
+def get_node_status(node: str) -> Dict[str, Any]:
+    status: Dict[str, Any] = {"running": is_container_running(node)}
+    if not status["running"]:
+        return status
+    index, node_type = parse_node_name(node)
+    try:
+        info: Dict[str, Any] = get_server_info(
+            get_node_port(index, node_type), session=_session
+        )
+        status["server_state"] = info["server_state"]
+        status["ledger"] = info.get("validated_ledger", {}).get("seq")
+    except Exception:
+        # the container runs but the node does not answer yet
+        status["server_state"] = None
+    return status
+
+
+@operation("status")
+def op_status(name: str) -> Dict[str, Any]:
+    nodes: List[str] = list_cluster_nodes(get_cluster_dir(name))
+    if not nodes:
+        return {"name": name, "nodes": {}}
+    with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+        statuses: List[Dict[str, Any]] = list(executor.map(get_node_status, nodes))
+    return {"name": name, "nodes": dict(zip(nodes, statuses))}
+
+
+@operation("features")
+def op_features(
+    version: str, protocol: str = "xahau", build_server: str = DEFAULT_BUILD_SERVER
+) -> Dict[str, Dict[str, Any]]:
+    return get_amendment_table(protocol, version, build_server)
+
+
+@operation("features:diff")
+def op_features_diff(
+    versions: List[str],
+    protocol: str = "xahau",
+    build_server: str = DEFAULT_BUILD_SERVER,
+) -> List[Dict[str, Any]]:
+    return diff_versions(protocol, versions, build_server)
+
+
+@operation("enable:amendment")
+def op_enable_amendment(
+    name: str, amendment_name: str, node_id: int, node_type: str = "validator"
+) -> None:
+    get_cluster_dir(name)
+    enable_node_amendment(name, amendment_name, node_id, node_type)
+
+
+@operation("amendments:activate")
+def op_activate_amendments(
+    name: str,
+    amendments: List[str],
+    majority_time: str = None,
+    timeout: float = 3600,
+    interval: float = 2,
+) -> Dict[str, Dict[str, float]]:
+    get_cluster_dir(name)
+    return activate_amendments(name, amendments, majority_time, timeout, interval)
+
+
+@operation("update:node")
+def op_update_node(
+    name: str,
+    node_id: int,
+    build_version: str,
+    node_type: str = "validator",
+    build_server: str = DEFAULT_BUILD_SERVER,
+    seed_from: str = None,
+) -> None:
+    get_cluster_dir(name)
+    update_node_binary(
+        name, node_id, node_type, build_server, build_version, seed_from
+    )
+
+
+@operation("bootstrap:node")
+def op_bootstrap_node(
+    name: str,
+    node: str,
+    source: str = None,
+    compare: bool = False,
+    timeout: int = 600,
+) -> Dict[str, float]:
+    get_cluster_dir(name)
+    return bootstrap_node(name, node, source, compare, timeout)
+
+
+@operation("upgrade:rolling")
+def op_rolling_upgrade(
+    name: str,
+    build_version: str,
+    build_server: str = DEFAULT_BUILD_SERVER,
+    nodes: List[str] = None,
+    batch_size: int = 1,
+    timeout: int = 600,
+) -> Dict[str, float]:
+    get_cluster_dir(name)
+    return rolling_upgrade(
+        name, build_server, build_version, nodes, batch_size, timeout
+    )
+
+
+@operation("add:validator")
+def op_add_validator(name: str, num: int = 1, seed_from: str = None) -> List[str]:
+    get_cluster_dir(name)
+    return add_nodes(name, num, 0, seed_from)
+
+
+@operation("add:peer")
+def op_add_peer(name: str, num: int = 1, seed_from: str = None) -> List[str]:
+    get_cluster_dir(name)
+    return add_nodes(name, 0, num, seed_from)
+
+
+@operation("remove:validator")
+def op_remove_validator(name: str, num: int = 1) -> List[str]:
+    get_cluster_dir(name)
+    return remove_nodes(name, num, 0)
+
+
+@operation("remove:peer")
+def op_remove_peer(name: str, num: int = 1) -> List[str]:
+    get_cluster_dir(name)
+    return remove_nodes(name, 0, num)
+
+
+@operation("preflight")
+def op_preflight(
+    name: str, max_workers: int = 16, timeout: float = 15
+) -> Dict[str, Dict[str, Any]]:
+    get_cluster_dir(name)
+    return preflight(name, max_workers, timeout)
+
+
+@operation("snapshot:create")
+def op_snapshot_create(
+    name: str, snapshot: str = None, nodes: List[str] = None, restart: bool = True
+) -> Dict[str, str]:
+    get_cluster_dir(name)
+    return {"snapshot": create_snapshot(name, snapshot, nodes, restart)}
+
+
+@operation("snapshot:restore")
+def op_snapshot_restore(name: str, snapshot: str, start: bool = True) -> None:
+    get_cluster_dir(name)
+    restore_snapshot(name, snapshot, start)
+
+
+@operation("vl:list")
+def op_vl_list(name: str) -> List[int]:
+    return list_unl_versions(get_cluster_dir(name))
+
+
+@operation("vl:swap")
+def op_vl_swap(
+    name: str,
+    version: int,
+    refresh_interval: int = 1,
+    wait: bool = True,
+    timeout: float = 600,
+) -> Dict[str, float]:
+    get_cluster_dir(name)
+    return swap_unl(name, version, refresh_interval, wait, timeout)
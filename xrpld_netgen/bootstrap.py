@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import time
+import errno
+import shutil
+from typing import Dict, List
+
+from xrpld_netgen.network import SYNCED_STATES
+from xrpld_netgen.libs.rpc import get_server_info, wait_for_server_state
+from xrpld_netgen.utils.misc import (
+    bcolors,
+    run_command,
+    COMMAND_TIMEOUT,
+    get_node_port,
+    parse_node_name,
+    list_cluster_nodes,
+)
+
+# Create network files in workspace relative to where the command is run
+basedir = os.path.abspath(os.path.join(os.getcwd(), "workspace"))
+
+# Linux ioctl sharing the extents of a file (btrfs, xfs, bcachefs, overlayfs
+# on top of them), the copy is instant and only diverging blocks use space
+FICLONE: int = 0x40049409
+# RocksDB table files are never rewritten once written, they can be shared
+IMMUTABLE_SUFFIXES = (".sst",)
+# The node identity lives in the wallet db, a cloned node keeps its own
+IDENTITY_PREFIX: str = "wallet.db"
+COPY_SIZE: int = 16 * 1024 * 1024
+
+
+def _reflink(src: str, dst: str) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            return False
+    return True
+
+
+def _copy_range(s: int, d: int, start: int, end: int) -> None:
+    while start < end:
+        count: int = min(COPY_SIZE, end - start)
+        try:
+            # copied in the kernel, some filesystems share the blocks
+            copied: int = os.copy_file_range(s, d, count, start, start)
+        except (AttributeError, OSError):
+            copied = os.pwrite(d, os.pread(s, count, start), start)
+        if not copied:
+            break
+        start += copied
+
+
+def _sparse_copy(src: str, dst: str) -> int:
+    """
+    Copies the data regions of a file, holes of sparse NuDB files stay
+    holes in the copy.
+
+    :return: The number of bytes copied
+    """
+    copied: int = 0
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        size: int = os.fstat(s.fileno()).st_size
+        offset: int = 0
+        while offset < size:
+            try:
+                start: int = os.lseek(s.fileno(), offset, os.SEEK_DATA)
+                end: int = os.lseek(s.fileno(), start, os.SEEK_HOLE)
+            except OSError as e:
+                if e.errno == errno.ENXIO:
+                    # only a hole is left
+                    break
+                # the filesystem does not report holes, copy the rest
+                start, end = offset, size
+            _copy_range(s.fileno(), d.fileno(), start, end)
+            copied += end - start
+            offset = end
+        d.truncate(size)
+    return copied
+
+
+def clone_file(src: str, dst: str, stats: Dict[str, int]) -> None:
+    if src.endswith(IMMUTABLE_SUFFIXES):
+        try:
+            os.link(src, dst)
+            stats["linked"] += 1
+            return
+        except OSError:
+            # another filesystem or no hardlink support
+            pass
+    if _reflink(src, dst):
+        stats["reflinked"] += 1
+    else:
+        stats["copied_bytes"] += _sparse_copy(src, dst)
+        stats["copied"] += 1
+    shutil.copymode(src, dst)
+
+
+def clear_tree(path: str) -> None:
+    # removes everything but the node identity, the target keeps its own
+    for dirpath, dirnames, filenames in os.walk(path, topdown=False):
+        for filename in filenames:
+            if not filename.startswith(IDENTITY_PREFIX):
+                os.remove(os.path.join(dirpath, filename))
+        for dirname in dirnames:
+            subdir: str = os.path.join(dirpath, dirname)
+            if os.path.islink(subdir):
+                os.remove(subdir)
+            elif not os.listdir(subdir):
+                os.rmdir(subdir)
+
+
+def clone_tree(src: str, dst: str) -> Dict[str, int]:
+    """
+    Clones the db directory of a node, sharing the data with the source
+    where the filesystem allows it and copying sparse files sparsely. The
+    identity files of both nodes are left alone.
+
+    :return: The number of files and bytes cloned and how they were cloned
+    """
+    stats: Dict[str, int] = {
+        "files": 0,
+        "bytes": 0,
+        "linked": 0,
+        "reflinked": 0,
+        "copied": 0,
+        "copied_bytes": 0,
+    }
+    clear_tree(dst)
+    for dirpath, dirnames, filenames in os.walk(src):
+        target_dir: str = os.path.join(dst, os.path.relpath(dirpath, src))
+        os.makedirs(target_dir, exist_ok=True)
+        for filename in filenames:
+            path: str = os.path.join(dirpath, filename)
+            if filename.startswith(IDENTITY_PREFIX) or os.path.islink(path):
+                continue
+            stats["files"] += 1
+            stats["bytes"] += os.path.getsize(path)
+            clone_file(path, os.path.join(target_dir, filename), stats)
+    return stats
+
+
+def stop_node(cluster_dir: str, node: str) -> None:
+    # the dbs of a node that may still be running are never read or replaced
+    if not run_command(
+        cluster_dir, f"docker compose stop {node}", timeout=COMMAND_TIMEOUT
+    ):
+        raise RuntimeError(f"Could not stop {node}, its db was not touched")
+
+
+def seed_nodes(cluster_dir: str, source: str, nodes: List[str]) -> Dict[str, int]:
+    """
+    Copies the dbs of a node to other nodes so they load its last ledger
+    instead of syncing from scratch. The source is only stopped while its
+    files are cloned, so the copy is consistent.
+
+    :return: The totals of the clones of all nodes
+    """
+    totals: Dict[str, int] = {
+        "files": 0,
+        "bytes": 0,
+        "linked": 0,
+        "reflinked": 0,
+        "copied": 0,
+        "copied_bytes": 0,
+    }
+    if not nodes:
+        return totals
+    stop_node(cluster_dir, source)
+    start: float = time.time()
+    try:
+        for node in nodes:
+            stats: Dict[str, int] = clone_tree(
+                f"{cluster_dir}/{source}/lib", f"{cluster_dir}/{node}/lib"
+            )
+            for key, value in stats.items():
+                totals[key] += value
+    finally:
+        run_command(
+            cluster_dir, f"docker compose up -d {source}", {"START_MODE": "load"}
+        )
+    print(
+        f"✅ {bcolors.CYAN}Seeded {', '.join(nodes)} from {source} in "
+        f"{time.time() - start:.1f}s: {totals['files']} files, {totals['bytes']} "
+        f"bytes ({totals['reflinked']} reflinked, {totals['linked']} linked, "
+        f"{totals['copied']} copied){bcolors.END}"
+    )
+    return totals
+
+
+def find_synced_node(cluster_dir: str, exclude: List[str]) -> str:
+    """
+    Returns a synced node to clone from. Peers come first, stopping a
+    validator briefly costs the network a vote.
+    """
+    nodes: List[str] = [n for n in list_cluster_nodes(cluster_dir) if n not in exclude]
+    for node in sorted(nodes, key=lambda n: not n.startswith("pnode")):
+        index, node_type = parse_node_name(node)
+        try:
+            info = get_server_info(get_node_port(index, node_type))
+        except Exception:
+            continue
+        if info.get("server_state") in SYNCED_STATES:
+            return node
+    raise ValueError("No synced node to bootstrap from")
+
+
+def wait_synced(node: str, timeout: float) -> bool:
+    index, node_type = parse_node_name(node)
+    port: int = get_node_port(index, node_type)
+    return wait_for_server_state(port, SYNCED_STATES, timeout) is not None
+
+
+def bootstrap_node(
+    name: str,
+    node: str,
+    source: str = None,
+    compare: bool = False,
+    timeout: int = 600,
+) -> Dict[str, float]:
+    """
+    Replaces the dbs of a node with a clone of a synced node and starts it
+    from the cloned ledger.
+
+    :param source: The node to clone, a synced peer when not set
+    :param compare: First time a normal sync of the node from the network
+    :return: The seconds of the copy, until the bootstrapped node was synced
+        and, when compared, of the normal sync
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    nodes: List[str] = list_cluster_nodes(cluster_dir)
+    for n in [node, source]:
+        if n and n not in nodes:
+            raise ValueError(f"{n} is not a node of {name}")
+    source = source or find_synced_node(cluster_dir, [node])
+    if source == node:
+        raise ValueError("Cannot bootstrap a node from itself")
+
+    timings: Dict[str, float] = {}
+    if compare:
+        stop_node(cluster_dir, node)
+        clear_tree(f"{cluster_dir}/{node}/lib")
+        start: float = time.time()
+        run_command(cluster_dir, f"docker compose up -d {node}", {"START_MODE": "net"})
+        if wait_synced(node, timeout):
+            timings["sync"] = time.time() - start
+        print(f"{bcolors.CYAN}Normal sync: {timings.get('sync', timeout):.1f}s")
+
+    stop_node(cluster_dir, node)
+    start = time.time()
+    seed_nodes(cluster_dir, source, [node])
+    timings["copy"] = time.time() - start
+    run_command(cluster_dir, f"docker compose up -d {node}", {"START_MODE": "load"})
+    if not wait_synced(node, timeout):
+        print(f"{bcolors.RED}❌ {node} did not sync within {timeout}s{bcolors.END}")
+        return timings
+    timings["bootstrap"] = time.time() - start
+
+    print(
+        f"{bcolors.GREEN}{node} synced {timings['bootstrap']:.1f}s after "
+        f"bootstrapping from {source} (copy {timings['copy']:.1f}s){bcolors.END}"
+    )
+    if "sync" in timings:
+        print(
+            f"{bcolors.GREEN}Saved {timings['sync'] - timings['bootstrap']:.1f}s "
+            f"compared to a normal sync ({timings['sync']:.1f}s){bcolors.END}"
+        )
+    return timings
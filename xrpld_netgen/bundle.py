@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import io
+import os
+import gzip
+import hashlib
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Files of a node directory every host needs next to the image
+NODE_FILES: List[str] = ["config", "genesis.json"]
+COMPRESSION_LEVEL: int = 6
+
+
+def _add_file(tar: tarfile.TarFile, path: str, arcname: str) -> None:
+    # owner and times are not part of the content, equal files give equal
+    # archives on every run
+    info = tarfile.TarInfo(arcname)
+    info.size = os.path.getsize(path)
+    info.mode = 0o755 if os.access(path, os.X_OK) else 0o644
+    with open(path, "rb") as f:
+        tar.addfile(info, f)
+
+
+def pack(files: Dict[str, str]) -> bytes:
+    """
+    Packs files into a reproducible tar.gz, the same files always give the
+    same bytes.
+
+    :param files: The path in the archive -> the path of the file
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(
+        fileobj=buffer, mode="wb", compresslevel=COMPRESSION_LEVEL, mtime=0
+    ) as gz:
+        with tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as tar:
+            for arcname in sorted(files):
+                _add_file(tar, files[arcname], arcname)
+    return buffer.getvalue()
+
+
+def write_bundle(bundles_dir: str, files: Dict[str, str]) -> str:
+    """
+    Stores the files as a bundle named by the hash of its content. Hosts
+    with the same files share one bundle.
+
+    :return: The digest of the bundle
+    """
+    data: bytes = pack(files)
+    digest: str = hashlib.sha256(data).hexdigest()
+    path: str = f"{bundles_dir}/{digest}.tar.gz"
+    if not os.path.exists(path):
+        # write then rename so a failed run never leaves a partial bundle
+        with open(f"{path}.{os.getpid()}.tmp", "wb") as f:
+            f.write(data)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+    return digest
+
+
+def get_node_files(node_dir: str) -> Dict[str, str]:
+    files: Dict[str, str] = {}
+    for name in NODE_FILES:
+        path: str = f"{node_dir}/{name}"
+        if os.path.isfile(path):
+            files[name] = path
+        elif os.path.isdir(path):
+            for filename in os.listdir(path):
+                files[f"{name}/{filename}"] = f"{path}/{filename}"
+    return files
+
+
+def create_bundles(
+    cluster_dir: str,
+    hosts: Dict[str, str],
+    binary: str = None,
+    max_workers: int = 8,
+) -> Dict[str, List[str]]:
+    """
+    Packs everything a host needs into bundles in ansible/bundles. The
+    binary is a bundle of its own, shared by every host.
+
+    :param hosts: The ip of a host -> its node (e.g. vnode1)
+    :param binary: The path of the binary to ship, none when not set
+    :return: The ip of a host -> the digests of its bundles
+    """
+    bundles_dir: str = f"{cluster_dir}/ansible/bundles"
+    os.makedirs(bundles_dir, exist_ok=True)
+    shared: List[str] = []
+    if binary:
+        shared.append(write_bundle(bundles_dir, {"bin/xrpld": binary}))
+
+    def create(node: str) -> List[str]:
+        files: Dict[str, str] = get_node_files(f"{cluster_dir}/{node}")
+        return [write_bundle(bundles_dir, files)] + shared
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests: List[List[str]] = list(executor.map(create, hosts.values()))
+    return dict(zip(hosts, digests))
@@ -5,19 +5,48 @@
 # create:network
 # xrpld-netgen create:network --protocol "xahau" --build_version "2023.11.10-dev+549"
 # add:peer
-# xrpld-netgen add:peer --network_name xrpld-2023.11.10-dev+549 --protocol "xahau" --version "2023.11.10-dev+549"  # noqa: E501
+# xrpld-netgen add:peer --name 2023.11.10-dev+549-cluster --num 2 --seed_from pnode1
 # remove:peer
-# xrpld-netgen remove:peer --network_name xrpld-2023.11.10-dev+549 --protocol "xahau" --version "2023.11.10-dev+549"  # noqa: E501
+# xrpld-netgen remove:peer --name 2023.11.10-dev+549-cluster --num 2
+# add:validator
+# xrpld-netgen add:validator --name 2023.11.10-dev+549-cluster --num 1
+# remove:validator
+# xrpld-netgen remove:validator --name 2023.11.10-dev+549-cluster --num 1
+# bootstrap:node
+# xrpld-netgen bootstrap:node --name 2023.11.10-dev+549-cluster --node pnode2 --compare
 # update:version
 # xrpld-netgen update:version --node --version xrpld-2023.11.10-dev+549
+# upgrade:rolling
+# xrpld-netgen upgrade:rolling --name 2023.11.10-dev+549-cluster --build_version "2023.11.12-dev+552" --batch_size 2  # noqa: E501
+# bisect
+# xrpld-netgen bisect --good "2025.7.9-release+1951" --bad "2025.8.1-release+2000" --benchmark "./tps.sh" --threshold 400  # noqa: E501
+# amendments:activate
+# xrpld-netgen amendments:activate --name 2023.11.10-dev+549-cluster --amendments "fixXahauV3,Hooks" --majority_time "2 minutes"  # noqa: E501
+# features:diff
+# xrpld-netgen features:diff --versions "2025.7.9-release+1951,2025.8.1-release+2000" --json  # noqa: E501
 # enable:amendment
 # xrpld-netgen enable:amendment --peer 1 --amendment "name"
 # up
 # xrpld-netgen up --name xrpld-2023.11.10-dev+549
+# xrpld-netgen up --name xrpld-2023.11.10-dev+549 --resume
 # down
 # xrpld-netgen down --name xrpld-2023.11.10-dev+549
 # remove
 # xrpld-netgen remove --name xrpld-2023.11.10-dev+549
+# snapshot:create
+# xrpld-netgen snapshot:create --name 2023.11.10-dev+549-cluster --snapshot base
+# snapshot:restore
+# xrpld-netgen snapshot:restore --name 2023.11.10-dev+549-cluster --snapshot base
+# vl:swap
+# xrpld-netgen vl:swap --name 2023.11.10-dev+549-cluster --version 2
+# vl:list
+# xrpld-netgen vl:list --name 2023.11.10-dev+549-cluster
+# preflight
+# xrpld-netgen preflight --name 2023.11.10-dev+549-cluster
+# serve
+# xrpld-netgen serve --port 8765
+# run
+# xrpld-netgen run --script plan.yaml
 
 
 # LOCAL
@@ -36,32 +65,22 @@
 
 import os
 import argparse
-from xrpld_netgen.main import (
-    create_standalone_binary,
-    create_standalone_image,
-    start_local,
-)
-from xrpld_netgen.network import (
-    create_network,
-    create_local_network,
-    update_node_binary,
-    enable_node_amendment,
-)
 from xrpld_netgen.utils.misc import (
     remove_directory,
     bcolors,
     check_deps,
-    remove_containers,
+    remove_stale_containers,
     run_start,
     run_stop,
     run_logs,
     run_local_logs,
+    run_command,
+    parse_version_map,
 )
 
 package_dir = os.path.abspath(os.path.dirname(__file__))
 workspace_dir = os.path.join(os.path.dirname(__file__), "..", "workspace")
 basedir = os.path.abspath(workspace_dir)
-os.makedirs(basedir, exist_ok=True)
 
 # Fallback versions if network fetch fails
 _XRPL_RELEASE_FALLBACK: str = "3.1.1"
@@ -179,6 +198,27 @@ def main():
         required=False,
         help="The build version for the network",
     )
+    parser_cn.add_argument(
+        "--version_map",
+        type=str,
+        required=False,
+        help="Per node build versions with weights, e.g. "
+        "'2025.7.9-release+1951=60,2025.8.1-release+2000=40'",
+    )
+    parser_cn.add_argument(
+        "--amendments",
+        type=str,
+        required=False,
+        help="Genesis amendment selection, e.g. 'all,-fix*' or 'asof:<version>' "
+        "or 'since:<version>' (replaces --genesis)",
+    )
+    parser_cn.add_argument(
+        "--amendment_majority_time",
+        type=str,
+        required=False,
+        help="How long amendments need a majority, e.g. '2 minutes' "
+        "(default: 5 minutes for xahau, 15 minutes for xrpl)",
+    )
     parser_cn.add_argument(
         "--genesis",
         type=bool,
@@ -213,6 +253,122 @@ def main():
         help="The name of the xrpld binary for local networks (default: xrpld)",
         default="xrpld",
     )
+    # create:ansible
+    parser_ca = subparsers.add_parser(
+        "create:ansible", help="Create a Network deployed to remote hosts"
+    )
+    parser_ca.add_argument(
+        "--vips",
+        type=str,
+        required=True,
+        help="Comma separated ips of the validator hosts",
+    )
+    parser_ca.add_argument(
+        "--pips",
+        type=str,
+        required=True,
+        help="Comma separated ips of the peer hosts",
+    )
+    parser_ca.add_argument(
+        "--log_level",
+        required=False,
+        help="The log level",
+        choices=["warning", "debug", "trace"],
+        default="warning",
+    )
+    parser_ca.add_argument(
+        "--protocol",
+        type=str,
+        required=False,
+        help="The protocol of the network",
+        default="xahau",
+    )
+    parser_ca.add_argument(
+        "--network_id", type=int, required=False, help="The id of the network"
+    )
+    parser_ca.add_argument(
+        "--build_server",
+        type=str,
+        required=False,
+        help="The build server for the network",
+    )
+    parser_ca.add_argument(
+        "--build_version",
+        type=str,
+        required=False,
+        help="The build version for the network",
+    )
+    parser_ca.add_argument(
+        "--quorum",
+        type=int,
+        required=False,
+        help="The quorum required for the network",
+    )
+    parser_ca.add_argument(
+        "--nodedb_type",
+        type=str,
+        required=False,
+        help="The node db for the network",
+        choices=["Memory", "NuDB"],
+        default="NuDB",
+    )
+    parser_ca.add_argument(
+        "--registries",
+        type=str,
+        required=False,
+        help="Comma separated registries the image is pushed to (default: transia)",
+    )
+    parser_ca.add_argument(
+        "--batch_size",
+        type=int,
+        required=False,
+        help="The hosts rolling.yml deploys at once",
+        default=1,
+    )
+    parser_ca.add_argument(
+        "--health_timeout",
+        type=int,
+        required=False,
+        help="Seconds a rolling batch has to sync",
+        default=600,
+    )
+    parser_ca.add_argument(
+        "--bundle",
+        action="store_true",
+        required=False,
+        help="Ship the files of every host as one content addressed bundle",
+    )
+    parser_ca.add_argument(
+        "--bundle_binary",
+        action="store_true",
+        required=False,
+        help="Also ship the binary in a bundle and mount it into the image",
+    )
+    # add:peer, add:validator, remove:peer, remove:validator
+    for command, help_text in [
+        ("add:peer", "Add Peers to a running Network"),
+        ("add:validator", "Add Validators to a running Network"),
+        ("remove:peer", "Remove the last Peers of a running Network"),
+        ("remove:validator", "Remove the last Validators of a running Network"),
+    ]:
+        parser_sc = subparsers.add_parser(command, help=help_text)
+        parser_sc.add_argument(
+            "--name", type=str, required=True, help="The name of the network"
+        )
+        parser_sc.add_argument(
+            "--num",
+            type=int,
+            required=False,
+            help="The number of nodes",
+            default=1,
+        )
+        if command.startswith("add:"):
+            parser_sc.add_argument(
+                "--seed_from",
+                type=str,
+                required=False,
+                help="Copy the dbs of this node (e.g. pnode1) instead of syncing",
+            )
     # update:node
     parser_un = subparsers.add_parser("update:node", help="Update Node Version")
     parser_un.add_argument(
@@ -240,6 +396,210 @@ def main():
         required=False,
         help="The build version for the node",
     )
+    parser_un.add_argument(
+        "--seed_from",
+        type=str,
+        required=False,
+        help="Copy the dbs of this node (e.g. pnode1) instead of syncing",
+    )
+    # bootstrap:node
+    parser_bn = subparsers.add_parser(
+        "bootstrap:node", help="Clone the DBs of a synced node to a node"
+    )
+    parser_bn.add_argument(
+        "--name", type=str, required=True, help="The name of the network"
+    )
+    parser_bn.add_argument(
+        "--node", type=str, required=True, help="The node to bootstrap (e.g. pnode2)"
+    )
+    parser_bn.add_argument(
+        "--source",
+        type=str,
+        required=False,
+        help="The node to clone (default: a synced peer)",
+    )
+    parser_bn.add_argument(
+        "--compare",
+        action="store_true",
+        required=False,
+        help="Time a normal sync of the node first",
+    )
+    parser_bn.add_argument(
+        "--timeout",
+        type=int,
+        required=False,
+        help="Seconds to wait for the node to sync",
+        default=600,
+    )
+    # upgrade:rolling
+    parser_ur = subparsers.add_parser(
+        "upgrade:rolling", help="Rolling Upgrade keeping Node DBs"
+    )
+    parser_ur.add_argument(
+        "--name", type=str, required=True, help="The name of the network"
+    )
+    parser_ur.add_argument(
+        "--build_version",
+        type=str,
+        required=True,
+        help="The build version to upgrade to",
+    )
+    parser_ur.add_argument(
+        "--build_server",
+        type=str,
+        required=False,
+        help="The build server for the nodes",
+        default="https://build.xahau.tech",
+    )
+    parser_ur.add_argument(
+        "--nodes",
+        type=str,
+        required=False,
+        help="Comma separated nodes to upgrade (default: all nodes)",
+    )
+    parser_ur.add_argument(
+        "--batch_size",
+        type=int,
+        required=False,
+        help="The number of nodes upgraded at the same time",
+        default=1,
+    )
+    parser_ur.add_argument(
+        "--timeout",
+        type=int,
+        required=False,
+        help="Seconds to wait for a batch to sync before stopping the upgrade",
+        default=600,
+    )
+    # bisect
+    parser_bs = subparsers.add_parser(
+        "bisect", help="Find the first build with a performance regression"
+    )
+    parser_bs.add_argument(
+        "--good", type=str, required=True, help="The last known good build version"
+    )
+    parser_bs.add_argument(
+        "--bad", type=str, required=True, help="The first known bad build version"
+    )
+    parser_bs.add_argument(
+        "--benchmark",
+        type=str,
+        required=True,
+        help="Benchmark command, its last output line is the metric",
+    )
+    parser_bs.add_argument(
+        "--threshold",
+        type=float,
+        required=True,
+        help="Metric value separating good from bad builds",
+    )
+    parser_bs.add_argument(
+        "--lower_is_better",
+        action="store_true",
+        help="The metric is a duration (e.g. ledger close time), not a rate",
+    )
+    parser_bs.add_argument(
+        "--build_server",
+        type=str,
+        required=False,
+        help="The build server for the nodes",
+        default="https://build.xahau.tech",
+    )
+    parser_bs.add_argument(
+        "--num_validators",
+        type=int,
+        required=False,
+        help="The number of validators in each cluster",
+        default=3,
+    )
+    parser_bs.add_argument(
+        "--num_peers",
+        type=int,
+        required=False,
+        help="The number of peers in each cluster",
+        default=1,
+    )
+    parser_bs.add_argument(
+        "--network_id",
+        type=int,
+        required=False,
+        help="The network id",
+        default=21339,
+    )
+    parser_bs.add_argument(
+        "--timeout",
+        type=int,
+        required=False,
+        help="Seconds to wait for a cluster to sync and for the benchmark",
+        default=600,
+    )
+    parser_bs.add_argument(
+        "--no_verify",
+        action="store_true",
+        help="Do not benchmark the good and bad versions first",
+    )
+    # amendments:activate
+    parser_aa = subparsers.add_parser(
+        "amendments:activate", help="Vote for Amendments on all Validators"
+    )
+    parser_aa.add_argument(
+        "--name", type=str, required=True, help="The name of the network"
+    )
+    parser_aa.add_argument(
+        "--amendments",
+        type=str,
+        required=True,
+        help="Comma separated amendment names or hashes",
+    )
+    parser_aa.add_argument(
+        "--majority_time",
+        type=str,
+        required=False,
+        help="Set the amendment majority time first (restarts the nodes)",
+    )
+    parser_aa.add_argument(
+        "--timeout",
+        type=int,
+        required=False,
+        help="Seconds to follow the vote",
+        default=3600,
+    )
+    parser_aa.add_argument(
+        "--interval",
+        type=float,
+        required=False,
+        help="Seconds between polls of the nodes",
+        default=2,
+    )
+    # features:diff
+    parser_fd = subparsers.add_parser(
+        "features:diff", help="Diff the Amendments of Build Versions"
+    )
+    parser_fd.add_argument(
+        "--protocol",
+        type=str,
+        required=False,
+        help="The protocol of the versions",
+        choices=["xahau", "xrpl"],
+        default="xahau",
+    )
+    parser_fd.add_argument(
+        "--versions",
+        type=str,
+        required=True,
+        help="Comma separated versions, oldest first (build server versions "
+        "for xahau, git tags or commits for xrpl)",
+    )
+    parser_fd.add_argument(
+        "--build_server",
+        type=str,
+        required=False,
+        help="The build server of the versions",
+        default="https://build.xahau.tech",
+    )
+    parser_fd.add_argument(
+        "--json", action="store_true", help="Print the diff as JSON"
+    )
     # enable:amendment
     parser_ea = subparsers.add_parser("enable:amendment", help="Enable Amendment")
     parser_ea.add_argument("--name", required=True, help="The name of the network")
@@ -263,6 +623,34 @@ def main():
     # up
     parser_st = subparsers.add_parser("up", help="Start Network")
     parser_st.add_argument("--name", required=True, help="The name of the network")
+    parser_st.add_argument(
+        "--resume",
+        action="store_true",
+        required=False,
+        help="Restart the nodes from their existing databases",
+    )
+    parser_st.add_argument(
+        "--nodes",
+        required=False,
+        help="Comma separated nodes to resume into the running network",
+        default=None,
+    )
+    # up:local-network
+    parser_uln = subparsers.add_parser(
+        "up:local-network", help="Start Local Network created with --local"
+    )
+    parser_uln.add_argument(
+        "--protocol",
+        required=False,
+        help="The protocol of the network",
+        default="xahau",
+    )
+    parser_uln.add_argument(
+        "--resume",
+        action="store_true",
+        required=False,
+        help="Restart the nodes from their existing databases",
+    )
     # down
     parser_sp = subparsers.add_parser("down", help="Stop Network")
     parser_sp.add_argument("--name", required=True, help="The name of the network")
@@ -271,6 +659,94 @@ def main():
     parser_r = subparsers.add_parser("remove", help="Remove Network")
     parser_r.add_argument("--name", required=True, help="The name of the network")
 
+    # snapshot:create
+    parser_sc = subparsers.add_parser("snapshot:create", help="Snapshot Network DBs")
+    parser_sc.add_argument("--name", required=True, help="The name of the network")
+    parser_sc.add_argument(
+        "--snapshot", required=False, help="The name of the snapshot", default=None
+    )
+    parser_sc.add_argument(
+        "--nodes",
+        required=False,
+        help="Comma separated nodes to capture (e.g., vnode1,pnode1)",
+        default=None,
+    )
+    parser_sc.add_argument(
+        "--no_restart",
+        action="store_true",
+        required=False,
+        help="Leave the nodes stopped after the snapshot",
+    )
+    # snapshot:restore
+    parser_sr = subparsers.add_parser(
+        "snapshot:restore", help="Restore Network DBs and warm start"
+    )
+    parser_sr.add_argument("--name", required=True, help="The name of the network")
+    parser_sr.add_argument(
+        "--snapshot", required=True, help="The name of the snapshot"
+    )
+    parser_sr.add_argument(
+        "--no_start",
+        action="store_true",
+        required=False,
+        help="Restore the dbs without starting the nodes",
+    )
+    # snapshot:list
+    subparsers.add_parser("snapshot:list", help="List Snapshots")
+
+    # VL
+    # vl:swap
+    parser_vs = subparsers.add_parser(
+        "vl:swap", help="Serve another UNL version without a restart"
+    )
+    parser_vs.add_argument("--name", required=True, help="The name of the network")
+    parser_vs.add_argument(
+        "--version", type=int, required=True, help="The UNL version (sequence)"
+    )
+    parser_vs.add_argument(
+        "--refresh_interval",
+        type=int,
+        required=False,
+        help="Minutes between the list fetches of the nodes",
+        default=1,
+    )
+    parser_vs.add_argument(
+        "--no_wait",
+        action="store_true",
+        required=False,
+        help="Do not wait for the nodes to load the list",
+    )
+    parser_vs.add_argument(
+        "--timeout",
+        type=float,
+        required=False,
+        help="Seconds to wait for the nodes",
+        default=600,
+    )
+    # vl:list
+    parser_vls = subparsers.add_parser("vl:list", help="List UNL versions")
+    parser_vls.add_argument("--name", required=True, help="The name of the network")
+
+    # preflight
+    parser_pf = subparsers.add_parser(
+        "preflight", help="Check the hosts of a remote network before deploying"
+    )
+    parser_pf.add_argument("--name", required=True, help="The name of the network")
+    parser_pf.add_argument(
+        "--max_workers",
+        type=int,
+        required=False,
+        help="Hosts probed at once",
+        default=16,
+    )
+    parser_pf.add_argument(
+        "--timeout",
+        type=int,
+        required=False,
+        help="Seconds to connect to a host",
+        default=15,
+    )
+
     # STANDALONE
 
     # up:standalone
@@ -359,6 +835,34 @@ def main():
         required=False,
         help="The build version for the network",
     )
+    # serve
+    parser_sv = subparsers.add_parser("serve", help="Serve the HTTP/JSON API")
+    parser_sv.add_argument(
+        "--host",
+        type=str,
+        required=False,
+        help="The address to listen on",
+        default="127.0.0.1",
+    )
+    parser_sv.add_argument(
+        "--port",
+        type=int,
+        required=False,
+        help="The port to listen on",
+        default=8765,
+    )
+    # run
+    parser_rn = subparsers.add_parser("run", help="Run a plan of operations")
+    parser_rn.add_argument(
+        "--script", type=str, required=True, help="The plan file (yaml)"
+    )
+    parser_rn.add_argument(
+        "--max_workers",
+        type=int,
+        required=False,
+        help="The maximum number of steps running at once",
+        default=8,
+    )
 
     args = parser.parse_args()
 
@@ -380,6 +884,96 @@ def main():
         print(f"{bcolors.BLUE}Removing Network: {NAME}{bcolors.END}")
         return remove_directory(f"{basedir}/{NAME}")
 
+    # SNAPSHOTS
+    if args.command == "snapshot:create":
+        from xrpld_netgen.snapshot import create_snapshot
+
+        NAME = args.name
+        NODES = args.nodes.split(",") if args.nodes else None
+        print(f"{bcolors.BLUE}Creating Snapshot of Network: {NAME}{bcolors.END}")
+        create_snapshot(NAME, args.snapshot, NODES, not args.no_restart)
+        return
+
+    if args.command == "snapshot:restore":
+        from xrpld_netgen.snapshot import restore_snapshot
+
+        NAME = args.name
+        print(
+            f"{bcolors.BLUE}Restoring Snapshot {args.snapshot} "
+            f"to Network: {NAME}{bcolors.END}"
+        )
+        restore_snapshot(NAME, args.snapshot, not args.no_start)
+        return
+
+    if args.command == "snapshot:list":
+        from xrpld_netgen.snapshot import list_snapshots
+
+        for snapshot in list_snapshots():
+            ledger = snapshot["ledger"] or {}
+            print(
+                f"{bcolors.PURPLE}{snapshot['name']}{bcolors.END} "
+                f"cluster: {snapshot['cluster']} "
+                f"ledger: {ledger.get('seq', 'unknown')} "
+                f"nodes: {', '.join(snapshot['nodes'])}"
+            )
+        return
+
+    # VL
+    if args.command == "vl:swap":
+        from xrpld_netgen.unl import swap_unl
+
+        NAME = args.name
+        print(
+            f"{bcolors.BLUE}Swapping UNL "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Network Name: {NAME}")
+        print(f"    - Version: {args.version}")
+        print(f"    - Refresh Interval: {args.refresh_interval}")
+        try:
+            timings = swap_unl(
+                NAME,
+                args.version,
+                args.refresh_interval,
+                not args.no_wait,
+                args.timeout,
+            )
+        except ValueError as e:
+            print(f"{bcolors.RED}❌ {e}{bcolors.END}")
+            raise SystemExit(1)
+        if not args.no_wait:
+            for node, seconds in timings.items():
+                loaded = f"{seconds:.1f}s" if seconds is not None else "timeout"
+                print(f"    - {node}: {loaded}")
+        return
+
+    if args.command == "vl:list":
+        from xrpld_netgen.unl import basedir, list_unl_versions
+
+        for version in list_unl_versions(f"{basedir}/{args.name}"):
+            print(f"{bcolors.PURPLE}{version}{bcolors.END}")
+        return
+
+    if args.command == "preflight":
+        from xrpld_netgen.preflight import preflight, print_preflight_report
+
+        print(f"{bcolors.BLUE}Checking the hosts of: {args.name}{bcolors.END}")
+        reports = preflight(args.name, args.max_workers, args.timeout)
+        if not print_preflight_report(reports):
+            raise SystemExit(1)
+        return
+
+    # FEATURES
+    if args.command == "features:diff":
+        from xrpld_netgen.features import diff_versions, print_features_diff
+
+        VERSIONS = args.versions.split(",")
+        if len(VERSIONS) < 2:
+            parser.error("features:diff needs at least two versions")
+        diffs = diff_versions(args.protocol, VERSIONS, args.build_server)
+        print_features_diff(diffs, args.json)
+        return
+
     # DOWN STANDALONE
     if args.command == "down:standalone":
         NAME = args.name
@@ -411,12 +1005,44 @@ def main():
     # MANAGE NETWORK/STANDALONE
     if args.command == "up":
         NAME = args.name
-        print(f"{bcolors.BLUE}Starting Network: {NAME}{bcolors.END}")
+        RESUME = args.resume
+        NODES = args.nodes.split(",") if args.nodes else None
+        if NODES:
+            # restart single nodes into the running network from their dbs
+            print(f"{bcolors.BLUE}Resuming Nodes: {', '.join(NODES)}{bcolors.END}")
+            return run_command(
+                f"{basedir}/{NAME}",
+                f"docker compose up -d --force-recreate {' '.join(NODES)}",
+                {"START_MODE": "load"},
+            )
+        print(
+            f"{bcolors.BLUE}{'Resuming' if RESUME else 'Starting'} "
+            f"Network: {NAME}{bcolors.END}"
+        )
         return run_start(
             [f"{basedir}/{NAME}/start.sh"],
             None,
             None,
             "network",
+            {"START_MODE": "warm"} if RESUME else None,
+            f"{basedir}/{NAME}",
+        )
+
+    if args.command == "up:local-network":
+        PROTOCOL = args.protocol
+        RESUME = args.resume
+        cluster_dir = f"{os.getcwd()}/local-{PROTOCOL}-cluster"
+        print(
+            f"{bcolors.BLUE}{'Resuming' if RESUME else 'Starting'} "
+            f"Local Network: {cluster_dir}{bcolors.END}"
+        )
+        return run_start(
+            [f"{cluster_dir}/start.sh"] + (["--resume"] if RESUME else []),
+            None,
+            None,
+            "local network",
+            None,
+            cluster_dir,
         )
 
     print("")
@@ -427,18 +1053,45 @@ def main():
     print("/_/|_/_/ |_/_/   /_____/_____/  /_/ |_/\\___/\\__/\\____/\\___/_/ /_/  ")  # noqa: W605, E501
     print("")
 
+    # only commands that build or start nodes read the .env
+    from dotenv import load_dotenv
+
+    load_dotenv()
     check_deps([f"{package_dir}/deploykit/prerequisites.sh"])
 
     print(f"{bcolors.BLUE}Removing existing containers: {bcolors.RED}")
-    remove_containers("docker stop xahau")
-    remove_containers("docker rm xahau")
-    remove_containers("docker stop explorer")
-    remove_containers("docker rm explorer")
-    remove_containers("docker stop xrpl")
-    remove_containers("docker rm xrpl")
+    remove_stale_containers(["xahau", "explorer", "xrpl"])
+
+    # SERVE
+    if args.command == "serve":
+        from xrpld_netgen.server import serve
+
+        return serve(args.host, args.port)
+
+    # RUN
+    if args.command == "run":
+        import time
+        from xrpld_netgen.plan import load_plan, run_plan, print_plan_report
+
+        STEPS = load_plan(args.script)
+        print(
+            f"{bcolors.BLUE}Running Plan "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Script: {args.script}")
+        print(f"    - Steps: {len(STEPS)}")
+        print(f"    - Max Workers: {args.max_workers}")
+        start = time.perf_counter()
+        report = run_plan(STEPS, args.max_workers)
+        print_plan_report(report, time.perf_counter() - start)
+        if any(step["status"] != "ok" for step in report):
+            raise SystemExit(1)
+        return
 
     # LOCAL
     if args.command == "up:local":
+        from xrpld_netgen.main import start_local
+
         LOG_LEVEL = args.log_level
         PUBLIC_KEY = args.public_key
         IMPORT_KEY = args.import_key
@@ -475,6 +1128,8 @@ def main():
 
     # CREATE NETWORK
     if args.command == "create:network":
+        from xrpld_netgen.network import create_network, create_local_network
+
         LOG_LEVEL = args.log_level
         PROTOCOL = args.protocol
         NUM_VALIDATORS = args.num_validators
@@ -487,6 +1142,25 @@ def main():
         NODEDB_TYPE = args.nodedb_type
         LOCAL = args.local
         BINARY_NAME = args.binary_name
+        AMENDMENT_MAJORITY_TIME = args.amendment_majority_time
+        AMENDMENTS = args.amendments
+        try:
+            VERSION_MAP = (
+                parse_version_map(args.version_map) if args.version_map else None
+            )
+        except ValueError as e:
+            print(f"{bcolors.RED}❌ {e}{bcolors.END}")
+            raise SystemExit(1)
+        if LOCAL and (VERSION_MAP or AMENDMENT_MAJORITY_TIME or AMENDMENTS):
+            # the local builder runs a single binary and has no amendment config
+            print(
+                f"{bcolors.RED}❌ --version_map, --amendment_majority_time and "
+                f"--amendments can not be combined with --local{bcolors.END}"
+            )
+            raise SystemExit(1)
+        if VERSION_MAP and not BUILD_VERSION:
+            # the first version names the network and provides the features
+            BUILD_VERSION = next(iter(VERSION_MAP))
 
         import_vl_key: str = (
             "ED87E0EA91AAFFA130B78B75D2CC3E53202AA1BD8AB3D5E7BAC530C8440E328501"
@@ -534,6 +1208,12 @@ def main():
         print(f"    - Genesis: {GENESIS}")
         print(f"    - Quorum: {QUORUM}")
         print(f"    - Node DB: {NODEDB_TYPE}")
+        if VERSION_MAP:
+            print(f"    - Version Map: {VERSION_MAP}")
+        if AMENDMENTS:
+            print(f"    - Amendments: {AMENDMENTS}")
+        if AMENDMENT_MAJORITY_TIME:
+            print(f"    - Amendment Majority Time: {AMENDMENT_MAJORITY_TIME}")
         if LOCAL:
             print(f"    - Binary Name: {BINARY_NAME}")
             print("    - Deployment: Local (native processes, no Docker for nodes)")
@@ -568,12 +1248,111 @@ def main():
                 GENESIS,
                 QUORUM,
                 NODEDB_TYPE,
+                VERSION_MAP,
+                AMENDMENT_MAJORITY_TIME,
+                AMENDMENTS,
             )
 
+    if args.command == "create:ansible":
+        from xrpld_netgen.network import create_ansible
+
+        PROTOCOL = args.protocol
+        VIPS = args.vips.split(",")
+        PIPS = args.pips.split(",")
+        BUILD_SERVER = args.build_server or "https://build.xahau.tech"
+        BUILD_VERSION = args.build_version or (
+            _XAHAU_RELEASE_FALLBACK if PROTOCOL == "xahau" else _XRPL_RELEASE_FALLBACK
+        )
+        NETWORK_ID = args.network_id or (21339 if PROTOCOL == "xahau" else 21337)
+        QUORUM = args.quorum or len(VIPS) - 1
+        REGISTRIES = args.registries.split(",") if args.registries else None
+        import_vl_key: str = (
+            "ED87E0EA91AAFFA130B78B75D2CC3E53202AA1BD8AB3D5E7BAC530C8440E328501"
+        )
+
+        print(
+            f"{bcolors.BLUE}Creating Ansible Network "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Log Level: {args.log_level}")
+        print(f"    - Protocol: {PROTOCOL}")
+        print(f"    - Validators: {', '.join(VIPS)}")
+        print(f"    - Peers: {', '.join(PIPS)}")
+        print(f"    - Network ID: {NETWORK_ID}")
+        print(f"    - Build Server: {BUILD_SERVER}")
+        print(f"    - Build Version: {BUILD_VERSION}")
+        print(f"    - Quorum: {QUORUM}")
+        print(f"    - Node DB: {args.nodedb_type}")
+        print(f"    - Batch Size: {args.batch_size}")
+        print(f"    - Bundle: {args.bundle or args.bundle_binary}")
+        print(f"    - Bundle Binary: {args.bundle_binary}")
+
+        create_ansible(
+            args.log_level,
+            import_vl_key,
+            PROTOCOL,
+            len(VIPS),
+            len(PIPS),
+            NETWORK_ID,
+            BUILD_SERVER,
+            BUILD_VERSION,
+            False,
+            QUORUM,
+            args.nodedb_type,
+            VIPS,
+            PIPS,
+            REGISTRIES,
+            args.batch_size,
+            args.health_timeout,
+            args.bundle,
+            args.bundle_binary,
+        )
+
+    if args.command in ["add:peer", "add:validator"]:
+        from xrpld_netgen.scale import add_nodes
+
+        NAME = args.name
+        NODE_TYPE = args.command.split(":")[1]
+        print(
+            f"{bcolors.BLUE}Adding Nodes "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Network Name: {NAME}")
+        print(f"    - Node Type: {NODE_TYPE}")
+        print(f"    - Number: {args.num}")
+        print(f"    - Seed From: {args.seed_from or 'network sync'}")
+        try:
+            if NODE_TYPE == "validator":
+                add_nodes(NAME, args.num, 0, args.seed_from)
+            else:
+                add_nodes(NAME, 0, args.num, args.seed_from)
+        except RuntimeError as e:
+            print(f"{bcolors.RED}❌ {e}{bcolors.END}")
+            raise SystemExit(1)
+
+    if args.command in ["remove:peer", "remove:validator"]:
+        from xrpld_netgen.scale import remove_nodes
+
+        NAME = args.name
+        NODE_TYPE = args.command.split(":")[1]
+        print(
+            f"{bcolors.BLUE}Removing Nodes "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Network Name: {NAME}")
+        print(f"    - Node Type: {NODE_TYPE}")
+        print(f"    - Number: {args.num}")
+        if NODE_TYPE == "validator":
+            remove_nodes(NAME, args.num, 0)
+        else:
+            remove_nodes(NAME, 0, args.num)
+
     if args.command == "update:node":
+        from xrpld_netgen.network import update_node_binary
+
         NAME = args.name
         NODE_ID = args.node_id
-        NODE_VERSION = args.node_version
+        NODE_VERSION = args.node_type
         BUILD_SERVER = args.build_server
         BUILD_VERSION = args.build_version
         print(
@@ -585,9 +1364,107 @@ def main():
         print(f"    - Node Type: {NODE_VERSION}")
         print(f"    - Build Server: {BUILD_SERVER}")
         print(f"    - Build Version: {BUILD_VERSION}")
-        update_node_binary(NAME, NODE_ID, NODE_VERSION, BUILD_SERVER, BUILD_VERSION)
+        print(f"    - Seed From: {args.seed_from or 'network sync'}")
+        update_node_binary(
+            NAME, NODE_ID, NODE_VERSION, BUILD_SERVER, BUILD_VERSION, args.seed_from
+        )
+
+    if args.command == "bootstrap:node":
+        from xrpld_netgen.bootstrap import bootstrap_node
+
+        NAME = args.name
+        print(
+            f"{bcolors.BLUE}Bootstrapping Node "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Network Name: {NAME}")
+        print(f"    - Node: {args.node}")
+        print(f"    - Source: {args.source or 'a synced peer'}")
+        print(f"    - Compare: {args.compare}")
+        try:
+            bootstrap_node(NAME, args.node, args.source, args.compare, args.timeout)
+        except RuntimeError as e:
+            print(f"{bcolors.RED}❌ {e}{bcolors.END}")
+            raise SystemExit(1)
+
+    if args.command == "upgrade:rolling":
+        from xrpld_netgen.network import rolling_upgrade
+
+        NAME = args.name
+        BUILD_SERVER = args.build_server
+        BUILD_VERSION = args.build_version
+        NODES = args.nodes.split(",") if args.nodes else None
+        BATCH_SIZE = args.batch_size
+        TIMEOUT = args.timeout
+        print(
+            f"{bcolors.BLUE}Rolling Upgrade "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Network Name: {NAME}")
+        print(f"    - Build Server: {BUILD_SERVER}")
+        print(f"    - Build Version: {BUILD_VERSION}")
+        print(f"    - Nodes: {', '.join(NODES) if NODES else 'all'}")
+        print(f"    - Batch Size: {BATCH_SIZE}")
+        print(f"    - Timeout: {TIMEOUT}")
+        try:
+            rolling_upgrade(
+                NAME, BUILD_SERVER, BUILD_VERSION, NODES, BATCH_SIZE, TIMEOUT
+            )
+        except RuntimeError as e:
+            print(f"{bcolors.RED}❌ {e}{bcolors.END}")
+            raise SystemExit(1)
+
+    if args.command == "bisect":
+        from xrpld_netgen.regression import run_bisect
+
+        print(
+            f"{bcolors.BLUE}Bisecting Builds "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Good Version: {args.good}")
+        print(f"    - Bad Version: {args.bad}")
+        print(f"    - Benchmark: {args.benchmark}")
+        print(f"    - Threshold: {args.threshold}")
+        print(f"    - Lower Is Better: {args.lower_is_better}")
+        print(f"    - Build Server: {args.build_server}")
+        run_bisect(
+            args.good,
+            args.bad,
+            args.benchmark,
+            args.threshold,
+            "ED87E0EA91AAFFA130B78B75D2CC3E53202AA1BD8AB3D5E7BAC530C8440E328501",
+            args.lower_is_better,
+            args.build_server,
+            args.num_validators,
+            args.num_peers,
+            args.network_id,
+            args.timeout,
+            not args.no_verify,
+        )
+
+    if args.command == "amendments:activate":
+        from xrpld_netgen.amendments import activate_amendments
+
+        NAME = args.name
+        AMENDMENTS = args.amendments.split(",")
+        print(
+            f"{bcolors.BLUE}Activating Amendments "
+            f"with the following parameters:{bcolors.END}"
+        )
+        print(f"    - Network Name: {NAME}")
+        print(f"    - Amendments: {', '.join(AMENDMENTS)}")
+        print(f"    - Majority Time: {args.majority_time or 'unchanged'}")
+        try:
+            activate_amendments(
+                NAME, AMENDMENTS, args.majority_time, args.timeout, args.interval
+            )
+        except RuntimeError as e:
+            print(f"{bcolors.RED}❌ {e}{bcolors.END}")
+            raise SystemExit(1)
 
     if args.command == "enable:amendment":
+        from xrpld_netgen.network import enable_node_amendment
+
         NAME = args.name
         AMENDMENT_NAME = args.amendment_name
         NODE_ID = args.node_id
@@ -604,6 +1481,11 @@ def main():
 
     # UP STANDALONE
     if args.command == "up:standalone":
+        from xrpld_netgen.main import (
+            create_standalone_binary,
+            create_standalone_image,
+        )
+
         LOG_LEVEL = args.log_level
         BUILD_TYPE = args.build_type
         PUBLIC_KEY = args.public_key
@@ -0,0 +1,6 @@
+#!/bin/sh
+# ./deploy.sh
+# Redeploys the changed images and configs, forks and pipelining are set in
+# ansible.cfg
+export ANSIBLE_HOST_KEY_CHECKING=False
+ansible-playbook -i hosts.txt incremental.yml
@@ -0,0 +1,6 @@
+#!/bin/sh
+# ./rolling.sh
+# Deploys in batches, each batch must sync before the next one starts
+export ANSIBLE_HOST_KEY_CHECKING=False
+ansible-playbook -i hosts.txt rolling.yml
+cat rolling.log
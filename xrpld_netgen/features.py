@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import json
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from xrpld_netgen.libs.github import (
+    get_commit_hash_from_server_version,
+    get_commit_hash_from_ref,
+    download_file_at_commit,
+)
+from xrpld_netgen.libs.xrpld import (
+    get_feature_lines_from_content,
+    parse_amendment_table,
+    diff_amendment_tables,
+)
+from xrpld_netgen.utils.cache import cached_bytes
+from xrpld_netgen.utils.misc import bcolors
+
+# Repository and feature file (with fallback for older/newer layouts)
+FEATURE_SOURCES: Dict[str, Dict[str, str]] = {
+    "xahau": {
+        "owner": "Xahau",
+        "repo": "xahaud",
+        "path": "src/ripple/protocol/impl/Feature.cpp",
+        "fallback": "include/xrpl/protocol/detail/features.macro",
+    },
+    "xrpl": {
+        "owner": "XRPLF",
+        "repo": "rippled",
+        "path": "include/xrpl/protocol/detail/features.macro",
+        "fallback": "src/libxrpl/protocol/Feature.cpp",
+    },
+}
+
+
+def get_version_commit(protocol: str, version: str, build_server: str) -> str:
+    source: Dict[str, str] = FEATURE_SOURCES[protocol]
+    if protocol == "xahau":
+        # build server versions are immutable, so is their commit
+        return cached_bytes(
+            "commits",
+            f"{build_server}/{version}",
+            lambda: get_commit_hash_from_server_version(
+                build_server, version
+            ).encode(),
+        ).decode()
+    return get_commit_hash_from_ref(source["owner"], source["repo"], version)
+
+
+def get_feature_lines(
+    protocol: str, version: str, build_server: str = "https://build.xahau.tech"
+) -> List[str]:
+    """
+    Returns the feature file lines of a version, cached by commit hash.
+    Xahau versions are build server versions, xrpl versions are git refs.
+    """
+    source: Dict[str, str] = FEATURE_SOURCES[protocol]
+    commit_hash: str = get_version_commit(protocol, version, build_server)
+    content: bytes = download_file_at_commit(
+        source["owner"],
+        source["repo"],
+        commit_hash,
+        source["path"],
+        source["fallback"],
+    )
+    return get_feature_lines_from_content(content)
+
+
+# Versions are immutable, long running processes (serve, run) parse them once.
+# The tables are shared, callers must not modify them.
+@lru_cache(maxsize=64)
+def get_amendment_table(
+    protocol: str, version: str, build_server: str = "https://build.xahau.tech"
+) -> Dict[str, Dict[str, Any]]:
+    return parse_amendment_table(get_feature_lines(protocol, version, build_server))
+
+
+def diff_versions(
+    protocol: str, versions: List[str], build_server: str = "https://build.xahau.tech"
+) -> List[Dict[str, Any]]:
+    """
+    Diffs the amendment tables of consecutive versions.
+    """
+    with ThreadPoolExecutor(max_workers=len(versions)) as executor:
+        tables: List[Dict[str, Dict[str, Any]]] = list(
+            executor.map(
+                lambda v: get_amendment_table(protocol, v, build_server), versions
+            )
+        )
+    return [
+        {"from": versions[i], "to": versions[i + 1], **diff_amendment_tables(*pair)}
+        for i, pair in enumerate(zip(tables, tables[1:]))
+    ]
+
+
+def print_features_diff(diffs: List[Dict[str, Any]], as_json: bool = False) -> None:
+    if as_json:
+        print(json.dumps(diffs, indent=4))
+        return
+    for diff in diffs:
+        print(
+            f"{bcolors.BLUE}{diff['from']} {bcolors.END}-> "
+            f"{bcolors.BLUE}{diff['to']}{bcolors.END}"
+        )
+        for name in diff["added"]:
+            print(f"    {bcolors.GREEN}+ {name}{bcolors.END}")
+        for name in diff["removed"]:
+            print(f"    {bcolors.RED}- {name}{bcolors.END}")
+        for name in diff["retired"]:
+            print(f"    {bcolors.PURPLE}retired {name}{bcolors.END}")
+        for change in diff["default_vote"]:
+            old: str = "yes" if change["old"] else "no"
+            new: str = "yes" if change["new"] else "no"
+            print(
+                f"    {bcolors.CYAN}default vote {change['name']}: "
+                f"{old} -> {new}{bcolors.END}"
+            )
+        if not any(diff[k] for k in ["added", "removed", "retired", "default_vote"]):
+            print("    no amendment changes")
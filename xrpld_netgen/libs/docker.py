@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import json
+import socket
+import struct
+import threading
+import http.client
+from urllib.parse import urlencode, quote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+DEFAULT_SOCKET: str = "/var/run/docker.sock"
+# Multiplexed log frames: stream type, 3 padding bytes, big endian size
+FRAME_HEADER = struct.Struct(">BxxxL")
+STREAMS: Dict[int, str] = {0: "stdin", 1: "stdout", 2: "stderr"}
+
+
+class DockerError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker API error {status}: {message}")
+        self.status = status
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def get_socket_path() -> str:
+    # DOCKER_HOST=unix:///path/docker.sock, tcp hosts are not supported
+    docker_host: str = os.environ.get("DOCKER_HOST", "")
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://") :]
+    if docker_host:
+        return None
+    return DEFAULT_SOCKET
+
+
+class DockerClient:
+    """
+    Minimal Docker Engine API client over the unix socket. Every thread
+    keeps one persistent keep-alive connection, streams (logs) use their own.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> UnixHTTPConnection:
+        connection: UnixHTTPConnection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = UnixHTTPConnection(self.socket_path, self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection: UnixHTTPConnection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _path(self, path: str, params: Dict[str, Any] = None) -> str:
+        if params:
+            return f"{path}?{urlencode(params)}"
+        return path
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, Any] = None,
+        body: Dict[str, Any] = None,
+    ) -> Any:
+        """
+        Sends a request on the persistent connection of the thread and
+        returns the decoded JSON body (or None for empty responses).
+        """
+        payload: bytes = json.dumps(body).encode() if body is not None else None
+        headers: Dict[str, str] = {"Content-Type": "application/json"}
+        for attempt in range(2):
+            connection: UnixHTTPConnection = self._connection()
+            try:
+                connection.request(method, self._path(path, params), payload, headers)
+                response = connection.getresponse()
+                data: bytes = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # the daemon closed the idle keep-alive connection, reconnect
+                self.close()
+                if attempt:
+                    raise
+        if response.status >= 400:
+            try:
+                message: str = json.loads(data)["message"]
+            except (ValueError, KeyError):
+                message = data.decode(errors="replace")
+            raise DockerError(response.status, message)
+        if not data:
+            return None
+        if response.getheader("Content-Type", "").startswith("application/json"):
+            return json.loads(data)
+        return data
+
+    def list_containers(
+        self, all: bool = False, filters: Dict[str, List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {"all": "true" if all else "false"}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        return self.request("GET", "/containers/json", params)
+
+    def inspect_container(self, name: str) -> Dict[str, Any]:
+        """
+        Returns the container details, or None if it does not exist.
+        """
+        try:
+            return self.request("GET", f"/containers/{quote(name)}/json")
+        except DockerError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def is_running(self, name: str) -> bool:
+        container: Dict[str, Any] = self.inspect_container(name)
+        return bool(container and container["State"]["Running"])
+
+    def stop_container(self, name: str, timeout: int = 10) -> None:
+        # answers 304 when the container is already stopped
+        self.request("POST", f"/containers/{quote(name)}/stop", {"t": timeout})
+
+    def remove_container(
+        self, name: str, force: bool = False, volumes: bool = False
+    ) -> None:
+        params: Dict[str, str] = {
+            "force": "true" if force else "false",
+            "v": "true" if volumes else "false",
+        }
+        self.request("DELETE", f"/containers/{quote(name)}", params)
+
+    def stats(self, name: str) -> Dict[str, Any]:
+        return self.request(
+            "GET", f"/containers/{quote(name)}/stats", {"stream": "false"}
+        )
+
+    def logs(
+        self,
+        name: str,
+        follow: bool = False,
+        tail: str = "all",
+        stdout: bool = True,
+        stderr: bool = True,
+    ) -> Iterator[Tuple[str, bytes]]:
+        """
+        Streams the logs of a container as (stream, data) tuples. Logs of
+        containers without a tty are demultiplexed into stdout and stderr.
+        """
+        container: Dict[str, Any] = self.inspect_container(name)
+        if container is None:
+            raise DockerError(404, f"No such container: {name}")
+        tty: bool = container["Config"]["Tty"]
+        params: Dict[str, str] = {
+            "follow": "true" if follow else "false",
+            "tail": tail,
+            "stdout": "true" if stdout else "false",
+            "stderr": "true" if stderr else "false",
+        }
+        # a followed stream holds the connection, so it gets its own
+        connection = UnixHTTPConnection(self.socket_path, None if follow else 60)
+        try:
+            connection.request(
+                "GET", self._path(f"/containers/{quote(name)}/logs", params)
+            )
+            response = connection.getresponse()
+            if response.status >= 400:
+                raise DockerError(response.status, response.read().decode())
+            if tty:
+                while True:
+                    data: bytes = response.read1(65536)
+                    if not data:
+                        return
+                    yield "stdout", data
+            while True:
+                header: bytes = response.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    return
+                stream, size = FRAME_HEADER.unpack(header)
+                yield STREAMS.get(stream, "stdout"), response.read(size)
+        finally:
+            connection.close()
+
+    def bulk(
+        self, func: Callable[[str], Any], names: List[str], max_workers: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Runs an operation on many containers concurrently. Failures are
+        returned as the exception instead of stopping the other operations.
+        """
+
+        def run(name: str) -> Any:
+            try:
+                return func(name)
+            except Exception as e:
+                return e
+
+        if not names:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+            return dict(zip(names, pool.map(run, names)))
+
+    def stop_containers(self, names: List[str], timeout: int = 10) -> Dict[str, Any]:
+        return self.bulk(lambda n: self.stop_container(n, timeout), names)
+
+    def remove_containers(
+        self, names: List[str], force: bool = False
+    ) -> Dict[str, Any]:
+        return self.bulk(lambda n: self.remove_container(n, force), names)
+
+
+def get_docker_client() -> DockerClient:
+    """
+    Returns a client for the local docker socket, or None when docker is
+    only reachable through the CLI (tcp hosts, contexts or no socket).
+    """
+    socket_path: str = get_socket_path()
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    if os.environ.get("DOCKER_CONTEXT"):
+        return None
+    return DockerClient(socket_path)
@@ -3,6 +3,9 @@
 
 import requests
 import re
+from typing import List
+
+from xrpld_netgen.utils.cache import cached_bytes
 
 
 def get_commit_hash_from_server_version(server: str, version: str) -> str:
@@ -61,3 +64,60 @@ def download_file_at_commit_or_tag(
 
     # Return the content of the file
     return response.content
+
+
+def download_file_at_commit(
+    owner: str,
+    repo: str,
+    commit_hash: str,
+    file_path: str,
+    fallback_file_path: str = None,
+) -> bytes:
+    """
+    Download a file at a commit hash, cached on disk by commit.
+    Only use with commit hashes, tags and branches can move.
+
+    :param owner: The owner of the repository (username or organization)
+    :param repo: The name of the repository
+    :param commit_hash: The commit hash
+    :param file_path: The path to the file in the repository
+    :return: The content of the file
+    """
+    return cached_bytes(
+        "features",
+        f"{owner}/{repo}/{commit_hash}/{file_path}",
+        lambda: download_file_at_commit_or_tag(
+            owner, repo, commit_hash, file_path, fallback_file_path
+        ),
+    )
+
+
+def list_server_versions(server: str) -> List[str]:
+    """
+    List the build versions published on a build server.
+
+    :param server: The build server url
+    :return: The versions ordered by build number (oldest first)
+    """
+    response = requests.get(server)
+    response.raise_for_status()
+    # e.g. 2025.7.9-release+1951, also linked as 2025.7.9-release+1951.releaseinfo
+    versions = set(re.findall(r"\d{4}\.\d+\.\d+-[\w-]+\+\d+", response.text))
+    return sorted(versions, key=lambda v: int(v.rsplit("+", 1)[1]))
+
+
+def get_commit_hash_from_ref(owner: str, repo: str, ref: str) -> str:
+    """
+    Resolve a tag or branch of a GitHub repository to its commit hash.
+
+    :param owner: The owner of the repository (username or organization)
+    :param repo: The name of the repository
+    :param ref: The tag, branch or commit hash
+    :return: The commit hash
+    """
+    response = requests.get(
+        f"https://api.github.com/repos/{owner}/{repo}/commits/{ref}",
+        headers={"Accept": "application/vnd.github.sha"},
+    )
+    response.raise_for_status()
+    return response.text.strip()
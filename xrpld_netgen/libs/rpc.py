@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import time
+import requests
+from typing import Dict, Any, List
+
+
+def rpc_request(
+    port: int,
+    method: str,
+    params: Dict[str, Any] = None,
+    host: str = "localhost",
+    timeout: float = 5,
+    session: requests.Session = None,
+) -> Dict[str, Any]:
+    """
+    Send a JSON-RPC request to the admin port of a node.
+
+    :param port: The admin rpc port of the node
+    :param method: The rpc method
+    :param params: The rpc params
+    :param host: The host of the node
+    :param timeout: The request timeout in seconds
+    :param session: A session to reuse the connection to the node
+    :return: The result of the rpc request
+    """
+    response = (session or requests).post(
+        f"http://{host}:{port}",
+        json={"method": method, "params": [params or {}]},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response.json()["result"]
+
+
+def get_server_info(
+    port: int, host: str = "localhost", session: requests.Session = None
+) -> Dict[str, Any]:
+    """
+    Get the server info of a node.
+
+    :param port: The admin rpc port of the node
+    :param host: The host of the node
+    :param session: A session to reuse the connection to the node
+    :return: The info object of the server_info response
+    """
+    return rpc_request(port, "server_info", host=host, session=session)["info"]
+
+
+def wait_for_server_state(
+    port: int,
+    states: List[str],
+    timeout: float = 600,
+    interval: float = 2,
+    host: str = "localhost",
+) -> str:
+    """
+    Poll the server state of a node until it reaches one of the given states.
+
+    :param port: The admin rpc port of the node
+    :param states: The accepted server states (e.g. full, proposing)
+    :param timeout: The maximum time to wait in seconds
+    :param interval: The time between polls in seconds
+    :param host: The host of the node
+    :return: The reached server state, or None if the timeout expired
+    """
+    deadline: float = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            state: str = get_server_info(port, host)["server_state"]
+            if state in states:
+                return state
+        except Exception:
+            # the node is still starting and not accepting connections yet
+            pass
+        time.sleep(interval)
+    return None
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Static validator list server. Only uses the standard library, the vl
+# container runs this file with a stock python image.
+
+import os
+import json
+import asyncio
+import argparse
+from typing import Dict, Tuple
+
+REASONS: Dict[int, str] = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+
+class VLServer:
+    """
+    Serves the files of a directory over http. A file is read again when its
+    inode or mtime changes, so a list replaced with os.replace is served from
+    the next request on, without a restart.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._cache: Dict[str, Tuple[Tuple[int, int], bytes]] = {}
+
+    def read(self, path: str) -> bytes:
+        """
+        Returns the content of a file below the root, or None.
+        """
+        full_path: str = os.path.abspath(os.path.join(self.root, path.lstrip("/")))
+        if not full_path.startswith(self.root + os.sep):
+            return None
+        if os.path.isdir(full_path):
+            # e.g. /versions/ lists the stored lists
+            names = sorted(n for n in os.listdir(full_path) if not n.startswith("."))
+            return json.dumps(names).encode()
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+        key: Tuple[int, int] = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._cache.get(full_path)
+        if cached and cached[0] == key:
+            return cached[1]
+        with open(full_path, "rb") as f:
+            data: bytes = f.read()
+        self._cache[full_path] = (key, data)
+        return data
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            # keep-alive, validators poll the list on one connection
+            while True:
+                request_line: bytes = await reader.readline()
+                if not request_line:
+                    return
+                headers: Dict[str, str] = {}
+                while True:
+                    line: bytes = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                if int(headers.get("content-length") or 0):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    status, body = 400, b""
+                elif parts[0] not in ("GET", "HEAD"):
+                    status, body = 405, b""
+                else:
+                    body = self.read(parts[1].split("?")[0])
+                    status = 200 if body is not None else 404
+                    body = body or b""
+                close: bool = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        "Cache-Control: no-store\r\n"
+                        f"Connection: {'close' if close else 'keep-alive'}\r\n"
+                        "\r\n"
+                    ).encode()
+                    + (body if parts[:1] != ["HEAD"] else b"")
+                )
+                await writer.drain()
+                if close:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def serve(root: str, host: str = "0.0.0.0", port: int = 80) -> None:
+    server: asyncio.AbstractServer = await VLServer(root).start(host, port)
+    print(f"Serving {root} at http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves signed validator lists.")
+    parser.add_argument("--root", default=".", help="The directory to serve")
+    parser.add_argument("--host", default="0.0.0.0", help="The address to bind")
+    parser.add_argument("--port", type=int, default=80, help="The port to bind")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.root, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,10 @@
 
 import re
 import os
-from typing import Dict, Any, List  # noqa: F401
+import fnmatch
+from typing import Dict, Any, List, Callable, Set  # noqa: F401
 
-from xrpld_netgen.utils.misc import read_json
+from xrpld_netgen.utils.misc import read_template
 import hashlib
 
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -58,13 +59,168 @@ def parse_amendments(lines: Any):
     }
 
 
+# XRPL_FEATURE(Name, Supported::yes, VoteBehavior::DefaultNo) in features.macro
+# REGISTER_FIX (fixName, Supported::yes, VoteBehavior::DefaultYes); in Feature.cpp
+AMENDMENT_PATTERN = re.compile(
+    r"^\s*(XRPL_FEATURE|XRPL_FIX|REGISTER_FEATURE|REGISTER_FIX)\s*\(\s*(\w+)\s*,"
+    r"\s*Supported::(\w+)\s*,\s*(?:VoteBehavior|DefaultVote)::(\w+)"
+)
+# XRPL_RETIRE(fix1201), XRPL_RETIRE_FEATURE(MultiSign), XRPL_RETIRE_FIX(1201)
+# or retireFeature("MultiSign") in Feature.cpp
+RETIRED_PATTERN = re.compile(
+    r"^\s*(XRPL_RETIRE(?:_FEATURE|_FIX)?)\s*\(\s*(\w+)\s*\)"
+    r"|retireFeature\(\s*\"(\w+)\"\s*\)"
+)
+
+
+def get_amendment_hash(amendment: str) -> str:
+    # amendment ids are the sha512 half of the name, hashes pass through
+    if re.fullmatch(r"[0-9A-Fa-f]{64}", amendment):
+        return amendment.upper()
+    return hashlib.sha512(amendment.encode("utf-8")).digest().hex().upper()[:64]
+
+
+def parse_amendment_table(lines: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Parses every amendment of a features.macro or Feature.cpp, including
+    unsupported and retired ones, in source order.
+
+    :param lines: The lines of the feature file
+    :return: The amendments by name with their hash, supported,
+        default_vote, obsolete and retired flags
+    """
+    table: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        match = AMENDMENT_PATTERN.match(line)
+        if match:
+            macro, name, supported, vote = match.groups()
+            if macro == "XRPL_FIX":
+                name = f"fix{name}"
+            table[name] = {
+                "hash": get_amendment_hash(name),
+                "supported": supported.lower() == "yes",
+                "default_vote": vote.lower() in ("defaultyes", "yes"),
+                "obsolete": vote.lower() == "obsolete",
+                "retired": False,
+            }
+            continue
+        match = RETIRED_PATTERN.search(line)
+        if match:
+            macro, name, retired_name = match.groups()
+            if macro == "XRPL_RETIRE_FIX":
+                name = f"fix{name}"
+            name = retired_name or name
+            # retired amendments are enabled everywhere and always supported
+            table[name] = {
+                "hash": get_amendment_hash(name),
+                "supported": True,
+                "default_vote": False,
+                "obsolete": False,
+                "retired": True,
+            }
+    return table
+
+
+def get_votable_amendments(table: Dict[str, Dict[str, Any]]) -> List[str]:
+    return [
+        name
+        for name, amendment in table.items()
+        if amendment["supported"] and not amendment["retired"]
+    ]
+
+
+def select_amendments(
+    table: Dict[str, Dict[str, Any]],
+    expression: str,
+    load_table: Callable[[str], Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, str]:
+    """
+    Selects the genesis amendments of a table with a comma separated
+    expression, applied from left to right:
+
+    - `all` / `none`: every supported amendment / no amendment
+    - `Name` or a glob like `fix*`: the matching amendments
+    - `asof:VERSION`: the amendments supported by that version
+    - `since:VERSION`: the amendments added after that version
+    - `-TERM`: removes the amendments of the term
+
+    An expression starting with a removal starts from `all`.
+
+    :param table: The amendment table of the network version
+    :param expression: The selection expression
+    :param load_table: Returns the amendment table of another version
+    :return: The selected amendments by name with their hash
+    """
+    candidates: List[str] = get_votable_amendments(table)
+    terms: List[str] = [t.strip() for t in expression.split(",") if t.strip()]
+    selected: Set[str] = set(candidates) if terms and terms[0][0] in "-!" else set()
+
+    for term in terms:
+        remove: bool = term[0] in "-!"
+        term = term[1:] if remove else term
+        if term == "all":
+            matches: Set[str] = set(candidates)
+        elif term == "none":
+            matches = set(candidates)
+            remove = True
+        elif term.startswith(("asof:", "since:")):
+            if not load_table:
+                raise ValueError(f"Cannot resolve {term} without other versions")
+            kind, _, version = term.partition(":")
+            other: Dict[str, Dict[str, Any]] = load_table(version)
+            if kind == "asof":
+                matches = set(candidates) & set(get_votable_amendments(other))
+            else:
+                matches = set(candidates) - set(other)
+        else:
+            matches = set(fnmatch.filter(candidates, term))
+            if not matches and not any(c in term for c in "*?["):
+                raise ValueError(f"Unknown amendment: {term}")
+        selected = selected - matches if remove else selected | matches
+
+    return {name: table[name]["hash"] for name in candidates if name in selected}
+
+
+def diff_amendment_tables(
+    old: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]]
+) -> Dict[str, List[Any]]:
+    """
+    Compares the amendment tables of two versions.
+
+    :return: The added, removed and newly retired amendment names and the
+        default vote changes as {name, old, new} in source order
+    """
+    diff: Dict[str, List[Any]] = {
+        "added": [n for n in new if n not in old],
+        "removed": [n for n in old if n not in new],
+        "retired": [
+            n
+            for n in new
+            if n in old and new[n]["retired"] and not old[n]["retired"]
+        ],
+        "default_vote": [],
+    }
+    for name, amendment in new.items():
+        if name not in old or amendment["retired"] or old[name]["retired"]:
+            continue
+        if amendment["default_vote"] != old[name]["default_vote"]:
+            diff["default_vote"].append(
+                {
+                    "name": name,
+                    "old": old[name]["default_vote"],
+                    "new": amendment["default_vote"],
+                }
+            )
+    return diff
+
+
 def convert_to_list_of_hashes(features):
     return list(features.values())
 
 
 def update_amendments(features: Dict[str, Any], xrpl_protocol: str):
     # load the json string into a dictionary
-    json_dict = read_json(f"{parentdir}/genesis.{xrpl_protocol}.json")
+    json_dict = read_template(f"{parentdir}/genesis.{xrpl_protocol}.json")
 
     new_amendments: List[str] = convert_to_list_of_hashes(features)
 
@@ -18,13 +18,14 @@ from xrpld_netgen.utils.deploy_kit import (
 from xrpld_netgen.libs.github import (
     get_commit_hash_from_server_version,
     download_file_at_commit_or_tag,
+    download_file_at_commit,
 )
 from xrpld_netgen.utils.misc import (
     generate_ports,
     save_local_config,
     bcolors,
     write_file,
-    read_json,
+    read_template,
     get_node_db_path,
     get_relational_db,
 )
@@ -41,13 +42,11 @@ package_dir = os.path.abspath(os.path.dirname(__file__))
 # Use workspace directory for deployments
 workspace_dir = os.path.join(os.path.dirname(__file__), "..", "workspace")
 basedir = os.path.abspath(workspace_dir)
-# Create workspace directory if it doesn't exist
-os.makedirs(basedir, exist_ok=True)
 
 
 def generate_validator_config(protocol: str, network: str) -> str:
     try:
-        config = read_json(f"{package_dir}/deploykit/config.json")
+        config = read_template(f"{package_dir}/deploykit/config.json")
         return config[protocol][network]
     except Exception as e:
         print(e)
@@ -57,398 +56,477 @@ def generate_validator_config(protocol: str, network: str) -> str:
 deploykit_path: str = ""
 
 
-services: Dict[str, Dict] = {}
-
-
-def create_xrpl_standalone_folder(
-    binary: bool,
-    name: str,
-    image: str,
-    feature_content: str,
-    network_id: int,
-    vl_key: str,
-    ivl_key: str,
-    protocol: str,
-    net_type: str,
-    log_level: str = "trace",
-    nodedb_type: str = "NuDB",
-):
-    cfg_path = f"{basedir}/{protocol}-{name}/config"
-    rpc_public, rpc_admin, ws_public, ws_admin, peer = generate_ports(0, "standalone")
-    vl_config: Dict[str, Any] = generate_validator_config(protocol, net_type)
-
-    if network_id:
-        vl_config["network_id"] = network_id
-
-    if vl_key:
-        vl_config["validator_list_keys"] = [vl_key]
-
-    if ivl_key:
-        vl_config["import_vl_keys"] = [ivl_key]
-
-    configs: List[XrpldBuild] = gen_config(
-        False,
-        protocol,
-        name,
-        vl_config["network_id"],
-        0,
-        rpc_public,
-        rpc_admin,
-        ws_public,
-        ws_admin,
-        peer,
-        "huge",
-        10000,
-        nodedb_type,
-        get_node_db_path(nodedb_type, "standalone"),
-        get_relational_db(nodedb_type),
-        "/opt/ripple/lib/db",
-        "/opt/ripple/log/debug.log",
-        log_level,
-        None,
-        [],
-        vl_config["validator_list_sites"],
-        vl_config["validator_list_keys"],
-        vl_config["import_vl_keys"] if protocol == "xahau" else [],
-        vl_config["ips"],
-        vl_config["ips_fixed"],
-    )
-    os.makedirs(f"{basedir}/{protocol}-{name}/config", exist_ok=True)
-    save_local_config(protocol, cfg_path, configs[0].data, configs[1].data)
-    print(f"✅ {bcolors.CYAN}Creating config")
-
-    features_json: Dict[str, Any] = parse_amendments(feature_content)
-    print(json.dumps(features_json, indent=4))
-    genesis_json: Any = update_amendments(features_json, protocol)
-    write_file(
-        f"{basedir}/{protocol}-{name}/genesis.json",
-        json.dumps(genesis_json, indent=4, sort_keys=True),
-    )
-    print(f"✅ {bcolors.CYAN}Updating features")
-
-    dockerfile: str = create_dockerfile(
-        protocol,
-        False,
-        binary,
-        name,
-        image,
-        rpc_public,
-        rpc_admin,
-        ws_public,
-        ws_admin,
-        peer,
-        True,
-        "",
-        "-a",
-    )
-    with open(f"{basedir}/{protocol}-{name}/Dockerfile", "w") as file:
-        file.write(dockerfile)
+class StandaloneBuilder:
+    """
+    Builds standalone nodes into a workspace, keeping the services of the
+    node on the builder instead of the module.
+    """
+
+    def __init__(self, workspace: str = None):
+        self.basedir = workspace or basedir
+        self.services: Dict[str, Dict] = {}
+
+    def create_xrpl_standalone_folder(
+        self,
+        binary: bool,
+        name: str,
+        image: str,
+        feature_content: str,
+        network_id: int,
+        vl_key: str,
+        ivl_key: str,
+        protocol: str,
+        net_type: str,
+        log_level: str = "trace",
+        nodedb_type: str = "NuDB",
+    ):
+        cfg_path = f"{self.basedir}/{protocol}-{name}/config"
+        rpc_public, rpc_admin, ws_public, ws_admin, peer = generate_ports(
+            0, "standalone"
+        )
+        vl_config: Dict[str, Any] = generate_validator_config(protocol, net_type)
+
+        if network_id:
+            vl_config["network_id"] = network_id
+
+        if vl_key:
+            vl_config["validator_list_keys"] = [vl_key]
+
+        if ivl_key:
+            vl_config["import_vl_keys"] = [ivl_key]
+
+        configs: List[XrpldBuild] = gen_config(
+            False,
+            protocol,
+            name,
+            vl_config["network_id"],
+            0,
+            rpc_public,
+            rpc_admin,
+            ws_public,
+            ws_admin,
+            peer,
+            "huge",
+            10000,
+            nodedb_type,
+            get_node_db_path(nodedb_type, "standalone"),
+            get_relational_db(nodedb_type),
+            "/opt/ripple/lib/db",
+            "/opt/ripple/log/debug.log",
+            log_level,
+            None,
+            [],
+            vl_config["validator_list_sites"],
+            vl_config["validator_list_keys"],
+            vl_config["import_vl_keys"] if protocol == "xahau" else [],
+            vl_config["ips"],
+            vl_config["ips_fixed"],
+        )
+        os.makedirs(f"{self.basedir}/{protocol}-{name}/config", exist_ok=True)
+        save_local_config(protocol, cfg_path, configs[0].data, configs[1].data)
+        print(f"✅ {bcolors.CYAN}Creating config")
+
+        features_json: Dict[str, Any] = parse_amendments(feature_content)
+        print(json.dumps(features_json, indent=4))
+        genesis_json: Any = update_amendments(features_json, protocol)
+        write_file(
+            f"{self.basedir}/{protocol}-{name}/genesis.json",
+            json.dumps(genesis_json, indent=4, sort_keys=True),
+        )
+        print(f"✅ {bcolors.CYAN}Updating features")
+
+        dockerfile: str = create_dockerfile(
+            protocol,
+            False,
+            binary,
+            name,
+            image,
+            rpc_public,
+            rpc_admin,
+            ws_public,
+            ws_admin,
+            peer,
+            True,
+            "",
+            "-a",
+        )
+        with open(f"{self.basedir}/{protocol}-{name}/Dockerfile", "w") as file:
+            file.write(dockerfile)
 
-    shutil.copyfile(
-        f"{package_dir}/deploykit/{protocol}.entrypoint",
-        f"{basedir}/{protocol}-{name}/entrypoint",
-    )
-    print(f"✅ {bcolors.CYAN}Building docker container...")
-    pwd_str: str = "${PWD}"
-    services[f"{protocol}"] = {
-        "build": {
-            "context": ".",
-            "dockerfile": "Dockerfile",
-        },
-        "platform": "linux/x86_64",
-        "container_name": f"{protocol}",
-        "ports": [
-            f"{rpc_public}:{rpc_public}",
-            f"{rpc_admin}:{rpc_admin}",
-            f"{ws_public}:{ws_public}",
-            f"{ws_admin}:{ws_admin}",
-            f"{peer}:{peer}",
-        ],
-        "volumes": [
-            f"{pwd_str}/{protocol}/config:/etc/opt/ripple",
-            f"{pwd_str}/{protocol}/log:/opt/ripple/log",
-            f"{pwd_str}/{protocol}/lib:/opt/ripple/lib",
-        ],
-        "networks": ["standalone-network"],
-    }
-
-
-def create_standalone_image(
-    log_level: str,
-    public_key: str,
-    import_key: str,
-    protocol: str,
-    net_type: str,
-    network_id: int,
-    build_system: str,
-    build_name: str,
-    add_ipfs: bool = False,
-    nodedb_type: str = "NuDB",
-) -> None:
-    name: str = build_name
-    os.makedirs(f"{basedir}/{protocol}-{name}", exist_ok=True)
-    owner = "XRPLF"
-    repo = "rippled"
-    content_bytes = download_file_at_commit_or_tag(
-        owner, repo, build_name, "include/xrpl/protocol/detail/features.macro"
-    )
-    content = get_feature_lines_from_content(content_bytes)
-    image: str = f"{build_system}/xrpld:{build_name}"
-    create_xrpl_standalone_folder(
-        False,
-        name,
-        image,
-        content,
-        network_id,
-        public_key,
-        import_key,
-        protocol,
-        net_type,
-        log_level,
-        nodedb_type,
-    )
-    services["explorer"] = {
-        "image": "transia/explorer:latest",
-        "container_name": "explorer",
-        "environment": [
-            "PORT=4000",
-            f"VUE_APP_WSS_ENDPOINT=ws://0.0.0.0:{6006}",
-        ],
-        "ports": ["4000:4000"],
-        "networks": ["standalone-network"],
-    }
-
-    if add_ipfs:
+        shutil.copyfile(
+            f"{package_dir}/deploykit/{protocol}.entrypoint",
+            f"{self.basedir}/{protocol}-{name}/entrypoint",
+        )
+        print(f"✅ {bcolors.CYAN}Building docker container...")
         pwd_str: str = "${PWD}"
-        services["ipfs"] = {
-            "image": "ipfs/go-ipfs:latest",
-            "container_name": "ipfs",
-            "environment": [
-                "IPFS_PROFILE=server",
+        self.services[f"{protocol}"] = {
+            "build": {
+                "context": ".",
+                "dockerfile": "Dockerfile",
+            },
+            "platform": "linux/x86_64",
+            "container_name": f"{protocol}",
+            "ports": [
+                f"{rpc_public}:{rpc_public}",
+                f"{rpc_admin}:{rpc_admin}",
+                f"{ws_public}:{ws_public}",
+                f"{ws_admin}:{ws_admin}",
+                f"{peer}:{peer}",
             ],
-            "ports": ["4001:4001", "5001:5001", "8080:8080"],
             "volumes": [
-                f"{pwd_str}/{protocol}/ipfs_staging:/export",
-                f"{pwd_str}/{protocol}/ipfs_data:/data/ipfs",
+                f"{pwd_str}/{protocol}/config:/etc/opt/ripple",
+                f"{pwd_str}/{protocol}/log:/opt/ripple/log",
+                f"{pwd_str}/{protocol}/lib:/opt/ripple/lib",
             ],
             "networks": ["standalone-network"],
         }
 
-    compose = {
-        "version": "3.9",
-        "services": services,
-        "networks": {"standalone-network": {"driver": "bridge"}},
-    }
+    def create_xahau_standalone_folder(
+        self,
+        binary: bool,
+        name: str,
+        image: str,
+        feature_content: str,
+        network_id: int,
+        vl_key: str,
+        ivl_key: str,
+        protocol: str,
+        net_type: str,
+        log_level: str = "trace",
+        nodedb_type: str = "NuDB",
+    ):
+        cfg_path = f"{self.basedir}/{protocol}-{name}/config"
+        rpc_public, rpc_admin, ws_public, ws_admin, peer = generate_ports(
+            0, "standalone"
+        )
+        vl_config: Dict[str, Any] = generate_validator_config(protocol, net_type)
+
+        if network_id:
+            vl_config["network_id"] = network_id
+
+        if vl_key:
+            vl_config["validator_list_keys"] = [vl_key]
+
+        if ivl_key:
+            vl_config["import_vl_keys"] = [ivl_key]
+
+        configs: List[XrpldBuild] = gen_config(
+            False,
+            protocol,
+            name,
+            vl_config["network_id"],
+            0,
+            rpc_public,
+            rpc_admin,
+            ws_public,
+            ws_admin,
+            peer,
+            "huge",
+            10000,
+            nodedb_type,
+            get_node_db_path(nodedb_type, "standalone"),
+            get_relational_db(nodedb_type),
+            "/opt/ripple/lib/db",
+            "/opt/ripple/log/debug.log",
+            log_level,
+            None,
+            [],
+            vl_config["validator_list_sites"],
+            vl_config["validator_list_keys"],
+            vl_config["import_vl_keys"] if protocol == "xahau" else [],
+            vl_config["ips"],
+            vl_config["ips_fixed"],
+        )
+        os.makedirs(f"{self.basedir}/{protocol}-{name}/config", exist_ok=True)
+        save_local_config(protocol, cfg_path, configs[0].data, configs[1].data)
+        print(f"✅ {bcolors.CYAN}Creating config")
+
+        features_json: Dict[str, Any] = parse_amendments(feature_content)
+        genesis_json: Any = update_amendments(features_json, protocol)
+        write_file(
+            f"{self.basedir}/{protocol}-{name}/genesis.json",
+            json.dumps(genesis_json, indent=4, sort_keys=True),
+        )
+        print(f"✅ {bcolors.CYAN}Updating features")
+        # for k, v in features_json.items():
+        #     print(f"{bcolors.GREEN}feature: {bcolors.BLUE}{k}")
+
+        dockerfile: str = create_dockerfile(
+            protocol,
+            False,
+            binary,
+            name,
+            image,
+            rpc_public,
+            rpc_admin,
+            ws_public,
+            ws_admin,
+            peer,
+            True,
+            "",
+            "-a",
+        )
+        with open(f"{self.basedir}/{protocol}-{name}/Dockerfile", "w") as file:
+            file.write(dockerfile)
 
-    with open(f"{basedir}/{protocol}-{name}/docker-compose.yml", "w") as f:
-        yaml.dump(compose, f, default_flow_style=False)
+        shutil.copyfile(
+            f"{package_dir}/deploykit/{protocol}.entrypoint",
+            f"{self.basedir}/{protocol}-{name}/entrypoint",
+        )
+        print(f"✅ {bcolors.CYAN}Building docker container...")
+        pwd_str: str = "${PWD}"
+        self.services[f"{protocol}"] = {
+            "build": {
+                "context": ".",
+                "dockerfile": "Dockerfile",
+            },
+            "platform": "linux/x86_64",
+            "container_name": f"{protocol}",
+            "ports": [
+                f"{rpc_public}:{rpc_public}",
+                f"{rpc_admin}:{rpc_admin}",
+                f"{ws_public}:{ws_public}",
+                f"{ws_admin}:{ws_admin}",
+                f"{peer}:{peer}",
+            ],
+            "volumes": [
+                f"{pwd_str}/{protocol}/config:/etc/opt/ripple",
+                f"{pwd_str}/{protocol}/log:/opt/ripple/log",
+                f"{pwd_str}/{protocol}/lib:/opt/ripple/lib",
+            ],
+            "networks": ["standalone-network"],
+        }
 
-    write_file(
-        f"{basedir}/{protocol}-{name}/start.sh",
-        build_start_sh(basedir, protocol, name),  # noqa: E501
-    )
-    os.chmod(f"{basedir}/{protocol}-{name}/start.sh", 0o755)
-    stop_sh_content: str = build_stop_sh(basedir, protocol, name, 0, 0, True)
-    write_file(f"{basedir}/{protocol}-{name}/stop.sh", stop_sh_content)
-    os.chmod(f"{basedir}/{protocol}-{name}/stop.sh", 0o755)
+    def write_compose(self, protocol: str, name: str, add_ipfs: bool) -> None:
+        """
+        Adds the explorer (and ipfs) to the services of the node and writes
+        the compose file with the start and stop scripts.
+        """
+        node_dir: str = f"{self.basedir}/{protocol}-{name}"
+        self.services["explorer"] = {
+            "image": "transia/explorer:latest",
+            "container_name": "explorer",
+            "environment": [
+                "PORT=4000",
+                f"VUE_APP_WSS_ENDPOINT=ws://0.0.0.0:{6006}",
+            ],
+            "ports": ["4000:4000"],
+            "networks": ["standalone-network"],
+        }
 
+        if add_ipfs:
+            pwd_str: str = "${PWD}"
+            self.services["ipfs"] = {
+                "image": "ipfs/go-ipfs:latest",
+                "container_name": "ipfs",
+                "environment": [
+                    "IPFS_PROFILE=server",
+                ],
+                "ports": ["4001:4001", "5001:5001", "8080:8080"],
+                "volumes": [
+                    f"{pwd_str}/{protocol}/ipfs_staging:/export",
+                    f"{pwd_str}/{protocol}/ipfs_data:/data/ipfs",
+                ],
+                "networks": ["standalone-network"],
+            }
+
+        compose = {
+            "version": "3.9",
+            "services": self.services,
+            "networks": {"standalone-network": {"driver": "bridge"}},
+        }
 
-def create_xahau_standalone_folder(
-    binary: bool,
-    name: str,
-    image: str,
-    feature_content: str,
-    network_id: int,
-    vl_key: str,
-    ivl_key: str,
-    protocol: str,
-    net_type: str,
-    log_level: str = "trace",
-    nodedb_type: str = "NuDB",
-):
-    cfg_path = f"{basedir}/{protocol}-{name}/config"
-    rpc_public, rpc_admin, ws_public, ws_admin, peer = generate_ports(0, "standalone")
-    vl_config: Dict[str, Any] = generate_validator_config(protocol, net_type)
+        with open(f"{node_dir}/docker-compose.yml", "w") as f:
+            yaml.dump(compose, f, default_flow_style=False)
 
-    if network_id:
-        vl_config["network_id"] = network_id
+        write_file(
+            f"{node_dir}/start.sh",
+            build_start_sh(self.basedir, protocol, name),  # noqa: E501
+        )
+        os.chmod(f"{node_dir}/start.sh", 0o755)
+        stop_sh_content: str = build_stop_sh(self.basedir, protocol, name, 0, 0, True)
+        write_file(f"{node_dir}/stop.sh", stop_sh_content)
+        os.chmod(f"{node_dir}/stop.sh", 0o755)
+
+    def create_standalone_image(
+        self,
+        log_level: str,
+        public_key: str,
+        import_key: str,
+        protocol: str,
+        net_type: str,
+        network_id: int,
+        build_system: str,
+        build_name: str,
+        add_ipfs: bool = False,
+        nodedb_type: str = "NuDB",
+    ) -> None:
+        name: str = build_name
+        os.makedirs(f"{self.basedir}/{protocol}-{name}", exist_ok=True)
+        owner = "XRPLF"
+        repo = "rippled"
+        content_bytes = download_file_at_commit_or_tag(
+            owner, repo, build_name, "include/xrpl/protocol/detail/features.macro"
+        )
+        content = get_feature_lines_from_content(content_bytes)
+        image: str = f"{build_system}/xrpld:{build_name}"
+        self.create_xrpl_standalone_folder(
+            False,
+            name,
+            image,
+            content,
+            network_id,
+            public_key,
+            import_key,
+            protocol,
+            net_type,
+            log_level,
+            nodedb_type,
+        )
+        self.write_compose(protocol, name, add_ipfs)
+
+    def create_standalone_binary(
+        self,
+        log_level: str,
+        public_key: str,
+        import_key: str,
+        protocol: str,
+        net_type: str,
+        network_id: int,
+        build_server: str,
+        build_version: str,
+        add_ipfs: bool = False,
+        nodedb_type: str = "NuDB",
+    ) -> None:
+        name: str = build_version
+        os.makedirs(f"{self.basedir}/{protocol}-{name}", exist_ok=True)
+        # Usage
+        owner = "Xahau"
+        repo = "xahaud"
+        commit_hash = get_commit_hash_from_server_version(
+            build_server, build_version
+        )
+        content_bytes = download_file_at_commit(
+            owner,
+            repo,
+            commit_hash,
+            "src/ripple/protocol/impl/Feature.cpp",
+            "include/xrpl/protocol/detail/features.macro",
+        )
+        content = get_feature_lines_from_content(content_bytes)
+        url: str = f"{build_server}/{build_version}"
+        download_binary(url, f"{self.basedir}/{protocol}-{name}/{protocol}d.{name}")
+        image: str = "ubuntu:jammy"
+        self.create_xahau_standalone_folder(
+            True,
+            name,
+            image,
+            content,
+            network_id,
+            public_key,
+            import_key,
+            protocol,
+            net_type,
+            log_level,
+            nodedb_type,
+        )
+        self.write_compose(protocol, name, add_ipfs)
+
+    def start_local(
+        self,
+        log_level: str,
+        public_key: str,
+        import_key: str,
+        protocol: str,
+        net_type: str,
+        network_id: int,
+        nodedb_type: str,
+    ) -> None:
+        name: str = "local"
+        os.makedirs(f"{self.basedir}/{protocol}-{name}", exist_ok=True)
+        create_local_folder(
+            name,
+            network_id,
+            public_key,
+            import_key,
+            protocol,
+            net_type,
+            log_level,
+            nodedb_type,
+        )
+        self.services["explorer"] = {
+            "image": "transia/explorer:latest",
+            "container_name": "explorer",
+            "environment": [
+                "PORT=4000",
+                f"VUE_APP_WSS_ENDPOINT=ws://0.0.0.0:{6006}",
+            ],
+            "ports": ["4000:4000"],
+            "networks": ["standalone-network"],
+        }
 
-    if vl_key:
-        vl_config["validator_list_keys"] = [vl_key]
+        compose = {
+            "services": self.services,
+            "networks": {"standalone-network": {"driver": "bridge"}},
+        }
 
-    if ivl_key:
-        vl_config["import_vl_keys"] = [ivl_key]
+        with open("docker-compose.yml", "w") as f:
+            yaml.dump(compose, f, default_flow_style=False)
 
-    configs: List[XrpldBuild] = gen_config(
-        False,
-        protocol,
-        name,
-        vl_config["network_id"],
-        0,
-        rpc_public,
-        rpc_admin,
-        ws_public,
-        ws_admin,
-        peer,
-        "huge",
-        10000,
-        nodedb_type,
-        get_node_db_path(nodedb_type, "standalone"),
-        get_relational_db(nodedb_type),
-        "/opt/ripple/lib/db",
-        "/opt/ripple/log/debug.log",
-        log_level,
-        None,
-        [],
-        vl_config["validator_list_sites"],
-        vl_config["validator_list_keys"],
-        vl_config["import_vl_keys"] if protocol == "xahau" else [],
-        vl_config["ips"],
-        vl_config["ips_fixed"],
-    )
-    os.makedirs(f"{basedir}/{protocol}-{name}/config", exist_ok=True)
-    save_local_config(protocol, cfg_path, configs[0].data, configs[1].data)
-    print(f"✅ {bcolors.CYAN}Creating config")
+        write_file(
+            "start.sh",
+            build_local_start_sh(protocol, net_type),  # noqa: E501
+        )
+        os.chmod("start.sh", 0o755)
+        stop_sh_content: str = build_stop_sh(
+            self.basedir, protocol, name, 0, 0, False, True
+        )
+        write_file("stop.sh", stop_sh_content)
+        os.chmod("stop.sh", 0o755)
+        import sys
+        import subprocess
+
+        try:
+            result = subprocess.run(
+                ["./start.sh"],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                # stderr=subprocess.DEVNULL,
+            )
+            if result.returncode == 0:
+                print(
+                    f"{bcolors.CYAN}{protocol.capitalize()} local running at: "
+                    f"{bcolors.PURPLE}6006 {bcolors.END}"
+                )
+                print(
+                    f"{bcolors.CYAN}Explorer running / starting container"
+                    f"{bcolors.END}"
+                )
+                print(
+                    f"Listening at: {bcolors.PURPLE}http://localhost:4000"
+                    f"{bcolors.END}"
+                )
+            else:
+                print(f"{bcolors.RED}ERROR{bcolors.END}", file=sys.stderr)
+                sys.exit(1)
+        except subprocess.CalledProcessError:
+            print(
+                f"{bcolors.RED}❌ Cannot connect to the Docker daemon at docker.sock. "
+                f"Is the docker daemon running?{bcolors.END}"
+            )
+            sys.exit(1)
 
-    features_json: Dict[str, Any] = parse_amendments(feature_content)
-    genesis_json: Any = update_amendments(features_json, protocol)
-    write_file(
-        f"{basedir}/{protocol}-{name}/genesis.json",
-        json.dumps(genesis_json, indent=4, sort_keys=True),
-    )
-    print(f"✅ {bcolors.CYAN}Updating features")
-    # for k, v in features_json.items():
-    #     print(f"{bcolors.GREEN}feature: {bcolors.BLUE}{k}")
 
-    dockerfile: str = create_dockerfile(
-        protocol,
-        False,
-        binary,
-        name,
-        image,
-        rpc_public,
-        rpc_admin,
-        ws_public,
-        ws_admin,
-        peer,
-        True,
-        "",
-        "-a",
-    )
-    with open(f"{basedir}/{protocol}-{name}/Dockerfile", "w") as file:
-        file.write(dockerfile)
+def create_standalone_image(*args, **kwargs) -> None:
+    StandaloneBuilder().create_standalone_image(*args, **kwargs)
 
-    shutil.copyfile(
-        f"{package_dir}/deploykit/{protocol}.entrypoint",
-        f"{basedir}/{protocol}-{name}/entrypoint",
-    )
-    print(f"✅ {bcolors.CYAN}Building docker container...")
-    pwd_str: str = "${PWD}"
-    services[f"{protocol}"] = {
-        "build": {
-            "context": ".",
-            "dockerfile": "Dockerfile",
-        },
-        "platform": "linux/x86_64",
-        "container_name": f"{protocol}",
-        "ports": [
-            f"{rpc_public}:{rpc_public}",
-            f"{rpc_admin}:{rpc_admin}",
-            f"{ws_public}:{ws_public}",
-            f"{ws_admin}:{ws_admin}",
-            f"{peer}:{peer}",
-        ],
-        "volumes": [
-            f"{pwd_str}/{protocol}/config:/etc/opt/ripple",
-            f"{pwd_str}/{protocol}/log:/opt/ripple/log",
-            f"{pwd_str}/{protocol}/lib:/opt/ripple/lib",
-        ],
-        "networks": ["standalone-network"],
-    }
-
-
-def create_standalone_binary(
-    log_level: str,
-    public_key: str,
-    import_key: str,
-    protocol: str,
-    net_type: str,
-    network_id: int,
-    build_server: str,
-    build_version: str,
-    add_ipfs: bool = False,
-    nodedb_type: str = "NuDB",
-) -> None:
-    name: str = build_version
-    os.makedirs(f"{basedir}/{protocol}-{name}", exist_ok=True)
-    # Usage
-    owner = "Xahau"
-    repo = "xahaud"
-    commit_hash = get_commit_hash_from_server_version(build_server, build_version)
-    content_bytes = download_file_at_commit_or_tag(
-        owner, repo, commit_hash, "src/ripple/protocol/impl/Feature.cpp", "include/xrpl/protocol/detail/features.macro"
-    )
-    content = get_feature_lines_from_content(content_bytes)
-    url: str = f"{build_server}/{build_version}"
-    download_binary(url, f"{basedir}/{protocol}-{name}/{protocol}d.{name}")
-    image: str = "ubuntu:jammy"
-    create_xahau_standalone_folder(
-        True,
-        name,
-        image,
-        content,
-        network_id,
-        public_key,
-        import_key,
-        protocol,
-        net_type,
-        log_level,
-        nodedb_type,
-    )
-    services["explorer"] = {
-        "image": "transia/explorer:latest",
-        "container_name": "explorer",
-        "environment": [
-            "PORT=4000",
-            f"VUE_APP_WSS_ENDPOINT=ws://0.0.0.0:{6006}",
-        ],
-        "ports": ["4000:4000"],
-        "networks": ["standalone-network"],
-    }
-
-    if add_ipfs:
-        pwd_str: str = "${PWD}"
-        services["ipfs"] = {
-            "image": "ipfs/go-ipfs:latest",
-            "container_name": "ipfs",
-            "environment": [
-                "IPFS_PROFILE=server",
-            ],
-            "ports": ["4001:4001", "5001:5001", "8080:8080"],
-            "volumes": [
-                f"{pwd_str}/{protocol}/ipfs_staging:/export",
-                f"{pwd_str}/{protocol}/ipfs_data:/data/ipfs",
-            ],
-            "networks": ["standalone-network"],
-        }
 
-    compose = {
-        "version": "3.9",
-        "services": services,
-        "networks": {"standalone-network": {"driver": "bridge"}},
-    }
+def create_standalone_binary(*args, **kwargs) -> None:
+    StandaloneBuilder().create_standalone_binary(*args, **kwargs)
 
-    with open(f"{basedir}/{protocol}-{name}/docker-compose.yml", "w") as f:
-        yaml.dump(compose, f, default_flow_style=False)
 
-    write_file(
-        f"{basedir}/{protocol}-{name}/start.sh",
-        build_start_sh(basedir, protocol, name),  # noqa: E501
-    )
-    os.chmod(f"{basedir}/{protocol}-{name}/start.sh", 0o755)
-    stop_sh_content: str = build_stop_sh(basedir, protocol, name, 0, 0, True)
-    write_file(f"{basedir}/{protocol}-{name}/stop.sh", stop_sh_content)
-    os.chmod(f"{basedir}/{protocol}-{name}/stop.sh", 0o755)
+def start_local(*args, **kwargs) -> None:
+    StandaloneBuilder().start_local(*args, **kwargs)
 
 
 def create_local_folder(
@@ -530,79 +608,3 @@ def create_local_folder(
         json.dumps(genesis_json, indent=4, sort_keys=True),
     )
     print(f"✅ {bcolors.CYAN}Updating features")
-
-
-def start_local(
-    log_level: str,
-    public_key: str,
-    import_key: str,
-    protocol: str,
-    net_type: str,
-    network_id: int,
-    nodedb_type: str,
-) -> None:
-    name: str = "local"
-    os.makedirs(f"{basedir}/{protocol}-{name}", exist_ok=True)
-    create_local_folder(
-        name,
-        network_id,
-        public_key,
-        import_key,
-        protocol,
-        net_type,
-        log_level,
-        nodedb_type,
-    )
-    services["explorer"] = {
-        "image": "transia/explorer:latest",
-        "container_name": "explorer",
-        "environment": [
-            "PORT=4000",
-            f"VUE_APP_WSS_ENDPOINT=ws://0.0.0.0:{6006}",
-        ],
-        "ports": ["4000:4000"],
-        "networks": ["standalone-network"],
-    }
-
-    compose = {
-        "services": services,
-        "networks": {"standalone-network": {"driver": "bridge"}},
-    }
-
-    with open("docker-compose.yml", "w") as f:
-        yaml.dump(compose, f, default_flow_style=False)
-
-    write_file(
-        "start.sh",
-        build_local_start_sh(protocol, net_type),  # noqa: E501
-    )
-    os.chmod("start.sh", 0o755)
-    stop_sh_content: str = build_stop_sh(basedir, protocol, name, 0, 0, False, True)
-    write_file("stop.sh", stop_sh_content)
-    os.chmod("stop.sh", 0o755)
-    import sys
-    import subprocess
-
-    try:
-        result = subprocess.run(
-            ["./start.sh"],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            # stderr=subprocess.DEVNULL,
-        )
-        if result.returncode == 0:
-            print(
-                f"{bcolors.CYAN}{protocol.capitalize()} local running at: "
-                f"{bcolors.PURPLE}6006 {bcolors.END}"
-            )
-            print(f"{bcolors.CYAN}Explorer running / starting container{bcolors.END}")
-            print(f"Listening at: {bcolors.PURPLE}http://localhost:4000{bcolors.END}")
-        else:
-            print(f"{bcolors.RED}ERROR{bcolors.END}", file=sys.stderr)
-            sys.exit(1)
-    except subprocess.CalledProcessError:
-        print(
-            f"{bcolors.RED}❌ Cannot connect to the Docker daemon at docker.sock. "
-            f"Is the docker daemon running?{bcolors.END}"
-        )
-        sys.exit(1)
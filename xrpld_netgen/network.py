@@ -2,11 +2,13 @@
 # coding: utf-8
 
 import os
+import math
+import time
 import yaml
 import shutil
 import json
-from typing import List, Any, Dict
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Dict, Tuple
 
 from xrpld_netgen.xrpld_cfg import gen_config, XrpldBuild
 from xrpld_netgen.utils.deploy_kit import (
@@ -16,6 +18,8 @@ from xrpld_netgen.utils.deploy_kit import (
     update_dockerfile,
     DockerVars,
     create_ansible_vars_file,
+    build_ansible_cfg,
+    build_rolling_playbook,
     build_network_stop_sh,
     build_network_start_sh,
     build_local_network_start_sh,
@@ -24,9 +28,12 @@ from xrpld_netgen.utils.deploy_kit import (
 from xrpld_netgen.libs.github import (
     get_commit_hash_from_server_version,
     download_file_at_commit_or_tag,
+    download_file_at_commit,
 )
 from xrpld_netgen.utils.misc import (
     run_command,
+    run_commands,
+    COMMAND_TIMEOUT,
     generate_ports,
     save_local_config,
     get_node_port,
@@ -35,83 +42,67 @@ from xrpld_netgen.utils.misc import (
     remove_directory,
     bcolors,
     write_file,
-    read_json,
+    read_template,
     get_node_db_path,
     get_relational_db,
+    parse_node_name,
+    list_cluster_nodes,
+    assign_node_versions,
+    working_directory,
+    get_working_directory,
 )
+from xrpld_netgen.libs.rpc import wait_for_server_state
 
 from xrpld_netgen.libs.xrpld import (
     update_amendments,
     parse_amendments,
     get_feature_lines_from_content,
     get_feature_lines_from_path,
+    parse_amendment_table,
+    select_amendments,
 )
+from xrpld_netgen.features import get_amendment_table
+from xrpld_netgen.bundle import create_bundles
+from xrpld_netgen.unl import build_vl_service, ValidatorListManager
 
-from xrpld_publisher.publisher import PublisherClient
 from xrpld_publisher.validator import ValidatorClient
 
-load_dotenv()
-
 # Package directory for static resources (genesis files, default features, etc.)
 package_dir = os.path.abspath(os.path.dirname(__file__))
 # Create network files in workspace relative to where the command is run
 basedir = os.path.abspath(os.path.join(os.getcwd(), "workspace"))
-# Create workspace directory if it doesn't exist
-os.makedirs(basedir, exist_ok=True)
 
 deploykit_path: str = ""
 
+# Server states of a node that is synced with the network
+SYNCED_STATES: List[str] = ["full", "validating", "proposing"]
+# Registries (namespaces) the ansible cluster image is pushed to
+CLUSTER_REGISTRIES: List[str] = ["transia"]
+# Seconds a docker build may take before it is terminated
+BUILD_TIMEOUT: int = 1800
+
 
 def generate_validator_config(protocol: str, network: str):
     try:
-        config = read_json(f"{package_dir}/deploykit/config.json")
+        config = read_template(f"{package_dir}/deploykit/config.json")
         return config[protocol][network]
     except Exception as e:
         print(e)
         return None
 
 
-services: Dict[str, Dict] = {}
-
-
-def create_node_folders(
-    binary: bool,
-    name: str,
-    image: str,
-    feature_content: str,
-    num_validators: int,
-    num_peers: int,
-    network_id: int,
-    enable_all: bool,
-    quorum: int,
-    vl_key: str,
-    ivl_key: str,
-    protocol: str,
-    ansible: bool = False,
-    ips: List[str] = [],
-    log_level: str = "warning",
-    nodedb_type: str = "NuDB",
-):
-    # Create cluster directory and keystore inside it
-    cluster_dir = f"{basedir}/{name}-cluster"
-    os.makedirs(cluster_dir, exist_ok=True)
-
-    # Create directories for validator nodes
-    ips_fixed: List[str] = []
-    for i in range(1, num_validators + 1):
-        ips_dir = ips[i - 1] if ansible else f"vnode{i}"
-        _, _, _, _, peer = generate_ports(i, "validator")
-        ips_fixed.append(f"{ips_dir} {peer}")
+def load_validator_keys(
+    cluster_dir: str, num_validators: int
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Creates (or reuses) the keys of every validator in the cluster keystore.
 
+    Returns the manifests, public keys and tokens of the validators.
+    """
     manifests: List[str] = []
     validators: List[str] = []
     tokens: List[str] = []
-
-    # Save current directory and change to cluster directory for keystore creation
-    original_dir = os.getcwd()
-    os.chdir(cluster_dir)
-
-    try:
+    with working_directory(cluster_dir):
         for i in range(1, num_validators + 1):
             node_dir = f"vnode{i}"
             # GENERATE VALIDATOR KEY
@@ -125,220 +116,338 @@ def create_node_folders(
             else:
                 print(f"  Using existing keys for {node_dir}")
             keys = client.get_keys()
-            token = client.read_token()
-            manifest = client.read_manifest()
-            manifests.append(manifest)
+            manifests.append(client.read_manifest())
             validators.append(keys["public_key"])
-            tokens.append(token)
+            tokens.append(client.read_token())
+
+    print(f"✅ {bcolors.CYAN}Validator keys ready")
+    return manifests, validators, tokens
 
-        print(f"✅ {bcolors.CYAN}Validator keys ready")
-    finally:
-        # Change back to original directory
-        os.chdir(original_dir)
 
+def get_ips_fixed(num_validators: int, ips: List[str] = None) -> List[str]:
+    """
+    Returns the fixed peer address of every validator, by container name or
+    by host ip for ansible clusters.
+    """
+    ips_fixed: List[str] = []
     for i in range(1, num_validators + 1):
-        ips_dir = ips[i - 1] if ansible else f"vnode{i}"
-        node_dir = f"vnode{i}"
-        cfg_path = f"{basedir}/{name}-cluster/{node_dir}/config"
-        # GENERATE PORTS
-        rpc_public, rpc_admin, ws_public, ws_admin, peer = generate_ports(
-            i, "validator"
-        )
-        # GENERATE CONFIG
-        configs: List[XrpldBuild] = gen_config(
-            ansible,
-            protocol,
-            name,
-            network_id,
-            i,
-            rpc_public,
-            rpc_admin,
-            ws_public,
-            ws_admin,
-            peer,
-            "huge",
-            10000,
-            nodedb_type,
-            get_node_db_path(nodedb_type, "network"),
-            get_relational_db(nodedb_type),
-            "/opt/ripple/lib/db",
-            "/opt/ripple/log/debug.log",
-            log_level,
-            tokens[i - 1],
-            [v for v in validators if v != validators[i - 1]],
-            ["http://vl/vl.json"],
-            [vl_key],
-            [ivl_key] if ivl_key else [],
-            [],
-            [ips for ips in ips_fixed if ips != f"{ips_dir} {peer}"],
+        _, _, _, _, peer = generate_ports(i, "validator")
+        ips_fixed.append(f"{ips[i - 1] if ips else f'vnode{i}'} {peer}")
+    return ips_fixed
+
+
+def get_quorum(num_validators: int, quorum: int = None) -> int:
+    # xrpld requires 80% of the UNL when no quorum is set
+    return quorum or math.ceil(num_validators * 0.8)
+
+
+def get_network_name(protocol: str, build_server: str, build_version: str) -> str:
+    """
+    Returns the name create_network gives a network, its directory is
+    `{name}-cluster`.
+    """
+    if protocol == "xrpl" and build_server.startswith("https://github.com/"):
+        owner: str = build_server.split("https://github.com/")[1].split("/")[0]
+        # Extract branch name from URL
+        # (supports both rippled and xrpld repo names)
+        name: str = build_server.split(f"https://github.com/{owner}/")[1]
+        name = name.split("/tree/")[1] if "/tree/" in name else name
+        return name.replace("/", "-")
+    return build_version
+
+
+def get_cluster_images(image_name: str, registries: List[str] = None) -> List[str]:
+    return [
+        f"{registry}/cluster:{image_name}"
+        for registry in registries or CLUSTER_REGISTRIES
+    ]
+
+
+def build_cluster_image(cluster_dir: str, name: str, images: List[str]) -> bool:
+    # every node uses the Dockerfile of vnode1, the config is mounted
+    context_dir: str = f"{cluster_dir}/vnode1"
+    shutil.copyfile(f"{cluster_dir}/xrpld.{name}", f"{context_dir}/xrpld.{name}")
+    tags: str = " ".join(f"--tag {image}" for image in images)
+    try:
+        return run_command(
+            context_dir,
+            f"docker build -f Dockerfile --platform linux/x86_64 {tags} .",
+            timeout=BUILD_TIMEOUT,
+            prefix="build",
         )
+    finally:
+        os.remove(f"{context_dir}/xrpld.{name}")
 
-        os.makedirs(f"{basedir}/{name}-cluster/{node_dir}", exist_ok=True)
-        os.makedirs(f"{basedir}/{name}-cluster/{node_dir}/config", exist_ok=True)
-        save_local_config(protocol, cfg_path, configs[0].data, configs[1].data)
 
-        print(f"✅ {bcolors.CYAN}Created validator: {i} config")
+def push_images(cluster_dir: str, images: List[str]) -> bool:
+    # registries are independent, the layers are uploaded concurrently
+    return run_commands(
+        cluster_dir,
+        [f"docker push {image}" for image in images],
+        timeout=BUILD_TIMEOUT,
+        limit=len(images),
+    )
 
-        # For local networks, always use features from local source (matches the binary)
-        # feature_content is already a list of lines from get_feature_lines_from_path
-        if protocol in ("xahau", "xrpl"):
-            features_json: Dict[str, Any] = parse_amendments(feature_content)
 
-        # Only enable all amendments in genesis if requested
-        if not enable_all:
-            # Start with no amendments enabled (will vote for them naturally)
-            features_json = {}
+def get_ssh_settings() -> Dict[str, str]:
+    """
+    Returns the ssh settings of the remote hosts, from the environment or
+    the .env of the working directory.
+    """
+    # imported here, only ansible deployments read the .env
+    from dotenv import find_dotenv, load_dotenv
+
+    load_dotenv(find_dotenv(usecwd=True))
+    return {
+        "port": os.environ.get("SSH_PORT", 20),
+        "user": os.environ.get("SSH_USER", "ubuntu"),
+        "key": os.environ.get("SSH_PATH", "~/.ssh/id_rsa"),
+    }
 
-        genesis_json: Any = update_amendments(features_json, protocol)
-        write_file(
-            f"{basedir}/{name}-cluster/{node_dir}/genesis.json",
-            json.dumps(genesis_json, indent=4, sort_keys=True),
-        )
 
-        write_file(
-            f"{basedir}/{name}-cluster/{node_dir}/features.json",
-            json.dumps(features_json, indent=4, sort_keys=True),
-        )
+def build_docker_vars(
+    cluster_dir: str, service: Dict[str, Any], ssh_port: int, image: str
+) -> DockerVars:
+    c_name: str = service["container_name"]
+    ports: List[str] = service["ports"]
+    return DockerVars(
+        f"{cluster_dir}/{c_name}/config/",
+        ssh_port,
+        [
+            f'RPC_PUBLIC: {ports[0].split(":")[0]}',
+            f'RPC_ADMIN: {ports[1].split(":")[0]}',
+            f'WS_PUBLIC: {ports[2].split(":")[0]}',
+            f'WS_ADMIN: {ports[3].split(":")[0]}',
+            f'PEER: {ports[4].split(":")[0]}',
+        ],
+        int(ports[2].split(":")[-1]),
+        int(ports[4].split(":")[-1]),
+        image,
+        "loadnet",
+        c_name,
+        ports,
+        [
+            "/opt/ripple/config:/opt/ripple/config",
+            "/opt/ripple/log:/opt/ripple/log",
+            "/opt/ripple/lib:/opt/ripple/lib",
+            "/var/lib/xrpld/db:/var/lib/xrpld/db",
+        ],
+        [
+            "/opt/ripple/config",
+            "/opt/ripple/log",
+            "/opt/ripple/lib",
+            "/var/lib/xrpld/db",
+        ],
+    )
 
-        print(f"✅ {bcolors.CYAN}Updated validator: {i} features")
 
-        dockerfile: str = create_dockerfile(
-            protocol,
-            True,
-            binary,
-            name,
-            image,
-            rpc_public,
-            rpc_admin,
-            ws_public,
-            ws_admin,
-            peer,
-            True,
-            quorum,
-            "",
-        )
-        with open(f"{basedir}/{name}-cluster/{node_dir}/Dockerfile", "w") as file:
-            file.write(dockerfile)
+class NetworkBuilder:
+    """
+    Builds clusters into a workspace. Every builder keeps the services of its
+    own cluster, so separate builders can run in parallel in one process and
+    share the binary and feature caches.
 
-        shutil.copyfile(
-            f"{package_dir}/deploykit/network.entrypoint",
-            f"{basedir}/{name}-cluster/{node_dir}/entrypoint",
+    builder = NetworkBuilder("/tmp/workspace")
+    cluster_dir = builder.create_network("warning", "", "xahau", 3, 1, ...)
+    """
+
+    def __init__(self, workspace: str = None, workdir: str = None):
+        self.basedir = workspace or basedir
+        # directory of locally built binaries (./xrpld)
+        self.workdir = workdir or get_working_directory()
+        self.services: Dict[str, Dict] = {}
+
+    def get_cluster_dir(self, name: str) -> str:
+        cluster_dir: str = f"{self.basedir}/{name}-cluster"
+        os.makedirs(cluster_dir, exist_ok=True)
+        return cluster_dir
+
+    def create_node_folders(
+        self,
+        binary: bool,
+        name: str,
+        image: str,
+        feature_content: str,
+        num_validators: int,
+        num_peers: int,
+        network_id: int,
+        enable_all: bool,
+        quorum: int,
+        vl_key: str,
+        ivl_key: str,
+        protocol: str,
+        ansible: bool = False,
+        ips: List[str] = [],
+        log_level: str = "warning",
+        nodedb_type: str = "NuDB",
+        node_versions: Dict[str, str] = {},
+        amendment_majority_time: str = None,
+        genesis_amendments: Dict[str, str] = None,
+    ):
+        # Create cluster directory and keystore inside it
+        cluster_dir: str = self.get_cluster_dir(name)
+        # everything needed to add nodes to the cluster later
+        spec: Dict[str, Any] = {
+            "name": name,
+            "binary": binary,
+            "image": image,
+            "protocol": protocol,
+            "network_id": network_id,
+            "quorum": quorum,
+            "vl_key": vl_key,
+            "ivl_key": ivl_key,
+            "ansible": ansible,
+            "ips": ips,
+            "log_level": log_level,
+            "nodedb_type": nodedb_type,
+            "node_versions": node_versions,
+            "amendment_majority_time": amendment_majority_time,
+            "num_validators": num_validators,
+            "num_peers": num_peers,
+        }
+
+        # Create directories for validator nodes
+        ips_fixed: List[str] = get_ips_fixed(num_validators, ips if ansible else None)
+
+        manifests, validators, tokens = load_validator_keys(
+            cluster_dir, num_validators
         )
 
-        print(f"✅ {bcolors.CYAN}Built validator: {i} docker container...")
+        # For local networks, always use features from local source
+        # (matches the binary), feature_content is already a list of lines
+        # from get_feature_lines_from_path
+        features_json: Dict[str, Any] = parse_amendments(feature_content)
+        validator_features: Dict[str, Any] = features_json
+        # Only enable all amendments in genesis of validators if requested
+        if not enable_all:
+            # Start with no amendments enabled (will vote for them naturally)
+            validator_features = {}
+        # An explicit amendment selection replaces both
+        if genesis_amendments is not None:
+            features_json = validator_features = genesis_amendments
 
-        services[f"vnode{i}"] = {
-            "build": {
-                "context": f"vnode{i}",
-                "dockerfile": "Dockerfile",
-            },
-            "platform": "linux/x86_64",
-            "container_name": f"vnode{i}",
-            "ports": [
-                f"{rpc_public}:{rpc_public}",
-                f"{rpc_admin}:{rpc_admin}",
-                f"{ws_public}:{ws_public}",
-                f"{ws_admin}:{ws_admin}",
-                f"{peer}:{peer}",
-            ],
-            "volumes": [
-                f"./vnode{i}/config:/opt/ripple/config",
-                f"./vnode{i}/log:/opt/ripple/log",
-                f"./vnode{i}/lib:/opt/ripple/lib",
-            ],
-            "networks": [f"{name}-network"],
-        }
+        for i in range(1, num_validators + 1):
+            self.create_node_folder(
+                cluster_dir,
+                spec,
+                i,
+                "validator",
+                validator_features,
+                [v for v in validators if v != validators[i - 1]],
+                [ip for ip in ips_fixed if ip != ips_fixed[i - 1]],
+                tokens[i - 1],
+            )
 
-    for i in range(1, num_peers + 1):
-        node_dir = f"pnode{i}"
-        cfg_path = f"{basedir}/{name}-cluster/{node_dir}/config"
-        rpc_public, rpc_admin, ws_public, ws_admin, peer = generate_ports(i, "peer")
+        for i in range(1, num_peers + 1):
+            self.create_node_folder(
+                cluster_dir, spec, i, "peer", features_json, validators, ips_fixed
+            )
+
+        write_file(f"{cluster_dir}/cluster.json", json.dumps(spec, indent=4))
+        return manifests
+
+    def create_node_folder(
+        self,
+        cluster_dir: str,
+        spec: Dict[str, Any],
+        index: int,
+        node_type: str,
+        features_json: Dict[str, Any],
+        validators: List[str],
+        ips_fixed: List[str],
+        token: str = None,
+    ) -> None:
+        """
+        Writes the config, genesis, Dockerfile and compose service of a node.
+        """
+        name: str = spec["name"]
+        node_dir: str = f"{'vnode' if node_type == 'validator' else 'pnode'}{index}"
+        cfg_path = f"{cluster_dir}/{node_dir}/config"
+        # GENERATE PORTS
+        rpc_public, rpc_admin, ws_public, ws_admin, peer = generate_ports(
+            index, node_type
+        )
+        # GENERATE CONFIG
         configs: List[XrpldBuild] = gen_config(
-            ansible,
-            protocol,
+            spec["ansible"],
+            spec["protocol"],
             name,
-            network_id,
-            i,
+            spec["network_id"],
+            index,
             rpc_public,
             rpc_admin,
             ws_public,
             ws_admin,
             peer,
             "huge",
-            None,
-            nodedb_type,
-            get_node_db_path(nodedb_type, "network"),
-            get_relational_db(nodedb_type),
+            10000 if node_type == "validator" else None,
+            spec["nodedb_type"],
+            get_node_db_path(spec["nodedb_type"], "network"),
+            get_relational_db(spec["nodedb_type"]),
             "/opt/ripple/lib/db",
             "/opt/ripple/log/debug.log",
-            log_level,
-            None,
+            spec["log_level"],
+            token,
             validators,
             ["http://vl/vl.json"],
-            [vl_key],
-            [ivl_key] if ivl_key else [],
+            [spec["vl_key"]],
+            [spec["ivl_key"]] if spec["ivl_key"] else [],
             [],
             ips_fixed,
+            spec["amendment_majority_time"],
         )
-        # print(f'CONFIG: {configs}')
-        os.makedirs(f"{basedir}/{name}-cluster/{node_dir}", exist_ok=True)
-        os.makedirs(f"{basedir}/{name}-cluster/{node_dir}/config", exist_ok=True)
-        save_local_config(protocol, cfg_path, configs[0].data, configs[1].data)
 
-        print(f"✅ {bcolors.CYAN}Created peer: {i} config")
+        os.makedirs(f"{cluster_dir}/{node_dir}", exist_ok=True)
+        os.makedirs(f"{cluster_dir}/{node_dir}/config", exist_ok=True)
+        save_local_config(spec["protocol"], cfg_path, configs[0].data, configs[1].data)
 
-        # default features
-        features_json: Any = read_json(f"{package_dir}/default.xahau.features.json")
+        print(f"✅ {bcolors.CYAN}Created {node_type}: {index} config")
 
-        # genesis (enable all features)
-        if protocol in ("xahau", "xrpl"):
-            features_json: Dict[str, Any] = parse_amendments(feature_content)
-
-        genesis_json: Any = update_amendments(features_json, protocol)
+        genesis_json: Any = update_amendments(features_json, spec["protocol"])
         write_file(
-            f"{basedir}/{name}-cluster/{node_dir}/genesis.json",
+            f"{cluster_dir}/{node_dir}/genesis.json",
             json.dumps(genesis_json, indent=4, sort_keys=True),
         )
 
         write_file(
-            f"{basedir}/{name}-cluster/{node_dir}/features.json",
+            f"{cluster_dir}/{node_dir}/features.json",
             json.dumps(features_json, indent=4, sort_keys=True),
         )
 
-        print(f"✅ {bcolors.CYAN}Updated peer: {i} features")
+        print(f"✅ {bcolors.CYAN}Updated {node_type}: {index} features")
 
         dockerfile: str = create_dockerfile(
-            protocol,
+            spec["protocol"],
             True,
-            binary,
-            name,
-            image,
+            spec["binary"],
+            spec["node_versions"].get(node_dir, name),
+            spec["image"],
             rpc_public,
             rpc_admin,
             ws_public,
             ws_admin,
             peer,
             True,
-            quorum,
+            spec["quorum"],
             "",
         )
-        with open(f"{basedir}/{name}-cluster/{node_dir}/Dockerfile", "w") as file:
+        with open(f"{cluster_dir}/{node_dir}/Dockerfile", "w") as file:
             file.write(dockerfile)
 
         shutil.copyfile(
             f"{package_dir}/deploykit/network.entrypoint",
-            f"{basedir}/{name}-cluster/{node_dir}/entrypoint",
+            f"{cluster_dir}/{node_dir}/entrypoint",
         )
 
-        print(f"✅ {bcolors.CYAN}Built peer: {i} docker container...")
+        print(f"✅ {bcolors.CYAN}Built {node_type}: {index} docker container...")
 
-        services[f"pnode{i}"] = {
+        self.services[node_dir] = {
             "build": {
-                "context": f"pnode{i}",
+                "context": node_dir,
                 "dockerfile": "Dockerfile",
             },
             "platform": "linux/x86_64",
-            "container_name": f"pnode{i}",
+            "container_name": node_dir,
             "ports": [
                 f"{rpc_public}:{rpc_public}",
                 f"{rpc_admin}:{rpc_admin}",
@@ -346,127 +455,114 @@ def create_node_folders(
                 f"{ws_admin}:{ws_admin}",
                 f"{peer}:{peer}",
             ],
+            "environment": ["START_MODE=${START_MODE:-genesis}"],
             "volumes": [
-                f"./pnode{i}/config:/opt/ripple/config",
-                f"./pnode{i}/log:/opt/ripple/log",
-                f"./pnode{i}/lib:/opt/ripple/lib",
+                f"./{node_dir}/config:/opt/ripple/config",
+                f"./{node_dir}/log:/opt/ripple/log",
+                f"./{node_dir}/lib:/opt/ripple/lib",
+                f"./{node_dir}/lib/nudb:/var/lib/xrpld/db",
             ],
             "networks": [f"{name}-network"],
         }
 
-    return manifests
-
-
-def create_network(
-    log_level: str,
-    import_key: str,
-    protocol: str,
-    num_validators: int,
-    num_peers: int,
-    network_id: int,
-    build_server: str,
-    build_version: str,
-    genesis: bool = False,
-    quorum: int = None,
-    nodedb_type: str = "NuDB",
-) -> None:
-    if protocol == "xahau":
-        name: str = build_version
-        os.makedirs(f"{basedir}/{name}-cluster", exist_ok=True)
-        # Usage
-        owner = "Xahau"
-        repo = "xahaud"
-        commit_hash = get_commit_hash_from_server_version(build_server, build_version)
-        content_bytes = download_file_at_commit_or_tag(
-            owner, repo, commit_hash, "src/ripple/protocol/impl/Feature.cpp", "include/xrpl/protocol/detail/features.macro"
-        )
-        content = get_feature_lines_from_content(content_bytes)
-        url: str = f"{build_server}/{build_version}"
-        download_binary(url, f"{basedir}/{name}-cluster/xrpld.{build_version}")
-        image: str = "ubuntu:jammy"
-
-    if protocol == "xrpl":
-        if build_server.startswith("https://github.com/"):
-            owner: str = build_server.split("https://github.com/")[1].split("/")[0]
-            # Extract branch name from URL (supports both rippled and xrpld repo names)
-            name: str = build_server.split(f"https://github.com/{owner}/")[1]
-            name = name.split("/tree/")[1] if "/tree/" in name else name
-            name = name.replace("/", "-")
-            os.makedirs(f"{basedir}/{name}-cluster", exist_ok=True)
-            repo = "rippled"
-            copy_file("./xrpld", f"{basedir}/{name}-cluster/xrpld.{name}")
-            content_bytes = download_file_at_commit_or_tag(
+    def create_network(
+        self,
+        log_level: str,
+        import_key: str,
+        protocol: str,
+        num_validators: int,
+        num_peers: int,
+        network_id: int,
+        build_server: str,
+        build_version: str,
+        genesis: bool = False,
+        quorum: int = None,
+        nodedb_type: str = "NuDB",
+        version_map: Dict[str, int] = None,
+        amendment_majority_time: str = None,
+        amendments: str = None,
+    ) -> str:
+        """
+        Creates the docker compose cluster of a network and returns its
+        directory.
+        """
+        self.services = {}
+        node_versions: Dict[str, str] = {}
+        if version_map:
+            if protocol != "xahau":
+                raise ValueError(
+                    "Version maps need binaries from a build server (xahau)"
+                )
+            node_versions = assign_node_versions(num_validators, num_peers, version_map)
+
+        if protocol == "xahau":
+            name: str = build_version
+            cluster_dir: str = self.get_cluster_dir(name)
+            # Usage
+            owner = "Xahau"
+            repo = "xahaud"
+            commit_hash = get_commit_hash_from_server_version(
+                build_server, build_version
+            )
+            content_bytes = download_file_at_commit(
                 owner,
                 repo,
-                build_version,
+                commit_hash,
+                "src/ripple/protocol/impl/Feature.cpp",
                 "include/xrpl/protocol/detail/features.macro",
             )
             content = get_feature_lines_from_content(content_bytes)
+            url: str = f"{build_server}/{build_version}"
+            download_binary(url, f"{cluster_dir}/xrpld.{build_version}")
+            # fetch every other version of the map once, shared by its nodes
+            for version in sorted(set(node_versions.values()) - {build_version}):
+                download_binary(
+                    f"{build_server}/{version}", f"{cluster_dir}/xrpld.{version}"
+                )
             image: str = "ubuntu:jammy"
-        else:
-            name: str = build_version
-            os.makedirs(f"{basedir}/{name}-cluster", exist_ok=True)
-            owner = "XRPLF"
-            repo = "rippled"
-            content_bytes = download_file_at_commit_or_tag(
-                owner, repo, build_version, "src/libxrpl/protocol/Feature.cpp"
-            )
-            content = get_feature_lines_from_content(content_bytes)
-            image: str = f"{build_server}/{build_version}"
-
-    # Change to cluster directory for VL key creation
-    original_dir = os.getcwd()
-    os.chdir(f"{basedir}/{name}-cluster")
 
-    try:
-        client = PublisherClient()
-        vl_key_path = "keystore/vl/key.json"
-        vl_eph_path = "keystore/vl/eph.json"
-        vl_manifest_path = "keystore/vl/manifest.txt"
-
-        # Check if ALL VL files exist and are valid
-        should_regenerate = False
-        if (
-            os.path.exists(vl_key_path)
-            and os.path.exists(vl_eph_path)
-            and os.path.exists(vl_manifest_path)
-        ):
-            try:
-                # Validate that keys are compatible
-                # (not Dilithium or other incompatible formats)
-                keys = client.get_keys()
-                eph_keys = client.get_ephkeys()
-                # Check key format - standard keys should be reasonable length
-                if keys and eph_keys:
-                    pub_key_len = len(keys.get("publicKey", ""))
-                    priv_key_len = len(keys.get("privateKey", ""))
-                    # Standard secp256k1/Ed25519 keys are
-                    # typically 66-68 chars for public,
-                    # 64-66 for private
-                    # Dilithium keys are 2000+ characters
-                    if pub_key_len > 200 or priv_key_len > 200:
-                        print(
-                            "  Detected incompatible VL keys "
-                            "(possibly post-quantum), "
-                            "regenerating..."
-                        )
-                        should_regenerate = True
-                    else:
-                        print("  Using existing VL keys")
-                else:
-                    should_regenerate = True
-            except Exception:
-                print("  VL keys validation failed, regenerating...")
-                should_regenerate = True
-        else:
-            should_regenerate = True
+        if protocol == "xrpl":
+            if build_server.startswith("https://github.com/"):
+                owner: str = build_server.split("https://github.com/")[1]
+                owner = owner.split("/")[0]
+                name: str = get_network_name(protocol, build_server, build_version)
+                cluster_dir: str = self.get_cluster_dir(name)
+                repo = "rippled"
+                copy_file(f"{self.workdir}/xrpld", f"{cluster_dir}/xrpld.{name}")
+                content_bytes = download_file_at_commit_or_tag(
+                    owner,
+                    repo,
+                    build_version,
+                    "include/xrpl/protocol/detail/features.macro",
+                )
+                content = get_feature_lines_from_content(content_bytes)
+                image: str = "ubuntu:jammy"
+            else:
+                name: str = build_version
+                cluster_dir: str = self.get_cluster_dir(name)
+                owner = "XRPLF"
+                repo = "rippled"
+                content_bytes = download_file_at_commit_or_tag(
+                    owner, repo, build_version, "src/libxrpl/protocol/Feature.cpp"
+                )
+                content = get_feature_lines_from_content(content_bytes)
+                image: str = f"{build_server}/{build_version}"
+
+        genesis_amendments: Dict[str, str] = None
+        if amendments:
+            genesis_amendments = select_amendments(
+                parse_amendment_table(content),
+                amendments,
+                lambda v: get_amendment_table(protocol, v, build_server),
+            )
+            print(
+                f"{bcolors.CYAN}Genesis amendments ({len(genesis_amendments)}): "
+                f"{', '.join(genesis_amendments) or 'none'}{bcolors.END}"
+            )
 
-        if should_regenerate:
-            print("  Creating new VL keys...")
-            client.create_keys()
+        unl = ValidatorListManager(cluster_dir)
 
-        keys = client.get_keys()
-        manifests: List[str] = create_node_folders(
+        manifests: List[str] = self.create_node_folders(
             True,
             name,
             image,
@@ -476,33 +572,21 @@ def create_network(
             network_id,
             genesis,
             quorum,
-            keys["publicKey"],
+            unl.public_key,
             import_key,
             protocol,
             False,
             [],
             log_level,
             nodedb_type,
+            node_versions,
+            amendment_majority_time,
+            genesis_amendments,
         )
 
-        services["vl"] = {
-            "build": {
-                "context": "vl",
-                "dockerfile": "Dockerfile",
-            },
-            "container_name": "vl",
-            "ports": ["80:80"],
-            "networks": [f"{name}-network"],
-            "healthcheck": {
-                "test": ["CMD", "curl", "-f", "http://localhost/vl.json"],
-                "interval": "5s",
-                "timeout": "3s",
-                "retries": 3,
-                "start_period": "10s",
-            },
-        }
+        self.services["vl"] = build_vl_service(name)
 
-        services["network-explorer"] = {
+        self.services["network-explorer"] = {
             "image": "transia/explorer:latest",
             "container_name": "network-explorer",
             "environment": [
@@ -515,202 +599,117 @@ def create_network(
 
         compose = {
             "version": "3.9",
-            "services": services,
+            "services": self.services,
             "networks": {f"{name}-network": {"driver": "bridge"}},
         }
-        with open(f"{basedir}/{name}-cluster/docker-compose.yml", "w") as f:
+        with open(f"{cluster_dir}/docker-compose.yml", "w") as f:
             yaml.dump(compose, f, default_flow_style=False)
 
         write_file(
-            f"{basedir}/{name}-cluster/start.sh",
-            build_network_start_sh(name, num_validators, num_peers),  # noqa: E501
+            f"{cluster_dir}/start.sh",
+            build_network_start_sh(name, num_validators, num_peers, node_versions),
         )
         stop_sh_content: str = build_network_stop_sh(
             name,
             num_validators,
             num_peers,
+            node_versions,
         )
-        write_file(f"{basedir}/{name}-cluster/stop.sh", stop_sh_content)
-
-        os.makedirs(f"{basedir}/{name}-cluster/vl", exist_ok=True)
-        for manifest in manifests:
-            client.add_validator(manifest)
-        client.sign_unl(f"{basedir}/{name}-cluster/vl/vl.json")
-        shutil.copyfile(
-            f"{package_dir}/deploykit/nginx.dockerfile",
-            f"{basedir}/{name}-cluster/vl/Dockerfile",
-        )
-    finally:
-        # Change back to original directory
-        os.chdir(original_dir)
-
-    os.chmod(f"{basedir}/{name}-cluster/start.sh", 0o755)
-    os.chmod(f"{basedir}/{name}-cluster/stop.sh", 0o755)
-    os.chmod(f"{basedir}/{name}-cluster/xrpld.{name}", 0o755)
-
-
-def update_node_binary(
-    name: str,
-    node_id: str,
-    node_type: str,
-    build_server: str,
-    new_version: str,
-) -> None:
-    node_dir: str = f"{'v' if node_type == 'validator' else 'p'}node{node_id}"
-    run_command(f"{basedir}/{name}", f"docker-compose stop {node_dir}")
-    url: str = f"{build_server}/{new_version}"
-    download_binary(url, f"{basedir}/{name}/xrpld.{new_version}")
-    shutil.copyfile(
-        f"{basedir}/{name}/xrpld.{new_version}",
-        f"{basedir}/{name}/{node_dir}/xrpld.{new_version}",
-    )
-    # remove the db
-    run_command(f"{basedir}/{name}", f"rm -r {node_dir}/lib")
-    os.chmod(f"{basedir}/{name}/{node_dir}/xrpld.{new_version}", 0o755)
-    update_dockerfile(new_version, f"{basedir}/{name}/{node_dir}/Dockerfile")
-    run_command(
-        f"{basedir}/{name}",
-        f"docker compose up --build --force-recreate -d {node_dir}",
-    )
-
-
-def enable_node_amendment(
-    name: str,
-    amendment_name: str,
-    node_id: str,
-    node_type: str,
-) -> None:
-    amendment_hash: str = sha512_half(amendment_name.encode("utf-8").hex())
-    command: Dict[str, Any] = {
-        "method": "feature",
-        "params": [
-            {
-                "feature": amendment_hash,
-                "vetoed": False,
-            }
-        ],
-    }
-    port: int = get_node_port(int(node_id), node_type)
-    json_str: str = json.dumps(command)
-    escaped_str = json_str.replace('"', '\\"')
-    command: str = (
-        f'curl -X POST -H "Content-Type: application/json" -d "{escaped_str}" http://localhost:{port}'  # noqa: E501
-    )
-    run_command(f"{basedir}/{name}", command)
-
-
-def create_ansible(
-    log_level: str,
-    import_key: str,
-    protocol: str,
-    num_validators: int,
-    num_peers: int,
-    network_id: int,
-    build_server: str,
-    build_version: str,
-    genesis: bool = False,
-    quorum: int = None,
-    nodedb_type: str = "NuDB",
-    vips: List[str] = [],
-    pips: List[str] = [],
-) -> None:
-    if protocol == "xahau":
-        name: str = build_version
-        os.makedirs(f"{basedir}/{name}-cluster", exist_ok=True)
-        # Usage
-        owner = "Xahau"
-        repo = "xahaud"
-        commit_hash = get_commit_hash_from_server_version(build_server, build_version)
-        content_bytes = download_file_at_commit_or_tag(
-            owner, repo, commit_hash, "src/ripple/protocol/impl/Feature.cpp", "include/xrpl/protocol/detail/features.macro"
-        )
-        content = get_feature_lines_from_content(content_bytes)
-        url: str = f"{build_server}/{build_version}"
-        download_binary(url, f"{basedir}/{name}-cluster/xrpld.{build_version}")
-        image: str = "ubuntu:jammy"
+        write_file(f"{cluster_dir}/stop.sh", stop_sh_content)
 
-    if protocol == "xrpl":
-        if build_server.startswith("https://github.com/"):
-            repo: str = "rippled"
-            owner: str = build_server.split("https://github.com/")[1].split("/")[0]
-            # Extract branch name from URL (supports both rippled and xrpld repo names)
-            name: str = build_server.split(f"https://github.com/{owner}/")[1]
-            name = name.split("/tree/")[1] if "/tree/" in name else name
-            name = name.replace("/", "-")
-            os.makedirs(f"{basedir}/{name}-cluster", exist_ok=True)
-            copy_file("./xrpld", f"{basedir}/{name}-cluster/xrpld.{name}")
-            content_bytes = download_file_at_commit_or_tag(
+        unl.set_validators(manifests)
+        unl.publish()
+
+        os.chmod(f"{cluster_dir}/start.sh", 0o755)
+        os.chmod(f"{cluster_dir}/stop.sh", 0o755)
+        os.chmod(f"{cluster_dir}/xrpld.{name}", 0o755)
+        return cluster_dir
+
+    def create_ansible(
+        self,
+        log_level: str,
+        import_key: str,
+        protocol: str,
+        num_validators: int,
+        num_peers: int,
+        network_id: int,
+        build_server: str,
+        build_version: str,
+        genesis: bool = False,
+        quorum: int = None,
+        nodedb_type: str = "NuDB",
+        vips: List[str] = [],
+        pips: List[str] = [],
+        registries: List[str] = None,
+        batch_size: int = 1,
+        health_timeout: int = 600,
+        bundle: bool = False,
+        bundle_binary: bool = False,
+    ) -> None:
+        """
+        Builds a network deployed with ansible to the hosts of vips and pips.
+        The cluster image is built once and pushed to every registry, the
+        first one is deployed.
+
+        :param batch_size: The hosts deployed at once by rolling.yml, fewer
+            validators when a batch would lose the quorum
+        :param health_timeout: Seconds a batch has to sync
+        :param bundle: Ship the files of every host as one compressed bundle
+        :param bundle_binary: Ship the binary in a bundle shared by all hosts,
+            it replaces the binary of the image
+        """
+        self.services = {}
+        if protocol == "xahau":
+            name: str = build_version
+            cluster_dir: str = self.get_cluster_dir(name)
+            # Usage
+            owner = "Xahau"
+            repo = "xahaud"
+            commit_hash = get_commit_hash_from_server_version(
+                build_server, build_version
+            )
+            content_bytes = download_file_at_commit(
                 owner,
                 repo,
-                build_version,
+                commit_hash,
+                "src/ripple/protocol/impl/Feature.cpp",
                 "include/xrpl/protocol/detail/features.macro",
             )
             content = get_feature_lines_from_content(content_bytes)
+            url: str = f"{build_server}/{build_version}"
+            download_binary(url, f"{cluster_dir}/xrpld.{build_version}")
             image: str = "ubuntu:jammy"
-        else:
-            name: str = build_version
-            os.makedirs(f"{basedir}/{name}-cluster", exist_ok=True)
-            owner = "XRPLF"
-            repo = "rippled"
-            content_bytes = download_file_at_commit_or_tag(
-                owner, repo, build_version, "src/libxrpl/protocol/Feature.cpp"
-            )
-            content = get_feature_lines_from_content(content_bytes)
-            image: str = f"{build_server}/{build_version}"
-
-    # Change to cluster directory for VL key creation
-    original_dir = os.getcwd()
-    os.chdir(f"{basedir}/{name}-cluster")
-
-    try:
-        client = PublisherClient()
-        vl_key_path = "keystore/vl/key.json"
-        vl_eph_path = "keystore/vl/eph.json"
-        vl_manifest_path = "keystore/vl/manifest.txt"
-
-        # Check if ALL VL files exist and are valid
-        should_regenerate = False
-        if (
-            os.path.exists(vl_key_path)
-            and os.path.exists(vl_eph_path)
-            and os.path.exists(vl_manifest_path)
-        ):
-            try:
-                # Validate that keys are compatible
-                # (not Dilithium or other incompatible formats)
-                keys = client.get_keys()
-                eph_keys = client.get_ephkeys()
-                # Check key format - standard keys should be reasonable length
-                if keys and eph_keys:
-                    pub_key_len = len(keys.get("publicKey", ""))
-                    priv_key_len = len(keys.get("privateKey", ""))
-                    # Standard secp256k1/Ed25519 keys are
-                    # typically 66-68 chars for public,
-                    # 64-66 for private
-                    # Dilithium keys are 2000+ characters
-                    if pub_key_len > 200 or priv_key_len > 200:
-                        print(
-                            "  Detected incompatible VL keys "
-                            "(possibly post-quantum), "
-                            "regenerating..."
-                        )
-                        should_regenerate = True
-                    else:
-                        print("  Using existing VL keys")
-                else:
-                    should_regenerate = True
-            except Exception:
-                print("  VL keys validation failed, regenerating...")
-                should_regenerate = True
-        else:
-            should_regenerate = True
-
-        if should_regenerate:
-            print("  Creating new VL keys...")
-            client.create_keys()
 
-        keys = client.get_keys()
-        manifests: List[str] = create_node_folders(
+        if protocol == "xrpl":
+            if build_server.startswith("https://github.com/"):
+                repo: str = "rippled"
+                owner: str = build_server.split("https://github.com/")[1]
+                owner = owner.split("/")[0]
+                name: str = get_network_name(protocol, build_server, build_version)
+                cluster_dir: str = self.get_cluster_dir(name)
+                copy_file(f"{self.workdir}/xrpld", f"{cluster_dir}/xrpld.{name}")
+                content_bytes = download_file_at_commit_or_tag(
+                    owner,
+                    repo,
+                    build_version,
+                    "include/xrpl/protocol/detail/features.macro",
+                )
+                content = get_feature_lines_from_content(content_bytes)
+                image: str = "ubuntu:jammy"
+            else:
+                name: str = build_version
+                cluster_dir: str = self.get_cluster_dir(name)
+                owner = "XRPLF"
+                repo = "rippled"
+                content_bytes = download_file_at_commit_or_tag(
+                    owner, repo, build_version, "src/libxrpl/protocol/Feature.cpp"
+                )
+                content = get_feature_lines_from_content(content_bytes)
+                image: str = f"{build_server}/{build_version}"
+
+        unl = ValidatorListManager(cluster_dir)
+
+        manifests: List[str] = self.create_node_folders(
             True,
             name,
             image,
@@ -720,7 +719,7 @@ def create_ansible(
             network_id,
             genesis,
             quorum,
-            keys["publicKey"],
+            unl.public_key,
             import_key,
             protocol,
             True,
@@ -729,24 +728,9 @@ def create_ansible(
             nodedb_type,
         )
 
-        services["vl"] = {
-            "build": {
-                "context": "vl",
-                "dockerfile": "Dockerfile",
-            },
-            "container_name": "vl",
-            "ports": ["80:80"],
-            "networks": [f"{name}-network"],
-            "healthcheck": {
-                "test": ["CMD", "curl", "-f", "http://localhost/vl.json"],
-                "interval": "5s",
-                "timeout": "3s",
-                "retries": 3,
-                "start_period": "10s",
-            },
-        }
+        self.services["vl"] = build_vl_service(name)
 
-        services["network-explorer"] = {
+        self.services["network-explorer"] = {
             "image": "transia/explorer-main:latest",
             "container_name": "network-explorer",
             "environment": [
@@ -758,156 +742,302 @@ def create_ansible(
 
         compose = {
             "version": "3.9",
-            "services": services,
+            "services": self.services,
             "networks": {f"{name}-network": {"driver": "bridge"}},
         }
-        with open(f"{basedir}/{name}-cluster/docker-compose.yml", "w") as f:
+        with open(f"{cluster_dir}/docker-compose.yml", "w") as f:
             yaml.dump(compose, f, default_flow_style=False)
 
         write_file(
-            f"{basedir}/{name}-cluster/start.sh",
+            f"{cluster_dir}/start.sh",
             build_network_start_sh(name, num_validators, num_peers),  # noqa: E501
         )
         stop_sh_content: str = build_network_stop_sh(name, num_validators, num_peers)
-        write_file(f"{basedir}/{name}-cluster/stop.sh", stop_sh_content)
+        write_file(f"{cluster_dir}/stop.sh", stop_sh_content)
 
-        os.makedirs(f"{basedir}/{name}-cluster/vl", exist_ok=True)
-        for manifest in manifests:
-            client.add_validator(manifest)
-        client.sign_unl(f"{basedir}/{name}-cluster/vl/vl.json")
-        shutil.copyfile(
-            f"{package_dir}/deploykit/nginx.dockerfile",
-            f"{basedir}/{name}-cluster/vl/Dockerfile",
-        )
-    finally:
-        # Change back to original directory
-        os.chdir(original_dir)
+        unl.set_validators(manifests)
+        unl.publish()
 
-    os.chmod(f"{basedir}/{name}-cluster/start.sh", 0o755)
-    os.chmod(f"{basedir}/{name}-cluster/stop.sh", 0o755)
-    os.chmod(f"{basedir}/{name}-cluster/xrpld.{name}", 0o755)
+        os.chmod(f"{cluster_dir}/start.sh", 0o755)
+        os.chmod(f"{cluster_dir}/stop.sh", 0o755)
+        os.chmod(f"{cluster_dir}/xrpld.{name}", 0o755)
 
-    os.makedirs(f"{basedir}/{name}-cluster/ansible", exist_ok=True)
-    os.makedirs(f"{basedir}/{name}-cluster/ansible/host_vars", exist_ok=True)
+        os.makedirs(f"{cluster_dir}/ansible", exist_ok=True)
+        os.makedirs(f"{cluster_dir}/ansible/host_vars", exist_ok=True)
 
-    shutil.copytree(
-        f"{package_dir}/deploykit/ansible",
-        f"{basedir}/{name}-cluster/ansible",
-        dirs_exist_ok=True,
-    )
-    image_name: str = build_version.replace("-", ".")
-    image_name: str = image_name.replace("+", ".")
-    ssh_port: int = os.environ.get("SSH_PORT", 20)
-    for k, v in services.items():
-        if k[:5] == "vnode":
-            index: int = int(k[5:])
-            c_name: str = v["container_name"]
-            ports: List[str] = v["ports"]
-            vars = DockerVars(
-                f"{basedir}/{name}-cluster/{c_name}/config/",
-                ssh_port,
-                [
-                    f'RPC_PUBLIC: {ports[0].split(":")[0]}',
-                    f'RPC_ADMIN: {ports[1].split(":")[0]}',
-                    f'WS_PUBLIC: {ports[2].split(":")[0]}',
-                    f'WS_ADMIN: {ports[3].split(":")[0]}',
-                    f'PEER: {ports[4].split(":")[0]}',
-                ],
-                int(ports[2].split(":")[-1]),
-                int(ports[4].split(":")[-1]),
-                f"transia/cluster:{image_name}",
-                "loadnet",
-                c_name,
-                ports,
-                [
-                    "/opt/ripple/config:/opt/ripple/config",
-                    "/opt/ripple/log:/opt/ripple/log",
-                    "/opt/ripple/lib:/opt/ripple/lib",
-                    "/var/lib/xrpld/db:/var/lib/xrpld/db",
-                ],
-                [
-                    "/opt/ripple/config",
-                    "/opt/ripple/log",
-                    "/opt/ripple/lib",
-                    "/var/lib/xrpld/db",
-                ],
+        shutil.copytree(
+            f"{package_dir}/deploykit/ansible",
+            f"{cluster_dir}/ansible",
+            dirs_exist_ok=True,
+        )
+        image_name: str = build_version.replace("-", ".")
+        image_name: str = image_name.replace("+", ".")
+        images: List[str] = get_cluster_images(image_name, registries)
+        # one image for every node, the nodes differ only in their config
+        if build_cluster_image(cluster_dir, name, images):
+            push_images(cluster_dir, images)
+
+        ssh_settings: Dict[str, str] = get_ssh_settings()
+        ssh_port: int = ssh_settings["port"]
+        hosts: Dict[str, str] = {f"vnode{i}": ip for i, ip in enumerate(vips, 1)}
+        hosts.update({f"pnode{i}": ip for i, ip in enumerate(pips, 1)})
+
+        nodes: List[str] = [node for node in hosts if node in self.services]
+        bundles: Dict[str, List[str]] = {}
+        if bundle or bundle_binary:
+            bundles = create_bundles(
+                cluster_dir,
+                {hosts[node]: node for node in nodes},
+                f"{cluster_dir}/xrpld.{name}" if bundle_binary else None,
             )
-            create_ansible_vars_file(
-                f"{basedir}/{name}-cluster/ansible/host_vars", vips[index - 1], vars
+
+        def write_host_vars(node: str) -> DockerVars:
+            vars: DockerVars = build_docker_vars(
+                cluster_dir, self.services[node], ssh_port, images[0]
+            )
+            if bundles:
+                vars.bundles = bundles[hosts[node]]
+            if bundle_binary:
+                vars.docker_volumes.append("/opt/ripple/bin/xrpld:/app/xrpld:ro")
+            return create_ansible_vars_file(
+                f"{cluster_dir}/ansible/host_vars", hosts[node], vars
             )
 
-        run_command(
-            f"{basedir}/{name}-cluster",
-            f"cp xrpld.{name} {basedir}/{name}-cluster/vnode1",
+        with ThreadPoolExecutor(max_workers=min(len(nodes), 16) or 1) as executor:
+            list(executor.map(write_host_vars, nodes))
+
+        hosts_content: str = """
+    # this is a basic file putting different hosts into categories
+    # used by ansible to determine which actions to run on which hosts
+    [all]
+        """
+        hosts_content += "\n"
+        ssh: str = ssh_port
+        user: str = ssh_settings["user"]
+        ssh_key: str = ssh_settings["key"]
+        for vip in vips:
+            hosts_content += f"{vip} ansible_port={ssh} ansible_user={user} ansible_ssh_private_key_file={ssh_key} vars_file=host_vars/{vip}.yml \n"  # noqa: E501
+        for pip in pips:
+            hosts_content += f"{pip} ansible_port={ssh} ansible_user={user} ansible_ssh_private_key_file={ssh_key} vars_file=host_vars/{pip}.yml \n"  # noqa: E501
+
+        hosts_content += "\n"
+        hosts_content += "[peer]\n"
+        hosts_content += f"{pips[0]} ansible_port={ssh} ansible_user={user} ansible_ssh_private_key_file={ssh_key} vars_file=host_vars/{pips[0]}.yml \n"  # noqa: E501
+        # groups of the rolling deployment, validators in index order
+        hosts_content += "\n[validators]\n" + "".join(f"{ip}\n" for ip in vips)
+        hosts_content += "\n[peers]\n" + "".join(f"{ip}\n" for ip in pips)
+
+        write_file(f"{cluster_dir}/ansible/hosts.txt", hosts_content)
+
+        # at most the validators above the quorum are down at once
+        max_down: int = max(num_validators - get_quorum(num_validators, quorum), 1)
+        validator_batch_size: int = min(batch_size, max_down)
+        if validator_batch_size < batch_size:
+            print(
+                f"{bcolors.CYAN}Deploying validators {validator_batch_size} "
+                f"at a time to keep the quorum{bcolors.END}"
+            )
+        write_file(
+            f"{cluster_dir}/ansible/rolling.yml",
+            build_rolling_playbook(batch_size, validator_batch_size, health_timeout),
         )
-        run_command(
-            f"{basedir}/{name}-cluster/vnode1",
-            "docker build -f Dockerfile --platform linux/x86_64"
-            f" --tag transia/cluster:{image_name} .",
+        write_file(
+            f"{cluster_dir}/ansible/ansible.cfg",
+            build_ansible_cfg(len(vips) + len(pips)),
         )
-        run_command(
-            f"{basedir}/{name}-cluster/vnode1",
-            f"docker push transia/cluster:{image_name}",
+
+
+def create_node_folders(*args, **kwargs) -> List[str]:
+    return NetworkBuilder().create_node_folders(*args, **kwargs)
+
+
+def create_network(*args, **kwargs) -> str:
+    """
+    Builds a network with a new NetworkBuilder, see
+    NetworkBuilder.create_network for the parameters.
+    """
+    return NetworkBuilder().create_network(*args, **kwargs)
+
+
+def create_ansible(*args, **kwargs) -> None:
+    NetworkBuilder().create_ansible(*args, **kwargs)
+
+
+def update_node_binary(
+    name: str,
+    node_id: str,
+    node_type: str,
+    build_server: str,
+    new_version: str,
+    seed_from: str = None,
+) -> None:
+    node_dir: str = f"{'v' if node_type == 'validator' else 'p'}node{node_id}"
+    run_command(
+        f"{basedir}/{name}",
+        f"docker-compose stop {node_dir}",
+        timeout=COMMAND_TIMEOUT,
+        prefix=node_dir,
+    )
+    url: str = f"{build_server}/{new_version}"
+    download_binary(url, f"{basedir}/{name}/xrpld.{new_version}")
+    # remove the db
+    run_command(f"{basedir}/{name}", f"rm -r {node_dir}/lib", prefix=node_dir)
+    env: Dict[str, str] = None
+    if seed_from:
+        # imported here, bootstrap depends on this module
+        from xrpld_netgen.bootstrap import seed_nodes
+
+        seed_nodes(f"{basedir}/{name}", seed_from, [node_dir])
+        env = {"START_MODE": "load"}
+    install_node_binary(f"{basedir}/{name}", node_dir, new_version)
+    run_command(
+        f"{basedir}/{name}",
+        f"docker compose up --build --force-recreate -d {node_dir}",
+        env,
+        timeout=BUILD_TIMEOUT,
+        prefix=node_dir,
+    )
+
+
+def install_node_binary(cluster_dir: str, node_dir: str, version: str) -> None:
+    shutil.copyfile(
+        f"{cluster_dir}/xrpld.{version}",
+        f"{cluster_dir}/{node_dir}/xrpld.{version}",
+    )
+    os.chmod(f"{cluster_dir}/{node_dir}/xrpld.{version}", 0o755)
+    update_dockerfile(version, f"{cluster_dir}/{node_dir}/Dockerfile")
+
+
+def get_upgrade_batches(
+    nodes: List[str], batch_size: int, validator_batch_size: int
+) -> List[List[str]]:
+    # nodes in order, a batch holds at most validator_batch_size validators
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    for node in nodes:
+        validators: int = len([n for n in batch if n.startswith("vnode")])
+        if len(batch) == batch_size or (
+            node.startswith("vnode") and validators == validator_batch_size
+        ):
+            batches.append(batch)
+            batch = []
+        batch.append(node)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def print_downtimes(downtimes: Dict[str, float]) -> None:
+    print(f"{bcolors.BLUE}Node downtime:{bcolors.END}")
+    for node, downtime in downtimes.items():
+        print(f"    - {node}: {downtime:.1f}s")
+
+
+def rolling_upgrade(
+    name: str,
+    build_server: str,
+    new_version: str,
+    nodes: List[str] = None,
+    batch_size: int = 1,
+    timeout: int = 600,
+) -> Dict[str, float]:
+    """
+    Upgrades the nodes of a running network in batches while keeping their
+    databases. Each batch is restarted from disk and must return to a synced
+    state before the next batch is stopped, and a batch never stops more
+    validators than are above the quorum, so quorum is never lost.
+
+    Returns the downtime in seconds of every upgraded node, raises a
+    RuntimeError when a batch does not sync within the timeout.
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    nodes = nodes or list_cluster_nodes(cluster_dir)
+    download_binary(
+        f"{build_server}/{new_version}", f"{cluster_dir}/xrpld.{new_version}"
+    )
+
+    # at most the validators above the quorum are down at once, the same as
+    # the rolling playbook of create_ansible
+    num_validators: int = len(
+        [n for n in list_cluster_nodes(cluster_dir) if n.startswith("vnode")]
+    )
+    quorum: int = None
+    if os.path.exists(f"{cluster_dir}/cluster.json"):
+        with open(f"{cluster_dir}/cluster.json") as f:
+            quorum = json.load(f).get("quorum")
+    max_down: int = max(num_validators - get_quorum(num_validators, quorum), 1)
+    batches: List[List[str]] = get_upgrade_batches(
+        nodes, batch_size, min(batch_size, max_down)
+    )
+
+    downtimes: Dict[str, float] = {}
+    for number, batch in enumerate(batches, start=1):
+        print(
+            f"{bcolors.BLUE}Upgrading batch {number}/{len(batches)}: "
+            f"{', '.join(batch)}{bcolors.END}"
         )
+        stopped_at: float = time.time()
+        run_command(cluster_dir, f"docker compose stop {' '.join(batch)}")
+        for node in batch:
+            install_node_binary(cluster_dir, node, new_version)
         run_command(
-            f"{basedir}/{name}-cluster/vnode1",
-            f"rm -r xrpld.{name}",
+            cluster_dir,
+            f"docker compose up --build --force-recreate -d {' '.join(batch)}",
+            {"START_MODE": "load"},
         )
-        if k[:5] == "pnode":
-            index: int = int(k[5:])
-            c_name: str = v["container_name"]
-            ports: List[str] = v["ports"]
-            vars = DockerVars(
-                f"{basedir}/{name}-cluster/{c_name}/config/",
-                ssh_port,
-                [
-                    f'RPC_PUBLIC: {ports[0].split(":")[0]}',
-                    f'RPC_ADMIN: {ports[1].split(":")[0]}',
-                    f'WS_PUBLIC: {ports[2].split(":")[0]}',
-                    f'WS_ADMIN: {ports[3].split(":")[0]}',
-                    f'PEER: {ports[4].split(":")[0]}',
-                ],
-                int(ports[2].split(":")[-1]),
-                int(ports[4].split(":")[-1]),
-                f"transia/cluster:{image_name}",
-                "loadnet",
-                c_name,
-                ports,
-                [
-                    "/opt/ripple/config:/opt/ripple/config",
-                    "/opt/ripple/log:/opt/ripple/log",
-                    "/opt/ripple/lib:/opt/ripple/lib",
-                    "/var/lib/xrpld/db:/var/lib/xrpld/db",
-                ],
-                [
-                    "/opt/ripple/config",
-                    "/opt/ripple/log",
-                    "/opt/ripple/lib",
-                    "/var/lib/xrpld/db",
-                ],
+
+        def wait(node: str) -> str:
+            index, node_type = parse_node_name(node)
+            state: str = wait_for_server_state(
+                get_node_port(index, node_type), SYNCED_STATES, timeout
             )
-            create_ansible_vars_file(
-                f"{basedir}/{name}-cluster/ansible/host_vars", pips[index - 1], vars
+            downtimes[node] = time.time() - stopped_at
+            return state
+
+        with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+            states: List[str] = list(executor.map(wait, batch))
+
+        for node, state in zip(batch, states):
+            if state:
+                print(
+                    f"✅ {bcolors.CYAN}{node} {state} after "
+                    f"{downtimes[node]:.1f}s{bcolors.END}"
+                )
+        failed: List[str] = [n for n, state in zip(batch, states) if not state]
+        if failed:
+            print_downtimes(downtimes)
+            raise RuntimeError(
+                f"{', '.join(failed)} did not sync within {timeout}s, "
+                f"stopped the upgrade after batch {number}/{len(batches)}"
             )
-    hosts_content: str = """
-# this is a basic file putting different hosts into categories
-# used by ansible to determine which actions to run on which hosts
-[all]
-    """
-    hosts_content += "\n"
-    ssh: str = os.environ.get("SSH_PORT", 20)
-    user: str = os.environ.get("SSH_USER", "ubuntu")
-    ssh_key: str = os.environ.get("SSH_PATH", "~/.ssh/id_rsa")
-    for vip in vips:
-        hosts_content += f"{vip} ansible_port={ssh} ansible_user={user} ansible_ssh_private_key_file={ssh_key} vars_file=host_vars/{vip}.yml \n"  # noqa: E501
-    for pip in pips:
-        hosts_content += f"{pip} ansible_port={ssh} ansible_user={user} ansible_ssh_private_key_file={ssh_key} vars_file=host_vars/{pip}.yml \n"  # noqa: E501
 
-    hosts_content += "\n"
-    hosts_content += "[peer]\n"
-    hosts_content += f"{pips[0]} ansible_port={ssh} ansible_user={user} ansible_ssh_private_key_file={ssh_key} vars_file=host_vars/{pips[0]}.yml \n"  # noqa: E501
+    print_downtimes(downtimes)
+    return downtimes
 
-    write_file(f"{basedir}/{name}-cluster/ansible/hosts.txt", hosts_content)
+
+def enable_node_amendment(
+    name: str,
+    amendment_name: str,
+    node_id: str,
+    node_type: str,
+) -> None:
+    amendment_hash: str = sha512_half(amendment_name.encode("utf-8").hex())
+    command: Dict[str, Any] = {
+        "method": "feature",
+        "params": [
+            {
+                "feature": amendment_hash,
+                "vetoed": False,
+            }
+        ],
+    }
+    port: int = get_node_port(int(node_id), node_type)
+    json_str: str = json.dumps(command)
+    escaped_str = json_str.replace('"', '\\"')
+    command: str = (
+        f'curl -X POST -H "Content-Type: application/json" -d "{escaped_str}" http://localhost:{port}'  # noqa: E501
+    )
+    run_command(f"{basedir}/{name}", command)
 
 
 def stop_network(name: str, remove: bool = False):
@@ -941,43 +1071,13 @@ def create_local_node_folders(
     Creates config folders for local multi-node network without Docker.
     Similar to create_node_folders but uses local paths instead of Docker paths.
     """
-    # Change to cluster directory for keystore creation
-    original_dir = os.getcwd()
-    os.chdir(cluster_dir)
-
-    try:
-        # Create directories for validator nodes
-        ips_fixed: List[str] = []
-        for i in range(1, num_validators + 1):
-            _, _, _, _, peer = generate_ports(i, "validator")
-            ips_fixed.append(f"127.0.0.1 {peer}")
-
-        manifests: List[str] = []
-        validators: List[str] = []
-        tokens: List[str] = []
-        for i in range(1, num_validators + 1):
-            node_dir = f"vnode{i}"
-            # GENERATE VALIDATOR KEY
-            client = ValidatorClient(node_dir)
-            key_path = f"keystore/{node_dir}/key.json"
-            if not os.path.exists(key_path):
-                print(f"  Creating new keys for {node_dir}...")
-                client.create_keys()
-                client.set_domain(f"xahau.{node_dir}.transia.co")
-                client.create_token()
-            else:
-                print(f"  Using existing keys for {node_dir}")
-            keys = client.get_keys()
-            token = client.read_token()
-            manifest = client.read_manifest()
-            manifests.append(manifest)
-            validators.append(keys["public_key"])
-            tokens.append(token)
+    # Create directories for validator nodes
+    ips_fixed: List[str] = []
+    for i in range(1, num_validators + 1):
+        _, _, _, _, peer = generate_ports(i, "validator")
+        ips_fixed.append(f"127.0.0.1 {peer}")
 
-        print(f"✅ {bcolors.CYAN}Validator keys ready")
-    finally:
-        # Change back to original directory
-        os.chdir(original_dir)
+    manifests, validators, tokens = load_validator_keys(cluster_dir, num_validators)
 
     for i in range(1, num_validators + 1):
         node_dir = f"vnode{i}"
@@ -1086,7 +1186,7 @@ def create_local_node_folders(
         if protocol in ("xahau", "xrpl"):
             features_json: Dict[str, Any] = parse_amendments(feature_content)
         else:
-            features_json: Any = read_json(
+            features_json: Any = read_template(
                 f"{package_dir}/default.{protocol}.features.json"
             )
 
@@ -1130,15 +1230,16 @@ def create_local_network(
     # Use a simple name for local networks
     name: str = f"local-{protocol}"
     # Create cluster in current working directory instead of package directory
-    cluster_dir = f"{os.getcwd()}/{name}-cluster"
+    workdir: str = get_working_directory()
+    cluster_dir = f"{workdir}/{name}-cluster"
     os.makedirs(cluster_dir, exist_ok=True)
 
     # Read features from local source files (user has built locally)
     content: str = ""
     if protocol == "xahau":
         # Look for xahau features file in parent directory (build/../src/...)
-        local_path = "../src/ripple/protocol/impl/Feature.cpp"
-        macro_path = "../include/xrpl/protocol/detail/features.macro"
+        local_path = f"{workdir}/../src/ripple/protocol/impl/Feature.cpp"
+        macro_path = f"{workdir}/../include/xrpl/protocol/detail/features.macro"
         if os.path.exists(local_path):
             content = get_feature_lines_from_path(local_path)
         elif os.path.exists(macro_path):
@@ -1150,7 +1251,7 @@ def create_local_network(
 
     if protocol == "xrpl":
         # Look for xrpl features file in parent directory (build/../include/...)
-        local_path = "../include/xrpl/protocol/detail/features.macro"
+        local_path = f"{workdir}/../include/xrpl/protocol/detail/features.macro"
         if os.path.exists(local_path):
             content = get_feature_lines_from_path(local_path)
         else:
@@ -1158,142 +1259,67 @@ def create_local_network(
             print(f"Please run this command from your build directory.{bcolors.END}")
             return
 
-    # Change to cluster directory for key creation
-    original_dir = os.getcwd()
-    os.chdir(cluster_dir)
-
-    try:
-        # Create validator list publisher keys
-        client = PublisherClient()
-        vl_key_path = "keystore/vl/key.json"
-        vl_eph_path = "keystore/vl/eph.json"
-        vl_manifest_path = "keystore/vl/manifest.txt"
-
-        # Check if ALL VL files exist and are valid
-        should_regenerate = False
-        if (
-            os.path.exists(vl_key_path)
-            and os.path.exists(vl_eph_path)
-            and os.path.exists(vl_manifest_path)
-        ):
-            try:
-                # Validate that keys are compatible
-                # (not Dilithium or other incompatible formats)
-                keys = client.get_keys()
-                eph_keys = client.get_ephkeys()
-                # Check key format - standard keys should be reasonable length
-                if keys and eph_keys:
-                    pub_key_len = len(keys.get("publicKey", ""))
-                    priv_key_len = len(keys.get("privateKey", ""))
-                    # Standard secp256k1/Ed25519 keys are
-                    # typically 66-68 chars for public,
-                    # 64-66 for private
-                    # Dilithium keys are 2000+ characters
-                    if pub_key_len > 200 or priv_key_len > 200:
-                        print(
-                            "  Detected incompatible VL keys "
-                            "(possibly post-quantum), "
-                            "regenerating..."
-                        )
-                        should_regenerate = True
-                    else:
-                        print("  Using existing VL keys")
-                else:
-                    should_regenerate = True
-            except Exception:
-                print("  VL keys validation failed, regenerating...")
-                should_regenerate = True
-        else:
-            should_regenerate = True
-
-        if should_regenerate:
-            print("  Creating new VL keys...")
-            client.create_keys()
-
-        keys = client.get_keys()
-
-        # Create node configs without Docker
-        manifests: List[str] = create_local_node_folders(
-            name,
-            cluster_dir,
-            content,
-            num_validators,
-            num_peers,
-            network_id,
-            genesis,
-            quorum,
-            keys["publicKey"],
-            import_key,
-            protocol,
-            log_level,
-            nodedb_type,
-        )
+    # Create validator list publisher keys
+    unl = ValidatorListManager(cluster_dir)
+
+    # Create node configs without Docker
+    manifests: List[str] = create_local_node_folders(
+        name,
+        cluster_dir,
+        content,
+        num_validators,
+        num_peers,
+        network_id,
+        genesis,
+        quorum,
+        unl.public_key,
+        import_key,
+        protocol,
+        log_level,
+        nodedb_type,
+    )
 
-        # Create docker-compose.yml for Explorer and VL services only
-        services: Dict[str, Dict] = {}
+    # Create docker-compose.yml for Explorer and VL services only
+    services: Dict[str, Dict] = {}
 
-        services["vl"] = {
-            "build": {
-                "context": "vl",
-                "dockerfile": "Dockerfile",
-            },
-            "container_name": "vl",
-            "ports": ["80:80"],
-            "networks": [f"{name}-network"],
-            "healthcheck": {
-                "test": ["CMD", "curl", "-f", "http://localhost/vl.json"],
-                "interval": "5s",
-                "timeout": "3s",
-                "retries": 3,
-                "start_period": "10s",
-            },
-        }
+    services["vl"] = build_vl_service(name)
 
-        services["network-explorer"] = {
-            "image": "transia/explorer:latest",
-            "container_name": "network-explorer",
-            "environment": [
-                "PORT=4000",
-                f"VUE_APP_WSS_ENDPOINT=ws://0.0.0.0:{6016}",
-            ],
-            "ports": ["4000:4000"],
-            "networks": [f"{name}-network"],
-        }
+    services["network-explorer"] = {
+        "image": "transia/explorer:latest",
+        "container_name": "network-explorer",
+        "environment": [
+            "PORT=4000",
+            f"VUE_APP_WSS_ENDPOINT=ws://0.0.0.0:{6016}",
+        ],
+        "ports": ["4000:4000"],
+        "networks": [f"{name}-network"],
+    }
 
-        compose = {
-            "version": "3.9",
-            "services": services,
-            "networks": {f"{name}-network": {"driver": "bridge"}},
-        }
-        with open(f"{cluster_dir}/docker-compose.yml", "w") as f:
-            yaml.dump(compose, f, default_flow_style=False)
+    compose = {
+        "version": "3.9",
+        "services": services,
+        "networks": {f"{name}-network": {"driver": "bridge"}},
+    }
+    with open(f"{cluster_dir}/docker-compose.yml", "w") as f:
+        yaml.dump(compose, f, default_flow_style=False)
 
-        # Generate start.sh for local execution
-        write_file(
-            f"{cluster_dir}/start.sh",
-            build_local_network_start_sh(name, num_validators, num_peers, binary_name),
-        )
+    # Generate start.sh for local execution
+    write_file(
+        f"{cluster_dir}/start.sh",
+        build_local_network_start_sh(name, num_validators, num_peers, binary_name),
+    )
 
-        # Generate stop.sh
-        stop_sh_content: str = build_local_network_stop_sh(
-            name,
-            num_validators,
-            num_peers,
-        )
-        write_file(f"{cluster_dir}/stop.sh", stop_sh_content)
+    # Generate stop.sh
+    stop_sh_content: str = build_local_network_stop_sh(
+        name,
+        num_validators,
+        num_peers,
+    )
+    write_file(f"{cluster_dir}/stop.sh", stop_sh_content)
 
-        # Create VL (validator list) folder and files
-        os.makedirs(f"{cluster_dir}/vl", exist_ok=True)
-        for manifest in manifests:
-            client.add_validator(manifest)
-        client.sign_unl(f"{cluster_dir}/vl/vl.json")
-        shutil.copyfile(
-            f"{package_dir}/deploykit/nginx.dockerfile",
-            f"{cluster_dir}/vl/Dockerfile",
-        )
-    finally:
-        # Change back to original directory
-        os.chdir(original_dir)
+    # Create VL (validator list) folder and files
+    unl.set_validators(manifests)
+    unl.publish()
 
     # Make scripts executable
     os.chmod(f"{cluster_dir}/start.sh", 0o755)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+from xrpld_netgen.api import OPERATIONS, run_operation
+from xrpld_netgen.utils.misc import bcolors
+
+# ${step.key} is replaced with a key of the result of an earlier step
+REFERENCE = re.compile(r"\$\{(?P<step>[^.}]+)\.(?P<key>[^}]+)\}")
+
+
+def load_plan(path: str) -> List[Dict[str, Any]]:
+    """
+    Reads a plan file, a list of steps (or a mapping with a `steps` list):
+
+        - id: create
+          run: create:network
+          with: {build_version: "2025.7.9-release+1951"}
+        - run: up
+          with: {name: "${create.name}"}
+
+    A step needs the step before it, unless it lists its own `needs`
+    (`needs: []` starts it with the first steps), and the steps it references.
+    """
+    with open(path) as f:
+        plan: Any = yaml.safe_load(f)
+    if isinstance(plan, dict):
+        plan = plan.get("steps")
+    if not isinstance(plan, list) or not plan:
+        raise ValueError(f"{path} does not contain a list of steps")
+    return parse_steps(plan)
+
+
+def parse_steps(plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    steps: List[Dict[str, Any]] = []
+    ids: List[str] = []
+    for index, step in enumerate(plan):
+        if not isinstance(step, dict) or "run" not in step:
+            raise ValueError(f"Step {index + 1} has no operation to run")
+        if step["run"] not in OPERATIONS:
+            raise ValueError(f"Step {index + 1}: unknown operation {step['run']}")
+        step_id: str = str(step.get("id", index + 1))
+        if step_id in ids:
+            raise ValueError(f"Duplicate step id: {step_id}")
+        needs: Any = step.get("needs", ids[-1:])
+        needs = [str(n) for n in ([needs] if isinstance(needs, str) else needs)]
+        # a step also needs the steps it references
+        for match in REFERENCE.finditer(str(step.get("with"))):
+            if match["step"] not in needs:
+                needs.append(match["step"])
+        for need in needs:
+            # only earlier steps, so the plan can not have cycles
+            if need not in ids:
+                raise ValueError(f"Step {step_id} needs unknown step {need}")
+        ids.append(step_id)
+        steps.append(
+            {
+                "id": step_id,
+                "run": step["run"],
+                "with": step.get("with") or {},
+                "needs": needs,
+            }
+        )
+    return steps
+
+
+def resolve(value: Any, results: Dict[str, Any]) -> Any:
+    if isinstance(value, dict):
+        return {k: resolve(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve(v, results) for v in value]
+    if not isinstance(value, str):
+        return value
+
+    def lookup(match: re.Match) -> Any:
+        result: Any = results.get(match["step"])
+        if not isinstance(result, dict) or match["key"] not in result:
+            raise ValueError(f"{match[0]} is not a result of an earlier step")
+        return result[match["key"]]
+
+    match = REFERENCE.fullmatch(value)
+    if match:
+        # keep the type of the result for a whole value reference
+        return lookup(match)
+    return REFERENCE.sub(lambda m: str(lookup(m)), value)
+
+
+def run_step(step: Dict[str, Any], results: Dict[str, Any]) -> Tuple[Any, float]:
+    start: float = time.perf_counter()
+    result: Any = run_operation(step["run"], resolve(step["with"], results))
+    return result, time.perf_counter() - start
+
+
+def run_plan(
+    steps: List[Dict[str, Any]], max_workers: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Runs the steps in one process, every step starts as soon as the steps
+    it needs are done. After a failure the running steps finish and the
+    remaining ones are skipped.
+
+    :return: The id, operation, status and seconds of every step
+    """
+    results: Dict[str, Any] = {}
+    report: Dict[str, Dict[str, Any]] = {
+        step["id"]: {"id": step["id"], "run": step["run"], "status": "skipped"}
+        for step in steps
+    }
+    pending: List[Dict[str, Any]] = list(steps)
+    running: Dict[Future, Dict[str, Any]] = {}
+    failed: bool = False
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            for step in list(pending):
+                if failed or not all(n in results for n in step["needs"]):
+                    continue
+                pending.remove(step)
+                print(
+                    f"{bcolors.BLUE}Running {bcolors.PURPLE}{step['id']}"
+                    f"{bcolors.BLUE}: {step['run']}{bcolors.END}"
+                )
+                running[executor.submit(run_step, step, results)] = step
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                try:
+                    results[step["id"]], seconds = future.result()
+                    report[step["id"]].update(status="ok", seconds=seconds)
+                except Exception as e:
+                    failed = True
+                    report[step["id"]].update(status="failed", error=str(e))
+                    print(f"{bcolors.RED}Step {step['id']} failed: {e}{bcolors.END}")
+    return [report[step["id"]] for step in steps]
+
+
+def print_plan_report(report: List[Dict[str, Any]], seconds: float) -> None:
+    colors: Dict[str, str] = {
+        "ok": bcolors.GREEN,
+        "failed": bcolors.RED,
+        "skipped": bcolors.PURPLE,
+    }
+    print(f"{bcolors.BLUE}Plan report:{bcolors.END}")
+    for step in report:
+        took: str = f" {step['seconds']:.2f}s" if "seconds" in step else ""
+        print(
+            f"    - {step['id']} ({step['run']}): "
+            f"{colors[step['status']]}{step['status']}{bcolors.END}{took}"
+        )
+    print(f"{bcolors.BLUE}Total: {seconds:.2f}s{bcolors.END}")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import re
+import glob
+import shlex
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import yaml
+
+from xrpld_netgen.utils.misc import bcolors, get_cfg_section
+
+# Create network files in workspace relative to where the command is run
+basedir = os.path.abspath(os.path.join(os.getcwd(), "workspace"))
+
+# Minimum host per [node_size], from the xrpld system requirements
+NODE_SIZES: Dict[str, Dict[str, int]] = {
+    "tiny": {"cpus": 1, "memory_gb": 2},
+    "small": {"cpus": 2, "memory_gb": 8},
+    "medium": {"cpus": 4, "memory_gb": 16},
+    "large": {"cpus": 8, "memory_gb": 32},
+    "huge": {"cpus": 8, "memory_gb": 64},
+}
+# Disk for the system, the image and the logs
+BASE_DISK_GB: float = 10
+# Rough db growth per kept ledger, [ledger_history] full has no bound
+DISK_GB_PER_LEDGER: float = 0.0005
+FULL_HISTORY_DISK_GB: float = 100
+DEFAULT_LEDGER_HISTORY: str = "256"
+
+# One round trip per host, every value on its own key=value line
+PROBE_SCRIPT: str = """
+echo cpus=$(nproc)
+echo memory_kb=$(awk '/MemTotal/ {print $2}' /proc/meminfo)
+echo disk_kb=$( (df -Pk /opt 2>/dev/null || df -Pk /) | awk 'NR==2 {print $4}')
+echo docker=$(docker version --format '{{.Server.Version}}' 2>/dev/null)
+echo ports=$( (ss -Htln 2>/dev/null || netstat -tln 2>/dev/null) \
+    | awk '{print $4}' | grep -o '[0-9]*$' | sort -un | tr '\\n' ',')
+"""
+
+INVENTORY_LINE = re.compile(r"^(\S+)((?:\s+\w+=\S+)+)\s*$")
+
+
+def load_inventory(ansible_dir: str) -> Dict[str, Dict[str, str]]:
+    """
+    Reads the hosts of hosts.txt with their ssh settings and vars file.
+
+    :return: The ip of a host -> its ansible_* variables
+    """
+    hosts: Dict[str, Dict[str, str]] = {}
+    with open(f"{ansible_dir}/hosts.txt", "r") as f:
+        for line in f:
+            match = INVENTORY_LINE.match(line.strip())
+            if match and match.group(1) not in hosts:
+                hosts[match.group(1)] = dict(
+                    pair.split("=", 1) for pair in match.group(2).split()
+                )
+    return hosts
+
+
+def get_requirements(config_dir: str) -> Dict[str, Any]:
+    """
+    Returns the host a node needs for its [node_size] and [ledger_history].
+    """
+    cfg_paths: List[str] = glob.glob(f"{config_dir}/*d.cfg")
+    # the xrpld defaults when the config has no section
+    node_size: str = "medium"
+    ledger_history: str = DEFAULT_LEDGER_HISTORY
+    if cfg_paths:
+        node_size = (get_cfg_section(cfg_paths[0], "node_size") or [node_size])[0]
+        ledger_history = (
+            get_cfg_section(cfg_paths[0], "ledger_history") or [ledger_history]
+        )[0]
+    if ledger_history.isdigit():
+        disk_gb: float = BASE_DISK_GB + int(ledger_history) * DISK_GB_PER_LEDGER
+    else:
+        disk_gb = BASE_DISK_GB + FULL_HISTORY_DISK_GB
+    return {
+        "node_size": node_size,
+        "ledger_history": ledger_history,
+        **NODE_SIZES.get(node_size, NODE_SIZES["medium"]),
+        "disk_gb": disk_gb,
+    }
+
+
+def probe_host(host: str, ssh: Dict[str, str], timeout: float = 15) -> Dict[str, str]:
+    """
+    Collects the resources of a host over ssh.
+
+    :return: The probed values, raises RuntimeError when the host is not
+        reachable
+    """
+    command: List[str] = [
+        "ssh",
+        "-o",
+        "BatchMode=yes",
+        "-o",
+        "StrictHostKeyChecking=no",
+        "-o",
+        f"ConnectTimeout={int(timeout)}",
+        "-p",
+        str(ssh.get("ansible_port", 22)),
+    ]
+    if ssh.get("ansible_ssh_private_key_file"):
+        command += ["-i", os.path.expanduser(ssh["ansible_ssh_private_key_file"])]
+    command += [
+        f"{ssh.get('ansible_user', 'ubuntu')}@{host}",
+        f"sh -c {shlex.quote(PROBE_SCRIPT)}",
+    ]
+    try:
+        result = subprocess.run(
+            command, capture_output=True, text=True, timeout=timeout * 2
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("ssh timed out")
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"ssh exit {result.returncode}")
+    return dict(
+        line.split("=", 1) for line in result.stdout.splitlines() if "=" in line
+    )
+
+
+def check_host(
+    probe: Dict[str, str], requirements: Dict[str, Any], ports: List[int]
+) -> Dict[str, Any]:
+    """
+    Compares the probed values of a host with the requirements of its node.
+    Errors stop the deployment, warnings do not.
+    """
+    cpus: int = int(probe.get("cpus") or 0)
+    memory_gb: float = int(probe.get("memory_kb") or 0) / 1024**2
+    disk_gb: float = int(probe.get("disk_kb") or 0) / 1024**2
+    listening: List[int] = [int(p) for p in probe.get("ports", "").split(",") if p]
+    report: Dict[str, Any] = {
+        "cpus": cpus,
+        "memory_gb": round(memory_gb, 1),
+        "disk_gb": round(disk_gb, 1),
+        "docker": probe.get("docker") or None,
+        "ports_in_use": [p for p in ports if p in listening],
+        "errors": [],
+        "warnings": [],
+    }
+    size: str = requirements["node_size"]
+    if cpus < requirements["cpus"]:
+        report["errors"].append(
+            f"{cpus} cpus, node_size {size} needs {requirements['cpus']}"
+        )
+    # the kernel keeps part of the memory, allow 10% below the requirement
+    if memory_gb < requirements["memory_gb"] * 0.9:
+        report["errors"].append(
+            f"{memory_gb:.1f} GB memory, node_size {size} needs "
+            f"{requirements['memory_gb']} GB"
+        )
+    if disk_gb < requirements["disk_gb"]:
+        report["errors"].append(
+            f"{disk_gb:.1f} GB disk free, ledger_history "
+            f"{requirements['ledger_history']} needs {requirements['disk_gb']:.0f} GB"
+        )
+    if not report["docker"]:
+        report["warnings"].append("docker not installed (installed by deps.yml)")
+    if report["ports_in_use"]:
+        # a redeploy finds its own container on these ports
+        report["warnings"].append(
+            f"ports in use: {', '.join(map(str, report['ports_in_use']))}"
+        )
+    return report
+
+
+def get_node_ports(host_vars: Dict[str, Any]) -> List[int]:
+    return [
+        int(str(port).split(":")[0])
+        for port in host_vars.get("docker_container_ports", [])
+    ]
+
+
+def preflight(
+    name: str, max_workers: int = 16, timeout: float = 15
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Probes every host of the ansible inventory of a cluster concurrently and
+    checks it can run its node.
+
+    :return: The ip of a host -> its report, with errors when the host
+        is not reachable or too small
+    """
+    ansible_dir: str = f"{basedir}/{name}/ansible"
+    if not os.path.exists(f"{ansible_dir}/hosts.txt"):
+        raise ValueError(f"{name} has no ansible inventory")
+    inventory: Dict[str, Dict[str, str]] = load_inventory(ansible_dir)
+
+    def check(host: str) -> Dict[str, Any]:
+        host_vars: Dict[str, Any] = {}
+        vars_path: str = f"{ansible_dir}/host_vars/{host}.yml"
+        if os.path.exists(vars_path):
+            with open(vars_path, "r") as f:
+                host_vars = yaml.safe_load(f) or {}
+        requirements: Dict[str, Any] = get_requirements(
+            host_vars.get("config_path", "")
+        )
+        try:
+            probe: Dict[str, str] = probe_host(host, inventory[host], timeout)
+        except (OSError, RuntimeError) as e:
+            return {
+                "node": host_vars.get("docker_container_name"),
+                "errors": [f"unreachable: {e}"],
+                "warnings": [],
+            }
+        report: Dict[str, Any] = check_host(
+            probe, requirements, get_node_ports(host_vars)
+        )
+        report["node"] = host_vars.get("docker_container_name")
+        return report
+
+    hosts: List[str] = list(inventory)
+    with ThreadPoolExecutor(max_workers=max(min(len(hosts), max_workers), 1)) as ex:
+        return dict(zip(hosts, ex.map(check, hosts)))
+
+
+def print_preflight_report(reports: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    Prints a line per host.
+
+    :return: True when every host can run its node
+    """
+    for host, report in reports.items():
+        status: str = (
+            f"{bcolors.RED}❌" if report["errors"] else f"{bcolors.GREEN}✅"
+        )
+        details: str = ""
+        if "cpus" in report:
+            details = (
+                f" cpus: {report['cpus']} memory: {report['memory_gb']} GB "
+                f"disk: {report['disk_gb']} GB docker: {report['docker'] or '-'}"
+            )
+        print(f"{status} {host} ({report['node']}){bcolors.END}{details}")
+        for error in report["errors"]:
+            print(f"    {bcolors.RED}- {error}{bcolors.END}")
+        for warning in report["warnings"]:
+            print(f"    - {warning}")
+    failed: int = sum(1 for report in reports.values() if report["errors"])
+    if failed:
+        print(f"{bcolors.RED}{failed} of {len(reports)} hosts failed{bcolors.END}")
+    return not failed
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import time
+import shlex
+import subprocess
+from typing import Callable, Dict, List, Optional, Tuple
+
+from xrpld_netgen import network
+from xrpld_netgen.network import create_network, SYNCED_STATES
+from xrpld_netgen.libs.github import list_server_versions
+from xrpld_netgen.libs.rpc import wait_for_server_state
+from xrpld_netgen.utils.misc import (
+    bcolors,
+    run_command,
+    remove_directory,
+    get_node_port,
+    generate_ports,
+)
+
+
+def select_versions(versions: List[str], good: str, bad: str) -> List[str]:
+    """
+    Returns the versions from the good version to the bad version (inclusive).
+    """
+    for version in [good, bad]:
+        if version not in versions:
+            raise ValueError(f"Version {version} not found on the build server")
+    start: int = versions.index(good)
+    end: int = versions.index(bad)
+    if start >= end:
+        raise ValueError(f"Good version {good} must be older than bad version {bad}")
+    return versions[start : end + 1]
+
+
+def is_regression(value: float, threshold: float, lower_is_better: bool) -> bool:
+    return value > threshold if lower_is_better else value < threshold
+
+
+def bisect_versions(
+    versions: List[str], is_good: Callable[[str], bool]
+) -> Tuple[str, Dict[str, bool]]:
+    """
+    Binary search for the first bad version. The first version is known to
+    be good and the last one to be bad, so only the versions in between are
+    tested.
+
+    :return: The first bad version and the result of every tested version
+    """
+    results: Dict[str, bool] = {}
+    low: int = 0
+    high: int = len(versions) - 1
+    while high - low > 1:
+        mid: int = (low + high) // 2
+        results[versions[mid]] = is_good(versions[mid])
+        if results[versions[mid]]:
+            low = mid
+        else:
+            high = mid
+    return versions[high], results
+
+
+def run_benchmark(
+    command: str, cwd: str, env: Dict[str, str], timeout: float
+) -> float:
+    """
+    Runs the benchmark command, the last line of its output is the metric.
+    """
+    result = subprocess.run(
+        shlex.split(command),
+        cwd=cwd,
+        env={**os.environ, **env},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        raise ValueError(
+            f"Benchmark failed ({result.returncode}): {result.stderr.decode()}"
+        )
+    lines: List[str] = result.stdout.decode().strip().splitlines()
+    if not lines:
+        raise ValueError("Benchmark did not print a metric")
+    return float(lines[-1].strip())
+
+
+def measure_version(
+    version: str,
+    benchmark: str,
+    import_key: str,
+    build_server: str,
+    num_validators: int,
+    num_peers: int,
+    network_id: int,
+    timeout: float,
+) -> float:
+    """
+    Creates and starts a cluster running the version, runs the benchmark
+    against it and removes the cluster again. Raises a ValueError when the
+    cluster does not start or sync, or the benchmark fails.
+    """
+    name: str = f"{version}-cluster"
+    cluster_dir: str = f"{network.basedir}/{name}"
+    create_network(
+        "warning",
+        import_key,
+        "xahau",
+        num_validators,
+        num_peers,
+        network_id,
+        build_server,
+        version,
+        quorum=max(num_validators - 1, 1),
+    )
+    try:
+        if not run_command(cluster_dir, "bash start.sh"):
+            raise ValueError(f"{name} did not start")
+        port: int = get_node_port(1, "validator")
+        if not wait_for_server_state(port, SYNCED_STATES, timeout):
+            raise ValueError(f"{name} did not sync within {timeout}s")
+        ws_port: int = generate_ports(1, "validator")[2]
+        env: Dict[str, str] = {
+            "NETWORK_NAME": name,
+            "BUILD_VERSION": version,
+            "RPC_PORT": str(port),
+            "WS_PORT": str(ws_port),
+        }
+        return run_benchmark(benchmark, os.getcwd(), env, timeout)
+    finally:
+        run_command(cluster_dir, "bash stop.sh --remove")
+        remove_directory(cluster_dir)
+
+
+def run_bisect(
+    good: str,
+    bad: str,
+    benchmark: str,
+    threshold: float,
+    import_key: str,
+    lower_is_better: bool = False,
+    build_server: str = "https://build.xahau.tech",
+    num_validators: int = 3,
+    num_peers: int = 1,
+    network_id: int = 21339,
+    timeout: float = 600,
+    verify: bool = True,
+) -> str:
+    """
+    Finds the first build between a good and a bad build where the benchmark
+    metric crosses the threshold. Binaries and feature files are cached, so
+    every build is only downloaded once across steps and reruns.
+
+    :return: The first regressing version, or None if the range has none
+    """
+    versions: List[str] = select_versions(
+        list_server_versions(build_server), good, bad
+    )
+    print(
+        f"{bcolors.BLUE}Bisecting {len(versions)} builds "
+        f"(~{max(len(versions) - 2, 1).bit_length()} steps){bcolors.END}"
+    )
+    # None for a version that could not be measured
+    metrics: Dict[str, Optional[float]] = {}
+
+    def is_good(version: str) -> bool:
+        start: float = time.time()
+        try:
+            metrics[version] = measure_version(
+                version,
+                benchmark,
+                import_key,
+                build_server,
+                num_validators,
+                num_peers,
+                network_id,
+                timeout,
+            )
+        except ValueError as e:
+            # a build that does not start or sync counts as bad
+            metrics[version] = None
+            print(
+                f"{bcolors.PURPLE}{version}{bcolors.END}: {bcolors.RED}failed, "
+                f"{e}{bcolors.END} ({time.time() - start:.0f}s)"
+            )
+            return False
+        regressed: bool = is_regression(metrics[version], threshold, lower_is_better)
+        status: str = (
+            f"{bcolors.RED}bad" if regressed else f"{bcolors.GREEN}good"
+        )
+        print(
+            f"{bcolors.PURPLE}{version}{bcolors.END}: {metrics[version]} "
+            f"{status}{bcolors.END} ({time.time() - start:.0f}s)"
+        )
+        return not regressed
+
+    if verify:
+        if not is_good(good):
+            print(f"{bcolors.RED}Good version {good} already regresses{bcolors.END}")
+            return None
+        if is_good(bad):
+            print(f"{bcolors.GREEN}No regression between {good} and {bad}{bcolors.END}")
+            return None
+
+    first_bad, _ = bisect_versions(versions, is_good)
+    print(f"{bcolors.BLUE}Bisect report (threshold {threshold}):{bcolors.END}")
+    for version in versions:
+        if version in metrics:
+            metric = metrics[version]
+            print(f"    - {version}: {'failed' if metric is None else metric}")
+    print(
+        f"{bcolors.RED}First regressing build: "
+        f"{bcolors.PURPLE}{first_bad}{bcolors.END}"
+    )
+    return first_bad
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import json
+import shutil
+from typing import Any, Dict, List
+
+import yaml
+
+from xrpld_netgen.bootstrap import seed_nodes
+from xrpld_netgen.network import (
+    BUILD_TIMEOUT,
+    NetworkBuilder,
+    get_ips_fixed,
+    install_node_binary,
+    load_validator_keys,
+)
+from xrpld_netgen.unl import ValidatorListManager, get_manifest_public_key
+from xrpld_netgen.utils.deploy_kit import (
+    build_network_start_sh,
+    build_network_stop_sh,
+)
+from xrpld_netgen.utils.misc import (
+    bcolors,
+    read_json,
+    write_file,
+    run_command,
+    set_cfg_section,
+)
+
+# Create network files in workspace relative to where the command is run
+basedir = os.path.abspath(os.path.join(os.getcwd(), "workspace"))
+
+
+def load_cluster_spec(cluster_dir: str) -> Dict[str, Any]:
+    path: str = f"{cluster_dir}/cluster.json"
+    if not os.path.exists(path):
+        raise ValueError(
+            f"{cluster_dir} has no cluster.json, recreate it with create:network"
+        )
+    spec: Dict[str, Any] = read_json(path)
+    if spec["ansible"]:
+        raise ValueError("Nodes of ansible clusters can not be added or removed")
+    return spec
+
+
+def get_node_dirs(spec: Dict[str, Any]) -> List[str]:
+    return [f"vnode{i}" for i in range(1, spec["num_validators"] + 1)] + [
+        f"pnode{i}" for i in range(1, spec["num_peers"] + 1)
+    ]
+
+
+def update_node_lists(
+    cluster_dir: str, spec: Dict[str, Any], validators: List[str], nodes: List[str]
+) -> None:
+    """
+    Rewrites the [validators] and [ips_fixed] of the nodes for the current
+    validators. Running nodes read them on their next start, the UNL they
+    use until then is updated through the validator list.
+    """
+    ips_fixed: List[str] = get_ips_fixed(spec["num_validators"])
+    for node in nodes:
+        others: List[str] = validators
+        fixed: List[str] = ips_fixed
+        if node.startswith("vnode"):
+            index: int = int(node[len("vnode") :]) - 1
+            others = [v for v in validators if v != validators[index]]
+            fixed = [ip for ip in ips_fixed if ip != ips_fixed[index]]
+        config_dir: str = f"{cluster_dir}/{node}/config"
+        set_cfg_section(f"{config_dir}/validators.txt", "validators", others, "    ")
+        set_cfg_section(f"{config_dir}/{spec['protocol']}d.cfg", "ips_fixed", fixed)
+
+
+def save_cluster(
+    cluster_dir: str,
+    spec: Dict[str, Any],
+    services: Dict[str, Dict[str, Any]],
+    removed: List[str],
+) -> None:
+    # compose services, start and stop scripts and the spec for the new size
+    with open(f"{cluster_dir}/docker-compose.yml", "r") as f:
+        compose: Dict[str, Any] = yaml.safe_load(f)
+    compose["services"].update(services)
+    for node in removed:
+        compose["services"].pop(node, None)
+    with open(f"{cluster_dir}/docker-compose.yml", "w") as f:
+        yaml.dump(compose, f, default_flow_style=False)
+
+    args: List[Any] = [
+        spec["name"],
+        spec["num_validators"],
+        spec["num_peers"],
+        spec["node_versions"],
+    ]
+    write_file(f"{cluster_dir}/start.sh", build_network_start_sh(*args))
+    write_file(f"{cluster_dir}/stop.sh", build_network_stop_sh(*args))
+    write_file(f"{cluster_dir}/cluster.json", json.dumps(spec, indent=4))
+
+
+def read_features(cluster_dir: str, node: str) -> Dict[str, Any]:
+    path: str = f"{cluster_dir}/{node}/features.json"
+    return read_json(path) if os.path.exists(path) else {}
+
+
+def add_nodes(
+    name: str,
+    num_validators: int = 0,
+    num_peers: int = 0,
+    seed_from: str = None,
+    start: bool = True,
+) -> List[str]:
+    """
+    Adds validators and peers to a running cluster. Only the new nodes are
+    generated and started, the new validators are added to the UNL.
+
+    :param seed_from: The node to copy the dbs of the new nodes from, they
+        sync from the network when not set
+    :return: The new nodes
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    spec: Dict[str, Any] = load_cluster_spec(cluster_dir)
+    existing: List[str] = get_node_dirs(spec)
+    if seed_from and seed_from not in existing:
+        raise ValueError(f"Cannot seed from {seed_from}, it is not in {name}")
+    first_validator: int = spec["num_validators"] + 1
+    first_peer: int = spec["num_peers"] + 1
+    spec["num_validators"] += num_validators
+    spec["num_peers"] += num_peers
+
+    manifests, validators, tokens = load_validator_keys(
+        cluster_dir, spec["num_validators"]
+    )
+    ips_fixed: List[str] = get_ips_fixed(spec["num_validators"])
+    builder = NetworkBuilder(basedir)
+    for i in range(first_validator, spec["num_validators"] + 1):
+        builder.create_node_folder(
+            cluster_dir,
+            spec,
+            i,
+            "validator",
+            read_features(cluster_dir, "vnode1"),
+            [v for v in validators if v != validators[i - 1]],
+            [ip for ip in ips_fixed if ip != ips_fixed[i - 1]],
+            tokens[i - 1],
+        )
+    for i in range(first_peer, spec["num_peers"] + 1):
+        builder.create_node_folder(
+            cluster_dir,
+            spec,
+            i,
+            "peer",
+            read_features(cluster_dir, "pnode1"),
+            validators,
+            ips_fixed,
+        )
+    nodes: List[str] = list(builder.services)
+    if spec["binary"]:
+        for node in nodes:
+            version: str = spec["node_versions"].get(node, spec["name"])
+            install_node_binary(cluster_dir, node, version)
+
+    if num_validators:
+        update_node_lists(cluster_dir, spec, validators, existing)
+        unl = ValidatorListManager(cluster_dir)
+        unl.add(manifests[first_validator - 1 :])
+        print(f"✅ {bcolors.CYAN}Published UNL version {unl.publish()}")
+    save_cluster(cluster_dir, spec, builder.services, [])
+
+    if start and nodes:
+        env: Dict[str, str] = {"START_MODE": "net"}
+        if seed_from:
+            seed_nodes(cluster_dir, seed_from, nodes)
+            env = {"START_MODE": "load"}
+        if not run_command(
+            cluster_dir,
+            f"docker compose up -d --build {' '.join(nodes)}",
+            env,
+            timeout=BUILD_TIMEOUT,
+        ):
+            # the nodes are part of the cluster, only their containers are down
+            raise RuntimeError(
+                f"Added {', '.join(nodes)} to {name} but they did not start, "
+                f"retry with: up --name {name} --nodes {','.join(nodes)}"
+            )
+    print(f"{bcolors.GREEN}Added {', '.join(nodes)} to {name}{bcolors.END}")
+    return nodes
+
+
+def remove_nodes(name: str, num_validators: int = 0, num_peers: int = 0) -> List[str]:
+    """
+    Removes the last validators and peers of a running cluster. The
+    validators are removed from the UNL before their containers stop.
+
+    :return: The removed nodes
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    spec: Dict[str, Any] = load_cluster_spec(cluster_dir)
+    remaining: int = spec["num_validators"] - num_validators
+    if num_peers > spec["num_peers"] or remaining < 1:
+        raise ValueError(f"{name} does not have that many nodes to remove")
+    if spec["quorum"] and remaining < spec["quorum"]:
+        raise ValueError(
+            f"{remaining} validators can not reach the quorum of {spec['quorum']}"
+        )
+    nodes: List[str] = [
+        f"vnode{i}" for i in range(remaining + 1, spec["num_validators"] + 1)
+    ] + [
+        f"pnode{i}"
+        for i in range(spec["num_peers"] - num_peers + 1, spec["num_peers"] + 1)
+    ]
+    if not nodes:
+        return []
+
+    if num_validators:
+        manifests, validators, _ = load_validator_keys(
+            cluster_dir, spec["num_validators"]
+        )
+        unl = ValidatorListManager(cluster_dir)
+        unl.remove([get_manifest_public_key(m) for m in manifests[remaining:]])
+        print(f"✅ {bcolors.CYAN}Published UNL version {unl.publish()}")
+
+    run_command(cluster_dir, f"docker compose rm -sf {' '.join(nodes)}")
+    for node in nodes:
+        shutil.rmtree(f"{cluster_dir}/{node}", ignore_errors=True)
+    spec["num_validators"] = remaining
+    spec["num_peers"] -= num_peers
+    if num_validators:
+        update_node_lists(
+            cluster_dir, spec, validators[:remaining], get_node_dirs(spec)
+        )
+    save_cluster(cluster_dir, spec, {}, nodes)
+    print(f"{bcolors.GREEN}Removed {', '.join(nodes)} from {name}{bcolors.END}")
+    return nodes
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import re
+import json
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, unquote
+from typing import Any, Dict, List, Pattern, Tuple
+
+from xrpld_netgen.api import OPERATIONS, OperationError, run_operation
+from xrpld_netgen.utils.misc import bcolors
+
+# (method, path, operation), named groups of the path become params
+ROUTES: List[Tuple[str, Pattern, str]] = [
+    ("GET", re.compile(r"^/clusters$"), "list"),
+    ("POST", re.compile(r"^/clusters$"), "create:network"),
+    ("GET", re.compile(r"^/clusters/(?P<name>[^/]+)$"), "status"),
+    ("DELETE", re.compile(r"^/clusters/(?P<name>[^/]+)$"), "remove"),
+    ("POST", re.compile(r"^/clusters/(?P<name>[^/]+)/up$"), "up"),
+    ("POST", re.compile(r"^/clusters/(?P<name>[^/]+)/down$"), "down"),
+    (
+        "GET",
+        re.compile(r"^/features/(?P<protocol>[^/]+)/(?P<version>[^/]+)$"),
+        "features",
+    ),
+    ("POST", re.compile(r"^/operations/(?P<operation>[^/]+)$"), None),
+]
+
+
+def match_route(method: str, path: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Returns the operation and the path params of a request, the generic
+    /operations/<name> route runs any registered operation.
+    """
+    for route_method, pattern, name in ROUTES:
+        match = pattern.match(path)
+        if match and route_method == method:
+            params: Dict[str, str] = {
+                k: unquote(v) for k, v in match.groupdict().items()
+            }
+            return name or params.pop("operation"), params
+    raise OperationError(f"No route for {method} {path}", 404)
+
+
+class NetgenRequestHandler(BaseHTTPRequestHandler):
+    # keep-alive, clients reuse their connection between requests
+    protocol_version = "HTTP/1.1"
+
+    def send_json(self, status: int, body: Any) -> None:
+        data: bytes = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_params(self) -> Dict[str, Any]:
+        length: int = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            params: Any = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise OperationError("The body is not valid JSON")
+        if not isinstance(params, dict):
+            raise OperationError("The body must be a JSON object")
+        return params
+
+    def handle_request(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            if self.command == "GET" and url.path == "/health":
+                return self.send_json(200, {"status": "ok"})
+            if self.command == "GET" and url.path == "/operations":
+                return self.send_json(200, {"result": sorted(OPERATIONS)})
+            name, params = match_route(self.command, url.path)
+            params = {**dict(parse_qsl(url.query)), **self.read_params(), **params}
+            self.send_json(200, {"result": run_operation(name, params)})
+        except OperationError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            traceback.print_exc()
+            self.send_json(500, {"error": str(e)})
+
+    do_GET = handle_request
+    do_POST = handle_request
+    do_DELETE = handle_request
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765) -> None:
+    """
+    Serves the netgen operations over http until interrupted. The process
+    keeps its imports, parsed templates and amendment tables and the node
+    rpc connections between requests.
+    """
+    server = ThreadingHTTPServer((host, port), NetgenRequestHandler)
+    server.daemon_threads = True
+    print(
+        f"{bcolors.CYAN}Serving the netgen api at: "
+        f"{bcolors.PURPLE}http://{host}:{port}{bcolors.END}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import json
+import time
+import zlib
+import hashlib
+import shutil
+from typing import List, Any, Dict, Optional
+
+from xrpld_netgen.libs.rpc import get_server_info
+from xrpld_netgen.utils.misc import (
+    bcolors,
+    run_command,
+    COMMAND_TIMEOUT,
+    write_file,
+    read_json,
+    get_node_port,
+    parse_node_name,
+    list_cluster_nodes,
+)
+
+# Create snapshots in workspace relative to where the command is run
+basedir = os.path.abspath(os.path.join(os.getcwd(), "workspace"))
+
+# Node directories holding the node db (NuDB) and the relational db (SQLite)
+NODE_DB_DIRS: List[str] = ["lib"]
+# Files are split into fixed size chunks, each stored once by content hash
+CHUNK_SIZE: int = 4 * 1024 * 1024
+COMPRESSION_LEVEL: int = 3
+
+
+def get_snapshot_dir() -> str:
+    return f"{basedir}/snapshots"
+
+
+def get_validated_ledger(cluster_dir: str, nodes: List[str]) -> Dict[str, Any]:
+    """
+    Returns the lowest validated ledger across the nodes of a running cluster.
+    Every node has this ledger in its db, so it is safe to load it on restore.
+    """
+    validated: Dict[str, Any] = {}
+    for node in nodes:
+        index, node_type = parse_node_name(node)
+        try:
+            info: Dict[str, Any] = get_server_info(get_node_port(index, node_type))
+        except Exception as e:
+            print(f"{bcolors.RED}❌ Cannot reach {node}: {e}{bcolors.END}")
+            continue
+        ledger: Dict[str, Any] = info.get("validated_ledger")
+        if not ledger:
+            continue
+        if not validated or ledger["seq"] < validated["seq"]:
+            validated = {"seq": ledger["seq"], "hash": ledger["hash"]}
+    return validated
+
+
+def _store_chunk(
+    objects_dir: str, data: bytes, stats: Dict[str, int]
+) -> Optional[str]:
+    # All zero chunks are holes in sparse db files, they are not stored
+    if not data.strip(b"\0"):
+        return None
+    digest: str = hashlib.sha256(data).hexdigest()
+    path: str = f"{objects_dir}/{digest[:2]}/{digest}"
+    if os.path.exists(path):
+        stats["reused"] += 1
+        return digest
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    compressed: bytes = zlib.compress(data, COMPRESSION_LEVEL)
+    # write then rename so a crashed snapshot never leaves a partial object
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(compressed)
+    os.replace(f"{path}.tmp", path)
+    stats["stored"] += 1
+    stats["stored_bytes"] += len(compressed)
+    return digest
+
+
+def stop_nodes(cluster_dir: str, nodes: List[str]) -> None:
+    # the dbs must not be read or replaced while a node may still write them
+    if not run_command(
+        cluster_dir,
+        f"docker compose stop {' '.join(nodes)}",
+        timeout=COMMAND_TIMEOUT,
+    ):
+        raise RuntimeError(f"Could not stop {', '.join(nodes)}, no db was touched")
+
+
+def _snapshot_tree(
+    objects_dir: str, root: str, stats: Dict[str, int]
+) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        rel_dir: str = os.path.relpath(dirpath, root)
+        entries.append({"path": rel_dir, "type": "dir"})
+        for filename in sorted(filenames):
+            path: str = os.path.join(dirpath, filename)
+            if os.path.islink(path):
+                continue
+            chunks: List[str] = []
+            size: int = 0
+            with open(path, "rb") as f:
+                while True:
+                    data: bytes = f.read(CHUNK_SIZE)
+                    if not data:
+                        break
+                    size += len(data)
+                    chunks.append(_store_chunk(objects_dir, data, stats))
+            stats["raw_bytes"] += size
+            entries.append(
+                {
+                    "path": os.path.join(rel_dir, filename),
+                    "type": "file",
+                    "size": size,
+                    "mode": os.stat(path).st_mode & 0o777,
+                    "chunks": chunks,
+                }
+            )
+    return entries
+
+
+def _restore_tree(objects_dir: str, root: str, entries: List[Dict[str, Any]]) -> None:
+    for entry in entries:
+        path: str = os.path.normpath(os.path.join(root, entry["path"]))
+        if entry["type"] == "dir":
+            os.makedirs(path, exist_ok=True)
+            continue
+        with open(path, "wb") as f:
+            for digest in entry["chunks"]:
+                if digest is None:
+                    # keep holes sparse, truncate below sets the final size
+                    f.seek(CHUNK_SIZE, os.SEEK_CUR)
+                    continue
+                with open(f"{objects_dir}/{digest[:2]}/{digest}", "rb") as obj:
+                    f.write(zlib.decompress(obj.read()))
+            f.truncate(entry["size"])
+        os.chmod(path, entry["mode"])
+
+
+def create_snapshot(
+    name: str,
+    snapshot_name: str = None,
+    nodes: List[str] = None,
+    restart: bool = True,
+) -> str:
+    """
+    Captures the db directories of every node of a cluster at the current
+    validated ledger into the deduplicated snapshot store.
+
+    The nodes are stopped while their dbs are copied so the files are
+    consistent, and restarted from disk afterwards when `restart` is set.
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    nodes = nodes or list_cluster_nodes(cluster_dir)
+    snapshot_name = snapshot_name or f"{name}-{int(time.time())}"
+    snapshot_dir: str = get_snapshot_dir()
+    objects_dir: str = f"{snapshot_dir}/objects"
+    os.makedirs(objects_dir, exist_ok=True)
+
+    ledger: Dict[str, Any] = get_validated_ledger(cluster_dir, nodes)
+    if ledger:
+        print(f"{bcolors.CYAN}Validated ledger: {ledger['seq']} {ledger['hash']}")
+    else:
+        print(f"{bcolors.RED}No validated ledger found, snapshot may not load")
+
+    stop_nodes(cluster_dir, nodes)
+
+    stats: Dict[str, int] = {
+        "stored": 0,
+        "reused": 0,
+        "raw_bytes": 0,
+        "stored_bytes": 0,
+    }
+    manifest: Dict[str, Any] = {
+        "name": snapshot_name,
+        "cluster": name,
+        "created": int(time.time()),
+        "ledger": ledger,
+        "nodes": {},
+    }
+    start: float = time.time()
+    try:
+        for node in nodes:
+            manifest["nodes"][node] = {}
+            for db_dir in NODE_DB_DIRS:
+                root: str = f"{cluster_dir}/{node}/{db_dir}"
+                if not os.path.isdir(root):
+                    continue
+                manifest["nodes"][node][db_dir] = _snapshot_tree(
+                    objects_dir, root, stats
+                )
+            print(f"✅ {bcolors.CYAN}Captured {node}")
+    finally:
+        if restart:
+            run_command(
+                cluster_dir,
+                f"docker compose up -d {' '.join(nodes)}",
+                {"START_MODE": "warm"},
+            )
+
+    manifest_path: str = f"{snapshot_dir}/{snapshot_name}.json"
+    write_file(manifest_path, json.dumps(manifest, indent=4))
+    print(
+        f"{bcolors.GREEN}Snapshot {bcolors.PURPLE}{snapshot_name}{bcolors.GREEN} "
+        f"created in {time.time() - start:.1f}s: {stats['raw_bytes']} bytes, "
+        f"{stats['stored']} new chunks ({stats['stored_bytes']} bytes), "
+        f"{stats['reused']} deduplicated{bcolors.END}"
+    )
+    return manifest_path
+
+
+def restore_snapshot(
+    name: str,
+    snapshot_name: str,
+    start: bool = True,
+) -> None:
+    """
+    Replaces the db directories of the nodes of a cluster with the ones
+    captured in a snapshot and starts the nodes from the loaded ledger.
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    snapshot_dir: str = get_snapshot_dir()
+    manifest: Dict[str, Any] = read_json(f"{snapshot_dir}/{snapshot_name}.json")
+    nodes: List[str] = [
+        n for n in manifest["nodes"] if os.path.isdir(f"{cluster_dir}/{n}")
+    ]
+    missing: List[str] = [n for n in manifest["nodes"] if n not in nodes]
+    if missing:
+        print(f"{bcolors.RED}Nodes not in {name}: {', '.join(missing)}{bcolors.END}")
+
+    stop_nodes(cluster_dir, nodes)
+
+    begin: float = time.time()
+    for node in nodes:
+        for db_dir, entries in manifest["nodes"][node].items():
+            root: str = f"{cluster_dir}/{node}/{db_dir}"
+            shutil.rmtree(root, ignore_errors=True)
+            _restore_tree(f"{snapshot_dir}/objects", root, entries)
+        print(f"✅ {bcolors.CYAN}Restored {node}")
+
+    ledger: Dict[str, Any] = manifest.get("ledger") or {}
+    print(
+        f"{bcolors.GREEN}Snapshot {bcolors.PURPLE}{snapshot_name}{bcolors.GREEN} "
+        f"restored in {time.time() - begin:.1f}s "
+        f"(ledger {ledger.get('seq', 'unknown')}){bcolors.END}"
+    )
+
+    if start:
+        run_command(
+            cluster_dir,
+            f"docker compose up -d {' '.join(nodes)}",
+            {"START_MODE": "warm"},
+        )
+
+
+def list_snapshots() -> List[Dict[str, Any]]:
+    snapshot_dir: str = get_snapshot_dir()
+    if not os.path.isdir(snapshot_dir):
+        return []
+    snapshots: List[Dict[str, Any]] = []
+    for filename in sorted(os.listdir(snapshot_dir)):
+        if filename.endswith(".json"):
+            manifest: Dict[str, Any] = read_json(f"{snapshot_dir}/{filename}")
+            snapshots.append(
+                {
+                    "name": manifest["name"],
+                    "cluster": manifest["cluster"],
+                    "created": manifest["created"],
+                    "ledger": manifest.get("ledger"),
+                    "nodes": list(manifest["nodes"]),
+                }
+            )
+    return snapshots
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import json
+import time
+import base64
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from xrpld_publisher.models import Validator
+from xrpld_publisher.publisher import PublisherClient
+
+from xrpld_netgen.libs import vl_server
+from xrpld_netgen.libs.rpc import rpc_request
+from xrpld_netgen.utils.misc import (
+    bcolors,
+    read_json,
+    get_node_port,
+    parse_node_name,
+    list_cluster_nodes,
+    working_directory,
+)
+
+# Create network files in workspace relative to where the command is run
+basedir = os.path.abspath(os.path.join(os.getcwd(), "workspace"))
+
+# Stock image, pulled once and cached, the server is a single stdlib script
+VL_IMAGE: str = "python:3.12-alpine"
+# Minutes between list fetches of the nodes (the minimum xrpld accepts)
+REFRESH_INTERVAL: int = 1
+
+
+def build_vl_service(name: str) -> Dict[str, Any]:
+    # the directory is mounted, not the file, so swapped lists show up
+    return {
+        "image": VL_IMAGE,
+        "container_name": "vl",
+        "command": ["python", "/srv/vl_server.py", "--root", "/srv/vl"],
+        "volumes": ["./vl:/srv/vl:ro", "./vl_server.py:/srv/vl_server.py:ro"],
+        "ports": ["80:80"],
+        "networks": [f"{name}-network"],
+        "healthcheck": {
+            "test": [
+                "CMD",
+                "python",
+                "-c",
+                "import urllib.request; "
+                "urllib.request.urlopen('http://localhost/vl.json')",
+            ],
+            "interval": "5s",
+            "timeout": "3s",
+            "retries": 3,
+            "start_period": "2s",
+        },
+    }
+
+
+def get_versions_dir(cluster_dir: str) -> str:
+    return f"{cluster_dir}/vl/versions"
+
+
+def get_version_path(cluster_dir: str, version: int) -> str:
+    return f"{get_versions_dir(cluster_dir)}/vl.{version}.json"
+
+
+def get_unl_sequence(vl: Dict[str, Any]) -> int:
+    return json.loads(base64.b64decode(vl["blob"]))["sequence"]
+
+
+def list_unl_versions(cluster_dir: str) -> List[int]:
+    versions_dir: str = get_versions_dir(cluster_dir)
+    if not os.path.isdir(versions_dir):
+        return []
+    return sorted(
+        int(filename[len("vl.") : -len(".json")])
+        for filename in os.listdir(versions_dir)
+        if filename.startswith("vl.") and filename.endswith(".json")
+    )
+
+
+def activate_unl(
+    cluster_dir: str, version: int, refresh_interval: int = REFRESH_INTERVAL
+) -> None:
+    """
+    Serves a stored list as vl.json. The file is replaced atomically, the
+    server never returns a partially written list.
+    """
+    vl_path: str = get_version_path(cluster_dir, version)
+    if not os.path.exists(vl_path):
+        raise ValueError(f"UNL version {version} not found in {cluster_dir}")
+    vl: Dict[str, Any] = read_json(vl_path)
+    if refresh_interval:
+        # not part of the signed blob, tells the nodes when to fetch again
+        vl["refresh_interval"] = refresh_interval
+    tmp_path: str = f"{cluster_dir}/vl/.vl.json"
+    with open(tmp_path, "w") as f:
+        json.dump(vl, f)
+    os.replace(tmp_path, f"{cluster_dir}/vl/vl.json")
+
+
+def publish_unl(
+    cluster_dir: str, client: PublisherClient, activate: bool = True
+) -> int:
+    """
+    Signs the list of a publisher client as a new version of the cluster.
+
+    :param cluster_dir: The cluster directory, holding the VL keystore
+    :param client: The PublisherClient with the validators of the list
+    :param activate: Serve the new version right away
+    :return: The version (blob sequence) of the list
+    """
+    versions_dir: str = get_versions_dir(cluster_dir)
+    os.makedirs(versions_dir, exist_ok=True)
+    tmp_path: str = f"{versions_dir}/.vl.json"
+    with working_directory(cluster_dir):
+        client.sign_unl(tmp_path)
+    version: int = get_unl_sequence(read_json(tmp_path))
+    os.replace(tmp_path, get_version_path(cluster_dir, version))
+    shutil.copyfile(vl_server.__file__, f"{cluster_dir}/vl_server.py")
+    if activate:
+        activate_unl(cluster_dir, version)
+    return version
+
+
+def load_publisher_client() -> PublisherClient:
+    """
+    Returns a publisher client for the keystore of the working directory,
+    creating new VL keys when they are missing or incompatible.
+    """
+    client = PublisherClient()
+    keys: Dict[str, str] = client.get_keys()
+    eph_keys: Dict[str, str] = client.get_ephkeys()
+    if not keys or not eph_keys or not client.read_manifest():
+        print("  Creating new VL keys...")
+        client.create_keys()
+    elif any(len(keys.get(k, "")) > 200 for k in ["publicKey", "privateKey"]):
+        # post-quantum (dilithium) keys are 2000+ chars, xrpld only
+        # accepts secp256k1 and ed25519 (66 chars) keys
+        print("  Detected incompatible VL keys, regenerating...")
+        client.create_keys()
+    else:
+        print("  Using existing VL keys")
+    return client
+
+
+def get_manifest_public_key(manifest: str) -> str:
+    # xrpl-py is not a dependency of its own, it comes with xrpld-publisher
+    from xrpl.core.binarycodec import decode
+
+    return decode(base64.b64decode(manifest).hex())["PublicKey"].upper()
+
+
+class ValidatorListManager:
+    """
+    Keeps the UNL of a cluster in memory. Validators are added and removed
+    incrementally and all pending changes are signed once as the next
+    version. The VL keys are only checked when the cluster has no list yet.
+    """
+
+    def __init__(self, cluster_dir: str):
+        self.cluster_dir = cluster_dir
+        # the last signed version, None until the cluster has a stored list
+        self.version: int = None
+        self.changed: bool = False
+        self._client: PublisherClient = None
+        self._validators: Dict[str, Validator] = {}
+
+    @property
+    def client(self) -> PublisherClient:
+        if self._client is None:
+            self._client = self._load()
+        return self._client
+
+    def _load(self) -> PublisherClient:
+        versions: List[int] = list_unl_versions(self.cluster_dir)
+        vl_path: str = f"{self.cluster_dir}/vl/vl.json"
+        if versions:
+            self.version = versions[-1]
+            vl_path = get_version_path(self.cluster_dir, self.version)
+        # VL keys live in the keystore of the cluster directory
+        with working_directory(self.cluster_dir):
+            if os.path.exists(vl_path):
+                # continues with the next sequence of the stored list
+                client = PublisherClient(vl_path)
+            else:
+                client = load_publisher_client()
+        self._validators = {
+            v.validation_public_key: v for v in client.vl.blob.validators
+        }
+        return client
+
+    @property
+    def public_key(self) -> str:
+        with working_directory(self.cluster_dir):
+            return self.client.get_keys()["publicKey"]
+
+    @property
+    def validators(self) -> List[str]:
+        return [v.validation_public_key for v in self.client.vl.blob.validators]
+
+    def add(self, manifests: List[str]) -> List[str]:
+        """
+        Adds the validators of the manifests that are not listed yet.
+
+        :return: The public keys of the added validators
+        """
+        added: List[str] = []
+        for manifest in manifests:
+            public_key: str = get_manifest_public_key(manifest)
+            if public_key in self._validators:
+                continue
+            validator = Validator()
+            validator.validation_public_key = public_key
+            validator.manifest = manifest
+            self.client.vl.blob.validators.append(validator)
+            self._validators[public_key] = validator
+            added.append(public_key)
+        self.changed = self.changed or bool(added)
+        return added
+
+    def remove(self, public_keys: List[str]) -> List[str]:
+        """
+        Removes the validators with the public keys, unknown keys are ignored.
+
+        :return: The public keys of the removed validators
+        """
+        blob = self.client.vl.blob
+        removed: Dict[str, Validator] = {}
+        for public_key in public_keys:
+            validator: Validator = self._validators.pop(public_key.upper(), None)
+            if validator:
+                removed[validator.validation_public_key] = validator
+        if removed:
+            blob.validators = [
+                v for v in blob.validators if v.validation_public_key not in removed
+            ]
+            self.changed = True
+        return list(removed)
+
+    def set_validators(self, manifests: List[str]) -> None:
+        # only the difference to the current list is applied
+        public_keys: set = {get_manifest_public_key(m) for m in manifests}
+        self.remove([k for k in self.validators if k not in public_keys])
+        self.add(manifests)
+
+    def publish(self, activate: bool = True) -> int:
+        """
+        Signs the pending changes as one new version. Nothing is signed when
+        the stored list did not change.
+
+        :return: The version of the list
+        """
+        client: PublisherClient = self.client
+        if self.changed or self.version is None:
+            self.version = publish_unl(self.cluster_dir, client, activate)
+            client.vl.blob.sequence = self.version + 1
+            self.changed = False
+        return self.version
+
+
+def get_node_unl_sequence(node: str) -> int:
+    index, node_type = parse_node_name(node)
+    result: Dict[str, Any] = rpc_request(get_node_port(index, node_type), "validators")
+    sequences: List[int] = [
+        publisher_list.get("seq", 0) for publisher_list in result["publisher_lists"]
+    ]
+    return max(sequences, default=None)
+
+
+def swap_unl(
+    name: str,
+    version: int,
+    refresh_interval: int = REFRESH_INTERVAL,
+    wait: bool = True,
+    timeout: float = 600,
+    interval: float = 1,
+) -> Dict[str, float]:
+    """
+    Serves another stored list without restarting the vl server and follows
+    the nodes until they load it. Nodes only accept a list with a higher
+    sequence than their current one, a lower version raises ValueError.
+
+    :return: The seconds until every node loaded the list, None for the
+        nodes that did not load it before the timeout
+    """
+    cluster_dir: str = f"{basedir}/{name}"
+    nodes: List[str] = list_cluster_nodes(cluster_dir)
+
+    def poll(node: str) -> int:
+        try:
+            return get_node_unl_sequence(node)
+        except Exception:
+            # the node is restarting or does not answer yet
+            return None
+
+    with ThreadPoolExecutor(max_workers=len(nodes) or 1) as executor:
+        current: List[int] = [s for s in executor.map(poll, nodes) if s is not None]
+        # a node above the version never loads it, nor do nodes already on it
+        if current and (max(current) > version or min(current) >= version):
+            raise ValueError(
+                f"UNL version {version} is not above the sequence of the nodes "
+                f"of {name} ({max(current)}), publish a new version"
+            )
+
+        activate_unl(cluster_dir, version, refresh_interval)
+        start: float = time.time()
+        print(f"✅ {bcolors.CYAN}Serving UNL version {version} of {name}")
+        timings: Dict[str, float] = {node: None for node in nodes}
+        if not wait or not nodes:
+            return timings
+
+        while time.time() - start < timeout:
+            waiting: List[str] = [n for n in nodes if timings[n] is None]
+            for node, sequence in zip(waiting, executor.map(poll, waiting)):
+                if sequence is not None and sequence >= version:
+                    timings[node] = time.time() - start
+                    print(
+                        f"{bcolors.PURPLE}{node}{bcolors.END} loaded UNL "
+                        f"{sequence} after {timings[node]:.1f}s"
+                    )
+            if all(t is not None for t in timings.values()):
+                break
+            time.sleep(interval)
+    return timings
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import re
+import tempfile
+from typing import Callable
+
+# Shared between workspaces, build server binaries and feature files of a
+# commit never change once published
+CACHE_DIR: str = os.environ.get(
+    "XRPLD_NETGEN_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "xrpld-netgen"),
+)
+
+
+def get_cache_path(kind: str, key: str) -> str:
+    # "https://build.xahau.tech/2025.7.9-release+1951" -> safe file name
+    safe_key: str = re.sub(r"[^\w.+-]", "_", key)
+    return os.path.join(CACHE_DIR, kind, safe_key)
+
+
+def cached_file(kind: str, key: str, fetch: Callable[[str], None]) -> str:
+    """
+    Returns the cache path of an entry, calling `fetch(tmp_path)` to create
+    it on a miss. The entry is renamed into place so an interrupted fetch
+    never leaves a partial file behind.
+    """
+    path: str = get_cache_path(kind, key)
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # a file of its own per fetch, threads of one process fetch concurrently
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        fetch(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def cached_bytes(kind: str, key: str, fetch: Callable[[], bytes]) -> bytes:
+    def _write(tmp_path: str) -> None:
+        with open(tmp_path, "wb") as f:
+            f.write(fetch())
+
+    with open(cached_file(kind, key, _write), "rb") as f:
+        return f.read()
@@ -6,8 +6,10 @@ import re
 import os
 import yaml
 import shutil
+from typing import Dict
 
 from .misc import bcolors
+from .cache import cached_file
 
 
 class DockerVars:
@@ -24,6 +26,7 @@ class DockerVars:
         container_ports: list,
         docker_volumes: list,
         volumes: list,
+        bundles: list = None,
     ):
         self.config_path = config_path
         self.ssh_port = ssh_port
@@ -36,10 +39,11 @@ class DockerVars:
         self.container_ports = container_ports
         self.docker_volumes = docker_volumes
         self.volumes = volumes
+        self.bundles = bundles
 
     def to_dict(self) -> dict:
         env_dict = {var.split(": ")[0]: var.split(": ")[1] for var in self.env_vars}
-        return {
+        vars: dict = {
             "config_path": self.config_path,
             "ssh_port": self.ssh_port,
             "docker_env_variables": env_dict,
@@ -52,6 +56,10 @@ class DockerVars:
             "docker_volumes": self.docker_volumes,
             "volumes": self.volumes,
         }
+        if self.bundles is not None:
+            # the playbooks ship the bundles instead of copying config_path
+            vars["bundles"] = self.bundles
+        return vars
 
 
 def create_ansible_vars_file(
@@ -64,6 +72,81 @@ def create_ansible_vars_file(
     return vars
 
 
+def build_ansible_cfg(num_hosts: int) -> str:
+    # every host in one wave, one ssh connection per host reused across tasks
+    return f"""[defaults]
+forks = {max(num_hosts, 5)}
+host_key_checking = False
+gathering = smart
+fact_caching = jsonfile
+fact_caching_connection = .facts
+fact_caching_timeout = 86400
+
+[ssh_connection]
+pipelining = True
+ssh_args = -o ControlMaster=auto -o ControlPersist=300s
+"""
+
+
+def build_rolling_play(group: str, batch_size: int, health_timeout: int) -> dict:
+    return {
+        "hosts": group,
+        "become": True,
+        "remote_user": "root",
+        "gather_facts": False,
+        "serial": batch_size,
+        # a batch that does not sync stops the rollout
+        "any_errors_fatal": True,
+        "vars": {"health_timeout": health_timeout},
+        "handlers": [
+            {
+                "name": "restart docker",
+                "service": {"name": "docker", "state": "restarted"},
+            }
+        ],
+        "pre_tasks": [
+            {
+                "name": "Start the batch timer",
+                "set_fact": {"batch_started": "{{ lookup('pipe', 'date +%s') }}"},
+                "run_once": True,
+            }
+        ],
+        "tasks": [
+            {"import_tasks": "deploy_tasks.yml"},
+            {"import_tasks": "health_tasks.yml"},
+        ],
+        "post_tasks": [
+            {
+                "name": "Record the batch time",
+                "lineinfile": {
+                    "path": "{{ playbook_dir }}/rolling.log",
+                    "line": f"{group} "
+                    "{{ ansible_play_batch | join(',') }} "
+                    "{{ lookup('pipe', 'date +%s') | int - batch_started | int }}s",
+                    "create": True,
+                },
+                "delegate_to": "localhost",
+                "become": False,
+                "run_once": True,
+            }
+        ],
+    }
+
+
+def build_rolling_playbook(
+    peer_batch_size: int, validator_batch_size: int, health_timeout: int = 600
+) -> str:
+    """
+    Builds a playbook deploying the peers and then the validators in
+    batches. Every batch must be synced before the next one starts.
+    """
+    plays: list = [
+        build_rolling_play("peers", peer_batch_size, health_timeout),
+        build_rolling_play("validators", validator_batch_size, health_timeout),
+    ]
+    return yaml.dump(plays, default_flow_style=False, sort_keys=False)
+
+
 def create_dockerfile(
     protocol: str,
     network: bool,
@@ -99,7 +182,9 @@ def create_dockerfile(
         dockerfile += "COPY genesis.json /genesis.json\n"
 
     if binary:
-        dockerfile += f"COPY {protocol}d.{version} /app/{protocol}d\n"
+        # network nodes always run /app/xrpld (see network.entrypoint)
+        binary_name: str = "xrpld" if network else f"{protocol}d"
+        dockerfile += f"COPY {binary_name}.{version} /app/{binary_name}\n"
 
     if network:
         dockerfile += f"""
@@ -171,7 +256,7 @@ def download_binary(url: str, save_path: str) -> None:
         os.chmod(save_path, 0o755)
         return
 
-    try:
+    def _download(tmp_path: str) -> None:
         print(
             f"{bcolors.GREEN}Found latest version: "
             f"{bcolors.BLUE}{version}, downloading..."
@@ -183,10 +268,15 @@ def download_binary(url: str, save_path: str) -> None:
         response.raise_for_status()
 
         # Open the file in binary write mode and save the content to the file
-        with open(save_path, "wb") as file:
+        with open(tmp_path, "wb") as file:
             for chunk in response.iter_content(chunk_size=8192):
                 file.write(chunk)
 
+    try:
+        # Download each build once, every cluster copies it from the cache
+        cache_path: str = cached_file("binaries", url, _download)
+        shutil.copyfile(cache_path, save_path)
+
         # Set the file permissions to be readable and executable by the owner
         os.chmod(save_path, 0o755)
     except requests.exceptions.RequestException as e:
@@ -285,13 +375,16 @@ def build_network_start_sh(
     name: str,
     num_validators: int,
     num_peers: int,
+    node_versions: Dict[str, str] = {},
 ):
     start_sh_content = "#! /bin/bash \n"
     for i in range(1, num_validators + 1):
-        start_sh_content += f"cp xrpld.{name} vnode{i}/xrpld.{name}\n"
+        version: str = node_versions.get(f"vnode{i}", name)
+        start_sh_content += f"cp xrpld.{version} vnode{i}/xrpld.{version}\n"
 
     for i in range(1, num_peers + 1):
-        start_sh_content += f"cp xrpld.{name} pnode{i}/xrpld.{name}\n"
+        version: str = node_versions.get(f"pnode{i}", name)
+        start_sh_content += f"cp xrpld.{version} pnode{i}/xrpld.{version}\n"
     start_sh_content += (
         "docker compose -f docker-compose.yml"
         " up --build --force-recreate -d"
@@ -303,6 +396,7 @@ def build_network_stop_sh(
     name: str,
     num_validators: int,
     num_peers: int,
+    node_versions: Dict[str, str] = {},
 ) -> str:
     stop_sh_content = "#! /bin/bash\n"
     stop_sh_content += "REMOVE_FLAG=false \n"
@@ -322,12 +416,16 @@ done
     for i in range(1, num_validators + 1):
         stop_sh_content += f"rm -r vnode{i}/lib\n"
         stop_sh_content += f"rm -r vnode{i}/log\n"
-        stop_sh_content += f"rm -r vnode{i}/xrpld.{name}\n"
+        stop_sh_content += (
+            f"rm -r vnode{i}/xrpld.{node_versions.get(f'vnode{i}', name)}\n"
+        )
 
     for i in range(1, num_peers + 1):
         stop_sh_content += f"rm -r pnode{i}/lib\n"
         stop_sh_content += f"rm -r pnode{i}/log\n"
-        stop_sh_content += f"rm -r pnode{i}/xrpld.{name}\n"
+        stop_sh_content += (
+            f"rm -r pnode{i}/xrpld.{node_versions.get(f'pnode{i}', name)}\n"
+        )
 
     stop_sh_content += "else \n"
     if num_validators > 0 and num_peers > 0:
@@ -381,6 +479,21 @@ def build_local_network_start_sh(
     start_sh_content += "fi\n\n"
     start_sh_content += "echo \"Using binary: $BINARY_PATH\"\n\n"
 
+    start_sh_content += (
+        "# Start a new chain from genesis, or resume from the node dbs\n"
+    )
+    start_sh_content += "for arg in \"$@\"; do\n"
+    start_sh_content += "  if [ \"$arg\" == \"--resume\" ]; then\n"
+    start_sh_content += "    START_MODE=warm\n"
+    start_sh_content += "  fi\n"
+    start_sh_content += "done\n"
+    start_sh_content += "if [ \"$START_MODE\" = \"warm\" ]; then\n"
+    start_sh_content += "  LEDGER_ARGS=\"--load --valid\"\n"
+    start_sh_content += "  echo 'Resuming nodes from their existing databases'\n"
+    start_sh_content += "else\n"
+    start_sh_content += "  LEDGER_ARGS=\"--ledgerfile config/genesis.json\"\n"
+    start_sh_content += "fi\n\n"
+
     start_sh_content += "# Copy xrpld binary to each node (if not already present)\n"
     for i in range(1, num_validators + 1):
         start_sh_content += (
@@ -408,7 +521,7 @@ def build_local_network_start_sh(
         start_sh_content += f"cd \"$CLUSTER_DIR/vnode{i}\"\n"
         start_sh_content += (
             f"nohup ./{binary_name} --conf config/xrpld.cfg"
-            " --ledgerfile config/genesis.json"
+            " $LEDGER_ARGS"
             " > /dev/null 2>&1 &\n"
         )
         start_sh_content += f"echo $! > \"$CLUSTER_DIR/vnode{i}/xrpld.pid\"\n"
@@ -420,7 +533,7 @@ def build_local_network_start_sh(
         start_sh_content += f"cd \"$CLUSTER_DIR/pnode{i}\"\n"
         start_sh_content += (
             f"nohup ./{binary_name} --conf config/xrpld.cfg"
-            " --ledgerfile config/genesis.json"
+            " $LEDGER_ARGS"
             " > /dev/null 2>&1 &\n"
         )
         start_sh_content += f"echo $! > \"$CLUSTER_DIR/pnode{i}/xrpld.pid\"\n"
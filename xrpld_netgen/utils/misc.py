@@ -2,15 +2,32 @@
 # coding: utf-8
 
 import os
+import re
+import copy
 import json
-import requests
 import shutil
 import subprocess
 import shlex
 import hashlib
+import platform
+import time
 import sys
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Iterator, Tuple, List, TYPE_CHECKING
+
+from .cache import get_cache_path
+
+if TYPE_CHECKING:
+    # the runner pulls in asyncio, it is only imported to run a command
+    from .runner import CommandResult
+
+# Seconds start.sh and stop.sh may take, including pulling the images
+START_TIMEOUT: int = 900
+# Seconds a docker command may take before it is terminated
+COMMAND_TIMEOUT: int = 300
 
 
 class bcolors:
@@ -43,30 +60,39 @@ def remove_directory(directory_path: str) -> None:
         print(f"{bcolors.RED}❌ An OS error occurred: {e}.{bcolors.END}")
 
 
-def run_start(cmd: List[str], protocol: str, version: str, type: str):
+def run_start(
+    cmd: List[str],
+    protocol: str,
+    version: str,
+    type: str,
+    env: Dict[str, str] = None,
+    cwd: str = None,
+):
+    from .runner import run, print_failure
+
     try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            stdout=subprocess.DEVNULL,
-            # stderr=subprocess.DEVNULL,
+        # only the end of the output is shown, when the start fails
+        result: CommandResult = run(
+            cmd, cwd=cwd, env=env, timeout=START_TIMEOUT, quiet=True
         )
-        if result.returncode == 0:
-            print(
-                f"{bcolors.CYAN}{protocol.capitalize()} {bcolors.GREEN}{version} "
-                f"{type} running at: {bcolors.PURPLE}6006 {bcolors.END}"
-            )
+        if result.ok:
+            if protocol:
+                print(
+                    f"{bcolors.CYAN}{protocol.capitalize()} {bcolors.GREEN}{version} "
+                    f"{type} running at: {bcolors.PURPLE}6006 {bcolors.END}"
+                )
+            else:
+                print(f"{bcolors.CYAN}{type.capitalize()} started{bcolors.END}")
             print(f"{bcolors.CYAN}Explorer running / starting container{bcolors.END}")
             print(f"Listening at: {bcolors.PURPLE}http://localhost:4000{bcolors.END}")
         else:
-            print(f"{bcolors.RED}ERROR{bcolors.END}", file=sys.stderr)
+            print_failure(result)
+            if not result.timed_out:
+                print(
+                    f"{bcolors.RED}❌ Cannot connect to the Docker daemon at "
+                    f"docker.sock. Is the docker daemon running?{bcolors.END}"
+                )
             sys.exit(1)
-    except subprocess.CalledProcessError:
-        print(
-            f"{bcolors.RED}❌ Cannot connect to the Docker daemon at docker.sock. "
-            f"Is the docker daemon running?{bcolors.END}"
-        )
-        sys.exit(1)
     except FileNotFoundError:
         print(
             f"{bcolors.RED}❌ The file {cmd[0]} does not exist or cannot be "
@@ -79,24 +105,20 @@ def run_start(cmd: List[str], protocol: str, version: str, type: str):
 
 
 def run_stop(cmd: List[str]):
+    from .runner import run, print_failure
+
     try:
-        result = subprocess.run(
-            cmd,
-            check=True,
-            stdout=subprocess.DEVNULL,
-            # stderr=subprocess.DEVNULL,
-        )
-        if result.returncode == 0:
+        result: CommandResult = run(cmd, timeout=START_TIMEOUT, quiet=True)
+        if result.ok:
             print(f"{bcolors.CYAN}shut down docker container {bcolors.END}")
         else:
-            print(f"{bcolors.RED}ERROR{bcolors.END}", file=sys.stderr)
+            print_failure(result)
+            if not result.timed_out:
+                print(
+                    f"{bcolors.RED}❌ Cannot connect to the Docker daemon at "
+                    f"docker.sock. Is the docker daemon running?{bcolors.END}"
+                )
             sys.exit(1)
-    except subprocess.CalledProcessError:
-        print(
-            f"{bcolors.RED}❌ Cannot connect to the Docker daemon at docker.sock. "
-            f"Is the docker daemon running?{bcolors.END}"
-        )
-        sys.exit(1)
     except FileNotFoundError:
         print(
             f"{bcolors.RED}❌ The file {cmd[0]} does not exist or cannot be "
@@ -109,13 +131,41 @@ def run_stop(cmd: List[str]):
 
 
 def is_container_running(container_name):
+    # imported here, the api client is not needed for every cli command
+    from xrpld_netgen.libs.docker import get_docker_client, DockerError
+
+    client = get_docker_client()
+    if client:
+        try:
+            return client.is_running(container_name)
+        except (OSError, DockerError):
+            # fall back to the cli below
+            pass
     result = subprocess.run(
         ["docker", "inspect", container_name], capture_output=True, text=True
     )
     return "Hostname" in result.stdout
 
 
+def stream_container_logs(container_name: str, pattern: str, tail: int = 20) -> None:
+    # same output as `docker logs -f | grep --color=always`
+    from xrpld_netgen.libs.docker import get_docker_client
+
+    regex = re.compile(pattern)
+    client = get_docker_client()
+    buffer: bytes = b""
+    for _, data in client.logs(container_name, follow=True, tail=str(tail)):
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            text: str = line.decode(errors="replace")
+            if regex.search(text):
+                print(regex.sub(f"{bcolors.RED}\\g<0>{bcolors.END}", text))
+
+
 def run_logs():
+    from xrpld_netgen.libs.docker import get_docker_client
+
     try:
         container_name = "xahau"
         if is_container_running(container_name):
@@ -126,10 +176,16 @@ def run_logs():
                 f"{bcolors.PURPLE}CTRL + C{bcolors.END}"
             )
             print()
+            pattern: str = "HookTrace|HookError|Publishing ledger [0-9]+"
+            if get_docker_client():
+                try:
+                    stream_container_logs(container_name, pattern)
+                except KeyboardInterrupt:
+                    pass
+                return
             log_command = (
                 f"docker logs --tail 20 -f {container_name} 2>&1 | "
-                f"grep -E --color=always "
-                f"'HookTrace|HookError|Publishing ledger [0-9]+'"
+                f"grep -E --color=always '{pattern}'"
             )
             os.system(log_command)
         else:
@@ -239,12 +295,72 @@ def run_local_logs(node: str = None):
         return
 
 
-def check_deps(cmd: List[str]) -> None:
+# Seconds a passed prerequisite check is reused, 0 checks on every run,
+# overridden by XRPLD_NETGEN_PREREQ_TTL
+PREREQ_TTL: int = 3600
+
+
+def get_prereq_ttl() -> int:
+    value: str = os.environ.get("XRPLD_NETGEN_PREREQ_TTL", "")
+    try:
+        return int(value) if value else PREREQ_TTL
+    except ValueError:
+        print(
+            f"{bcolors.RED}Invalid XRPLD_NETGEN_PREREQ_TTL {value!r}, "
+            f"using {PREREQ_TTL}s{bcolors.END}"
+        )
+        return PREREQ_TTL
+
+
+def get_docker_fingerprint(cmd: List[str]) -> str:
+    """
+    Identifies the host, docker daemon and prerequisite script, the cached
+    check is only reused while none of them change.
+    """
+    parts: List[Any] = [
+        platform.node(),
+        platform.system(),
+        platform.release(),
+        platform.machine(),
+        os.environ.get("DOCKER_HOST", ""),
+        os.environ.get("DOCKER_CONTEXT", ""),
+    ]
+    docker: str = shutil.which("docker")
+    # the socket is recreated whenever the daemon restarts
+    for path in [docker, "/var/run/docker.sock", cmd[0]]:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{path}:{stat.st_ino}:{stat.st_mtime}")
+        except (OSError, TypeError):
+            parts.append(f"{path}:missing")
+    return hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+
+
+def check_deps(cmd: List[str], ttl: int = None) -> None:
+    ttl = get_prereq_ttl() if ttl is None else ttl
+    cache_path: str = get_cache_path("prerequisites", "check.json")
+    fingerprint: str = get_docker_fingerprint(cmd)
+    try:
+        with open(cache_path, "r") as f:
+            cached: Dict[str, Any] = json.load(f)
+        fresh: bool = time.time() - cached["time"] < ttl
+        if cached["fingerprint"] == fingerprint and fresh:
+            print(f"{bcolors.GREEN}Dependencies OK (cached){bcolors.END}")
+            return
+    except (OSError, ValueError, KeyError):
+        pass
+
     try:
         print(bcolors.BLUE + "Checking dependencies: \n")
         result = subprocess.run(cmd, check=True)
         if result.returncode == 0:
             print(f"{bcolors.GREEN}Dependencies OK{bcolors.END}")
+            if ttl > 0:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                write_file(
+                    cache_path,
+                    json.dumps({"fingerprint": fingerprint, "time": time.time()}),
+                )
         else:
             print(f"{bcolors.RED}Dependency ERROR{bcolors.END}")
             sys.exit(1)
@@ -281,33 +397,137 @@ def remove_containers(cmd: str) -> None:
         return
 
 
-def run_command(dir: str, command: str) -> None:
+def remove_stale_containers(names: List[str]) -> None:
+    """
+    Stops and removes the containers concurrently over the docker socket,
+    or with a single `docker rm -f` when the socket is not available.
+    """
+    from xrpld_netgen.libs.docker import get_docker_client, DockerError
+
+    client = get_docker_client()
+    if not client:
+        return remove_containers(f"docker rm -f {' '.join(names)}")
     try:
-        # Split the command into a list of arguments
-        # args = command.split()
-        args = shlex.split(command)
-        # Run the command as a subprocess
-        result = subprocess.run(
-            args,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=dir,
+        results: Dict[str, Any] = client.remove_containers(names, force=True)
+    except OSError:
+        return remove_containers(f"docker rm -f {' '.join(names)}")
+    # errors are returned per container, anything but an api error is the
+    # transport (stale socket file, daemon stopped), the cli may still work
+    if any(
+        isinstance(r, Exception) and not isinstance(r, DockerError)
+        for r in results.values()
+    ):
+        return remove_containers(f"docker rm -f {' '.join(names)}")
+    for name, result in results.items():
+        if isinstance(result, DockerError) and result.status != 404:
+            print(f"{bcolors.RED}Cannot remove {name}: {result}{bcolors.END}")
+            return
+    print(f"{bcolors.GREEN}Docker Ready{bcolors.END}")
+
+
+# The working directory is process wide, builders in other threads wait here
+_cwd_lock = threading.RLock()
+
+
+@contextmanager
+def working_directory(path: str) -> Iterator[None]:
+    """
+    Runs the block inside path, for the publisher and validator clients
+    which only read and write their keystore relative to the working
+    directory. Only one thread at a time can be inside the block.
+    """
+    with _cwd_lock:
+        original_dir: str = os.getcwd()
+        os.chdir(path)
+        try:
+            yield
+        finally:
+            os.chdir(original_dir)
+
+
+def get_working_directory() -> str:
+    # read under the lock, another thread may be inside working_directory
+    with _cwd_lock:
+        return os.getcwd()
+
+
+def _print_result(command: str, result: "CommandResult") -> bool:
+    if result.timed_out:
+        print(f"The command '{command}' timed out after {result.seconds:.0f}s.")
+    elif result.returncode != 0:
+        print(
+            f"An error occurred while trying to run the command: '{command}' "
+            f"returned non-zero exit status {result.returncode}."
         )
-        # Print the standard output and error (if any)
-        print(result.stdout.decode())
-        if result.stderr:
-            print(result.stderr.decode())
+    else:
         print(f"Command '{command}' executed successfully.")
-    except subprocess.CalledProcessError as e:
-        print(f"An error occurred while trying to run the command: {e}")
+    return result.ok
+
+
+def run_command(
+    dir: str,
+    command: str,
+    env: Dict[str, str] = None,
+    timeout: float = None,
+    prefix: str = None,
+) -> bool:
+    """
+    Runs a command and streams its output while it runs, never raises.
+
+    :param timeout: Seconds after which the command is terminated
+    :param prefix: Printed before every line of output, e.g. the node
+    :return: True when the command succeeded
+    """
+    from .runner import run
+
+    try:
+        return _print_result(command, run(command, dir, env, prefix, timeout))
     except FileNotFoundError:
         print(f"The command '{command}' does not exist or cannot be found.")
-    except OSError as e:
+    except (OSError, ValueError) as e:
         print(f"An error occurred while trying to run the command: {e}")
+    return False
+
+
+def run_commands(
+    dir: str,
+    commands: List[str],
+    env: Dict[str, str] = None,
+    timeout: float = None,
+    limit: int = 4,
+) -> bool:
+    """
+    Runs independent commands concurrently, at most `limit` at once. Every
+    line of output is prefixed with its command.
+
+    :return: True when every command succeeded
+    """
+    from .runner import run_many
+
+    try:
+        results: List[CommandResult] = run_many(
+            [
+                {
+                    "command": command,
+                    "cwd": dir,
+                    "env": env,
+                    "prefix": command.split()[-1],
+                    "timeout": timeout,
+                }
+                for command in commands
+            ],
+            limit,
+        )
+    except (OSError, ValueError) as e:
+        print(f"An error occurred while trying to run the commands: {e}")
+        return False
+    return all([_print_result(c, r) for c, r in zip(commands, results)])
 
 
 def download_json(url: str, destination_dir: str) -> Dict[str, Any]:
+    # imported here, requests is slow to import and most commands never use it
+    import requests
+
     # Make sure destination directory exists
     os.makedirs(destination_dir, exist_ok=True)
 
@@ -339,6 +559,38 @@ def save_local_config(protocol: str, cfg_path: str, cfg_out: str, validators_out
         text_file.write(validators_out)
 
 
+def get_cfg_section(path: str, section: str) -> List[str]:
+    # the non empty lines of a section of a node config file
+    with open(path, "r") as f:
+        cfg: str = f.read()
+    match = re.search(
+        rf"^\[{re.escape(section)}\]\n((?:(?!\[)[^\n]*\n?)*)", cfg, re.M
+    )
+    if not match:
+        return []
+    return [line.strip() for line in match.group(1).splitlines() if line.strip()]
+
+
+def set_cfg_section(
+    path: str, section: str, lines: List[str], indent: str = ""
+) -> None:
+    """
+    Replaces the lines of a section of a node config file. The section is
+    appended when missing and dropped when there are no lines.
+    """
+    with open(path, "r") as f:
+        cfg: str = f.read()
+    content: str = "".join(f"{indent}{line}\n" for line in lines)
+    block: str = f"[{section}]\n{content}\n" if lines else ""
+    pattern = re.compile(rf"^\[{re.escape(section)}\]\n(?:(?!\[)[^\n]*\n)*", re.M)
+    if pattern.search(cfg):
+        cfg = pattern.sub(lambda _: block, cfg, count=1)
+    elif block:
+        cfg = f"{cfg.rstrip()}\n\n{block}"
+    with open(path, "w") as f:
+        f.write(cfg)
+
+
 def parse_image_name(image_name: str) -> str:
     # Get the image name
     name = image_name.split(":")[0]
@@ -376,6 +628,76 @@ WS_ADMIN: int = 6006
 PEER: int = 51235
 
 
+def parse_node_name(node: str) -> Tuple[int, str]:
+    # vnode3 -> (3, "validator"), pnode1 -> (1, "peer")
+    if node.startswith("vnode") and node[5:].isdigit():
+        return int(node[5:]), "validator"
+    if node.startswith("pnode") and node[5:].isdigit():
+        return int(node[5:]), "peer"
+    raise ValueError(f"Invalid node name: {node}. Must be 'vnode<N>' or 'pnode<N>'.")
+
+
+def list_cluster_nodes(cluster_dir: str) -> List[str]:
+    nodes: List[str] = []
+    for item in os.listdir(cluster_dir):
+        if not os.path.isdir(os.path.join(cluster_dir, item)):
+            continue
+        try:
+            parse_node_name(item)
+        except ValueError:
+            continue
+        nodes.append(item)
+    # validators first, then peers, each in index order
+    return sorted(nodes, key=lambda n: (n[0] != "v", parse_node_name(n)[0]))
+
+
+def parse_version_map(version_map: str) -> Dict[str, int]:
+    # "2025.7.9-release+1951=60,2025.8.1-release+2000=40" -> {version: weight}
+    versions: Dict[str, int] = {}
+    for item in version_map.split(","):
+        version, _, weight = item.strip().rpartition("=")
+        if not version or not weight.isdigit():
+            raise ValueError(
+                f"Invalid version map entry: {item}. Must be '<version>=<percent>'."
+            )
+        if int(weight) <= 0:
+            raise ValueError(
+                f"Invalid version map entry: {item}. The percent must be positive."
+            )
+        versions[version] = int(weight)
+    return versions
+
+
+def _split_by_weight(count: int, version_map: Dict[str, int]) -> List[str]:
+    # largest remainder, so the counts always add up to the number of nodes
+    total: int = sum(version_map.values())
+    shares = [(v, count * w / total) for v, w in version_map.items()]
+    counts: Dict[str, int] = {v: int(share) for v, share in shares}
+    remaining: int = count - sum(counts.values())
+    by_remainder = sorted(shares, key=lambda s: s[1] - int(s[1]), reverse=True)
+    for version, _ in by_remainder[:remaining]:
+        counts[version] += 1
+    return [v for v in version_map for _ in range(counts[v])]
+
+
+def assign_node_versions(
+    num_validators: int, num_peers: int, version_map: Dict[str, int]
+) -> Dict[str, str]:
+    """
+    Assigns a build version to every node following the weights of the
+    version map. Validators and peers are split separately so both node
+    types run every version.
+    """
+    node_versions: Dict[str, str] = {}
+    validators: List[str] = _split_by_weight(num_validators, version_map)
+    for i, version in enumerate(validators, start=1):
+        node_versions[f"vnode{i}"] = version
+    peers: List[str] = _split_by_weight(num_peers, version_map)
+    for i, version in enumerate(peers, start=1):
+        node_versions[f"pnode{i}"] = version
+    return node_versions
+
+
 def get_node_port(index: int, node_type: str) -> int:
     if node_type == "validator":
         return RPC_ADMIN + (index * 100)
@@ -442,3 +764,22 @@ def read_json(path: str) -> Dict[str, object]:
     """
     with open(path) as json_file:
         return json.load(json_file)
+
+
+@lru_cache(maxsize=None)
+def _read_json_once(path: str) -> Dict[str, object]:
+    return read_json(path)
+
+
+def read_template(path: str) -> Dict[str, object]:
+    """Read Template
+
+    Returns a copy of a bundled json file (genesis, deploykit config), the
+    file itself is only read once per process.
+
+    :param path: Path to json
+    :type path: str
+
+    :rtype: Dict[str, object]
+    """
+    return copy.deepcopy(_read_json_once(path))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import time
+import shlex
+import signal
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Union
+
+# Lines of output kept for error messages, the rest is only streamed
+TAIL_LINES: int = 20
+# Seconds a terminated command has to exit before it is killed
+KILL_GRACE: float = 5
+# Longest output line, longer lines (docker progress output) are split
+LINE_LIMIT: int = 1024 * 1024
+
+
+class CommandResult:
+    def __init__(
+        self,
+        command: str,
+        returncode: int,
+        tail: List[str],
+        seconds: float,
+        timed_out: bool = False,
+    ):
+        self.command = command
+        self.returncode = returncode
+        self.tail = tail
+        self.seconds = seconds
+        self.timed_out = timed_out
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+def _terminate_signal(process: asyncio.subprocess.Process, sig: int) -> None:
+    # the command runs in its own session, its children are signalled too
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except ProcessLookupError:
+        pass
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is not None:
+        return
+    _terminate_signal(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), KILL_GRACE)
+    except asyncio.TimeoutError:
+        _terminate_signal(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        await process.wait()
+
+
+def _emit(line: bytes, prefix: str, quiet: bool, tail: Deque[str]) -> None:
+    text: str = line.decode(errors="replace").rstrip()
+    tail.append(text)
+    if not quiet:
+        print(f"[{prefix}] {text}" if prefix else text, flush=True)
+
+
+async def _stream(
+    process: asyncio.subprocess.Process, prefix: str, quiet: bool, tail: Deque[str]
+) -> None:
+    # read in chunks rather than readline, which raises on a line longer
+    # than the stream limit, longer lines are split at LINE_LIMIT
+    pending: bytes = b""
+    while True:
+        chunk: bytes = await process.stdout.read(LINE_LIMIT)
+        if not chunk:
+            break
+        lines: List[bytes] = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            _emit(line, prefix, quiet, tail)
+        while len(pending) >= LINE_LIMIT:
+            _emit(pending[:LINE_LIMIT], prefix, quiet, tail)
+            pending = pending[LINE_LIMIT:]
+    if pending:
+        _emit(pending, prefix, quiet, tail)
+
+
+async def run_async(
+    command: Union[str, List[str]],
+    cwd: str = None,
+    env: Dict[str, str] = None,
+    prefix: str = None,
+    timeout: float = None,
+    quiet: bool = False,
+) -> CommandResult:
+    """
+    Runs a command and streams its output line by line as it is written,
+    stderr included. Only the last lines are kept in memory.
+
+    :param prefix: Printed before every line, e.g. the node of the command
+    :param timeout: Seconds after which the command is terminated
+    :param quiet: Only keep the last lines, print nothing
+    :return: The result, the command is terminated when the task is
+        cancelled
+    """
+    args: List[str] = shlex.split(command) if isinstance(command, str) else command
+    start: float = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=cwd,
+        env={**os.environ, **env} if env else None,
+        limit=LINE_LIMIT,
+        start_new_session=hasattr(os, "killpg"),
+    )
+    tail: Deque[str] = deque(maxlen=TAIL_LINES)
+    timed_out: bool = False
+    try:
+        await asyncio.wait_for(_stream(process, prefix, quiet, tail), timeout)
+        await process.wait()
+    except asyncio.TimeoutError:
+        timed_out = True
+        await _terminate(process)
+    except BaseException:
+        # cancelled or failed while streaming, the command must not outlive it
+        await _terminate(process)
+        raise
+    return CommandResult(
+        " ".join(args),
+        process.returncode,
+        list(tail),
+        time.perf_counter() - start,
+        timed_out,
+    )
+
+
+async def run_many_async(
+    commands: List[Dict[str, Any]], limit: int = 4
+) -> List[CommandResult]:
+    """
+    Runs independent commands concurrently, at most `limit` at once.
+
+    :param commands: The keyword arguments of run_async for every command
+    :return: The results in the order of the commands
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_limited(kwargs: Dict[str, Any]) -> CommandResult:
+        async with semaphore:
+            return await run_async(**kwargs)
+
+    return list(await asyncio.gather(*(run_limited(c) for c in commands)))
+
+
+def _run_sync(coroutine) -> Any:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # called from a running loop, the commands get a loop of their own
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def run(
+    command: Union[str, List[str]],
+    cwd: str = None,
+    env: Dict[str, str] = None,
+    prefix: str = None,
+    timeout: float = None,
+    quiet: bool = False,
+) -> CommandResult:
+    # see run_async
+    return _run_sync(run_async(command, cwd, env, prefix, timeout, quiet))
+
+
+def run_many(commands: List[Dict[str, Any]], limit: int = 4) -> List[CommandResult]:
+    # see run_many_async
+    return _run_sync(run_many_async(commands, limit))
+
+
+def print_failure(result: CommandResult) -> None:
+    reason: str = (
+        f"timed out after {result.seconds:.0f}s"
+        if result.timed_out
+        else f"exited with {result.returncode}"
+    )
+    print(f"Command '{result.command}' {reason}", file=sys.stderr)
+    for line in result.tail:
+        print(f"    {line}", file=sys.stderr)
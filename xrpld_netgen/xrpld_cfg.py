@@ -431,7 +431,10 @@ def gen_config(
     ivl_keys: List[str],
     ips_urls: List[str] = [],
     ips_fixed_urls: List[str] = [],
+    amendment_majority_time: str = None,
 ) -> List[XrpldBuild]:
+    if not amendment_majority_time:
+        amendment_majority_time = "5 minutes" if protocol == "xahau" else "15 minutes"
     configs: List[XrpldBuild] = generate_xrpld_cfg(
         # App
         build_path="/",
@@ -472,7 +475,7 @@ def gen_config(
         import_vl_keys=ivl_keys,
         ips_urls=ips_urls,
         ips_fixed_urls=ips_fixed_urls,
-        amendment_majority_time="5 minutes" if protocol == "xahau" else "15 minutes",
+        amendment_majority_time=amendment_majority_time,
         amendments_dict={},
     )
     return configs